@@ -0,0 +1,72 @@
+"""
+Compares parsing a large JSON spec read through a text stream, as
+``from_file`` used to, with parsing the undecoded bytes returned by
+``oas3.files.read_bytes``.
+
+    python bench/loading.py [number of paths]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from oas3.files import read_bytes  # NOQA
+
+
+def make_spec(count):
+    operation = {
+        'summary': 'Fetch a resource',
+        'parameters': [{'name': 'id', 'in': 'path', 'required': True, 'schema': {'type': 'string'}}],
+        'responses': {'200': {'description': 'The resource',
+                              'content': {'application/json': {'schema': {'type': 'object'}}}}},
+    }
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Benchmark', 'version': '1.0.0'},
+        'paths': {'/resources{}/{{id}}'.format(index): {'get': operation} for index in range(count)},
+    }
+
+
+def text_stream(path):
+    file_ref = open(path)
+    return json.loads(file_ref.read())
+
+
+def undecoded_bytes(path):
+    return json.loads(read_bytes(path))
+
+
+def measure(function, path, rounds=5):
+    best = float('inf')
+    for _ in range(rounds):
+        started = time.perf_counter()
+        function(path)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    function(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    handle, path = tempfile.mkstemp(suffix='.json')
+    with os.fdopen(handle, 'w') as file_ref:
+        json.dump(make_spec(count), file_ref)
+    try:
+        print('spec size: {:.1f} MB'.format(os.path.getsize(path) / 1e6))
+        for name, function in (('text stream', text_stream), ('bytes', undecoded_bytes)):
+            seconds, peak = measure(function, path)
+            print('{:<14} {:8.1f} ms  peak {:8.1f} MB'.format(name, seconds * 1000, peak / 1e6))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Reports the memory used per OAS3 object node, with the ``__slots__`` layout
+of the object classes and with an equivalent layout using a per-instance
+``__dict__``, as the classes had before.
+
+    python bench/memory.py [number of paths]
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from oas3.base import BaseObject  # NOQA
+from oas3.objects.components import Parameter, Response, Schema  # NOQA
+from oas3.objects.components.media_type import MediaType  # NOQA
+from oas3.objects.path import Path, Operation  # NOQA
+
+
+def with_dict(cls):
+    """Subclasses without ``__slots__`` get back a per-instance ``__dict__``."""
+    return type(cls.__name__, (cls,), {})
+
+
+def build(count, classes):
+    path, operation, parameter, response, media_type, schema = classes
+    nodes = []
+    for index in range(count):
+        nodes.append(path(get=operation(
+            responses={'200': response(description='The resource', content={
+                'application/json': media_type(schema=schema(schema_type='object'))})},
+            operation_id='get{}'.format(index),
+            parameters=[parameter(name='id', location='path', required=True)])))
+    return nodes
+
+
+def measure(count, classes):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = build(count, classes)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    total = sum(1 for node in nodes for _ in walk(node))
+    return used / total, total
+
+
+def walk(value):
+    if isinstance(value, BaseObject):
+        yield value
+        for name in type(value).__slots__:
+            for node in walk(getattr(value, name)):
+                yield node
+    elif isinstance(value, dict):
+        for item in value.values():
+            for node in walk(item):
+                yield node
+    elif isinstance(value, list):
+        for item in value:
+            for node in walk(item):
+                yield node
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    slotted = (Path, Operation, Parameter, Response, MediaType, Schema)
+    for name, classes in (('__dict__', [with_dict(cls) for cls in slotted]),
+                          ('__slots__', slotted)):
+        per_node, total = measure(count, classes)
+        print('{:<10} {:8.1f} bytes per node ({} nodes)'.format(name, per_node, total))
+
+
+if __name__ == '__main__':
+    main()
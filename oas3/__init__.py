@@ -18,6 +18,17 @@ from .objects.components import (Components, Schema, Response, Example, Paramete
                                  RequestBody, Header, SecurityScheme, Link, Callback)
 from .objects.path import Path, Operation
 from .errors import LoadingError, DumpingError, ValidationError  # NOQA
+from .index import OperationIndex
+from .graph import DependencyGraph
+from .validation import validate_spec
+from .batch import load_many
+from .stream import peek
+from .diff import diff_specs
+from .prune import prune
+from .extract import extract_schemas
+from .shard import shard_spec
+from .merge import SpecMerger, merge_specs  # NOQA
+from .frozen import FrozenSpec, freeze_spec  # NOQA
 from ._version import get_versions
 __version__ = get_versions()['version']
 del get_versions
@@ -28,6 +39,9 @@ class Spec(BaseObject):
     High level interface around compiling, validating, parsing and loading an OAS3 spec.
     """
 
+    __slots__ = ('openapi', 'info', 'paths', 'servers', 'components', 'security', 'tags',
+                 'external_docs', '_derived')
+
     class Schema(BaseSchema):
         openapi = fields.Str(required=True)  # FIXME: should use default value
         info = fields.Nested(Info.Schema, required=True)
@@ -61,6 +75,261 @@ class Spec(BaseObject):
         self.security = security
         self.tags = tags
         self.external_docs = external_docs
+        self._derived = {}
+
+    def _derive(self, name, build):
+        """
+        Returns a structure derived from the spec, building it on first use.
+        It is rebuilt when ``paths`` or ``components`` are replaced or paths
+        are added or removed; ``invalidate()`` covers other in place edits.
+        """
+        key = (id(self.paths), len(self.paths or ()), id(self.components))
+        entry = self._derived.get(name)
+        if entry is None or entry[0] != key:
+            entry = self._derived[name] = (key, build())
+        return entry[1]
+
+    def invalidate(self):
+        """Drops the lookup tables derived from the spec so they are rebuilt on next use."""
+        self._derived = {}
+
+    @property
+    def index(self):
+        """
+        Lookup tables of the operations in ``paths`` by operationId, tag and
+        HTTP method. Call ``invalidate()`` after modifying an existing path
+        in place.
+
+        :returns OperationIndex: the operation index of the spec
+        """
+        return self._derive('index', lambda: OperationIndex(self.paths))
+
+    def dependency_graph(self):
+        """
+        Returns the graph of which paths, operations and components depend on
+        which components. Call ``invalidate()`` after modifying the spec in
+        place.
+
+        :returns DependencyGraph: the dependency graph of the spec
+
+        Example:
+            >>> spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+            >>> spec.dependency_graph().dependents('/components/schemas/Error', transitive=False)
+            ['/paths/~1pets/get/responses/default', '/paths/~1pets/post/responses/default', '/paths/~1pets~1{petId}/get/responses/default']
+        """
+        return self._derive('dependency_graph', lambda: DependencyGraph(self))
+
+    def operation(self, operation_id):
+        """
+        Finds an operation by its operationId.
+
+        :returns OperationRef: a ``(path, method, operation)`` named tuple
+        :raises KeyError: if no operation has the operationId
+        :raises ValidationError: if several operations share the operationId
+
+        Example:
+            >>> spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+            >>> spec.operation('showPetById')[:2]
+            ('/pets/{petId}', 'get')
+        """
+        return self.index.operation(operation_id)
+
+    def operations_by_tag(self, tag):
+        """
+        :returns list: ``OperationRef`` tuples of the operations tagged with ``tag``
+        """
+        return list(self.index.by_tag.get(tag, ()))
+
+    def operations_by_method(self, method):
+        """
+        :returns list: ``OperationRef`` tuples of the operations for an HTTP method
+        """
+        return list(self.index.by_method.get(method.lower(), ()))
+
+    @classmethod
+    def load_many(cls, paths, workers=None, io_workers=None, snapshot=False, interner=None):
+        """
+        Loads many spec files concurrently, reading them on a pool of threads
+        and parsing them on a pool of processes. Files that fail to load are
+        reported in their result rather than aborting the batch.
+
+        :param paths: Iterable of file paths
+        :param workers: Number of parsing processes, defaults to the number of CPUs
+        :param io_workers: Number of reading threads, defaults to twice ``workers``
+        :param snapshot: If True results hold a compact ``Snapshot`` of each spec,
+            which is much cheaper to send back from the parsing processes
+        :param interner: An optional ``oas3.intern.Interner`` shared by the whole
+            batch, so strings repeated across specs are kept once
+        :returns iterator: ``LoadResult(path, value, error)`` tuples in completion order
+
+        Example:
+            >>> for path, spec, error in Spec.load_many(glob.glob('./specs/*.yaml'), workers=8):
+            ...     if error is not None:
+            ...         print(path, error)
+        """
+        return load_many(cls, paths, workers=workers, io_workers=io_workers, snapshot=snapshot,
+                         interner=interner)
+
+    @classmethod
+    def merge(cls, *specs, policy='error'):
+        """
+        Merges partial specs into one, in order: ``paths``, ``components``,
+        ``tags``, ``servers`` and ``security`` are united, equal components
+        entries are kept once whatever their name, and ``openapi`` and
+        ``info`` come from the first spec. To add specs one at a time without
+        merging everything again, use ``oas3.merge.SpecMerger``.
+
+        :param specs: Specs, as OAS3 objects or raw data
+        :param policy: ``error`` raises on conflicts, ``prefer-left`` keeps the
+            value merged first and ``rename`` renames conflicting components entries
+        :returns Spec: the merged spec
+        :raises ValidationError: on a conflict the policy does not resolve
+
+        Example:
+            >>> spec = Spec.merge(*[Spec.from_file(path) for path in glob.glob('./partials/*.yaml')],
+            ...                   policy='rename')
+        """
+        return merge_specs(specs, policy=policy, cls=cls)
+
+    @classmethod
+    def peek(cls, path):
+        """
+        Reads only the ``openapi`` version and the ``info`` object of a spec
+        file with an event based parser, stopping as soon as both were found.
+        Nothing else is parsed or validated, so peeking at a large spec costs
+        about as much as reading its first few kilobytes, as long as both come
+        before ``paths`` as they usually do.
+
+        :param path: An absolute or local path to a JSON or YAML file, which may
+            be compressed
+        :returns Header: ``(openapi, info)`` where ``info`` is an ``Info`` object,
+            either is None if missing from the document
+        :raises ValidationError: if the document cannot be parsed or ``info`` is invalid
+
+        Example:
+            >>> openapi, info = Spec.peek('./tests/samples/valid/petstore.yaml')
+            >>> info.title, info.version
+            ('Swagger Petstore', '1.0.0')
+        """
+        return peek(path)
+
+    def validate(self, workers=None):
+        """
+        Validates the whole spec: the shape of every path item and components
+        entry, and that every local ``$ref`` resolves. With ``workers`` the
+        path items and components are split into shards validated by a pool
+        of processes, giving the same result as a serial run.
+
+        :param workers: Number of processes to validate with, None validates serially
+        :returns dict: JSON pointers of the invalid values mapped to error
+            messages, empty if the spec is valid
+
+        Example:
+            >>> spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+            >>> spec.validate(workers=8)
+            {}
+        """
+        return validate_spec(self, workers=workers)
+
+    def diff(self, other):
+        """
+        Compares this spec with a newer version of it. Path items and
+        components entries with equal content hashes are skipped, operations
+        are aligned by path and method, or by operationId when moved, and
+        every change is classified as breaking or not for existing clients,
+        e.g. removed operations, newly required parameters, narrowed request
+        enums or removed response properties are breaking. To compare many
+        versions repeatedly, diff their frozen forms with
+        ``oas3.diff.diff_specs``, which reuses their memoized hashes.
+
+        :param other: The newer ``Spec`` or ``FrozenSpec``
+        :returns SpecDiff: the changes, with ``breaking`` and ``non_breaking`` lists
+
+        Example:
+            >>> old = Spec.from_file('./v1.yaml')
+            >>> [change.pointer for change in old.diff(Spec.from_file('./v2.yaml')).breaking]
+            ['/paths/~1pets/get/parameters/1']
+        """
+        return diff_specs(self, other)
+
+    def prune(self, minify=False):
+        """
+        Removes, in place, the components entries not reachable from
+        ``paths`` or the top level ``security``, following ``$ref``, security
+        requirements, callbacks and links. With ``minify`` the ``description``,
+        ``summary``, ``example`` and ``examples`` fields are stripped first,
+        for specs only used at runtime; response descriptions, which are
+        required, are emptied instead.
+
+        :param minify: If True, documentation text is stripped as well
+        :returns PruneResult: ``(removed, saved)``, the pointers of the removed
+            entries and the number of bytes saved in the compact JSON form
+
+        Example:
+            >>> spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+            >>> spec.components.schemas['Unused'] = {'type': 'string'}
+            >>> spec.prune()
+            PruneResult(removed=['/components/schemas/Unused'], saved=27)
+        """
+        return prune(self, minify=minify)
+
+    def extract_schemas(self, prefix='Inline', min_count=2):
+        """
+        Replaces, in place, object schemas repeated inline across the spec
+        with a ``$ref`` to a single entry of ``components.schemas``: an
+        existing equal entry, or a new one named ``prefix`` followed by a
+        digest of its content, so names are stable across runs.
+
+        :param prefix: Prefix of the names of new components entries
+        :param min_count: Number of inline occurrences from which a schema is hoisted
+        :returns ExtractResult: ``(added, replaced)``, the names of the new
+            entries and the number of inline schemas replaced
+
+        Example:
+            >>> spec = Spec.from_file('./generated.yaml')
+            >>> spec.extract_schemas()
+            ExtractResult(added=['Inline3f2a9c81d0'], replaced=12)
+        """
+        return extract_schemas(self, prefix=prefix, min_count=min_count)
+
+    def shard(self, directory, by='tag', workers=None):
+        """
+        Writes the spec as one self-contained fragment per tag, path or
+        operation, holding only the components entries its operations reach,
+        plus an ``index.json`` listing the shards in an ``x-shards`` field.
+        Fragments are named after a digest of their content, so they can be
+        cached forever, and the output is the same on every run.
+
+        :param directory: Directory to write to, created if missing
+        :param by: ``tag``, ``path`` or ``operation``
+        :param workers: Number of processes writing fragments, None writes serially
+        :returns dict: the index document
+
+        Example:
+            >>> spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+            >>> import tempfile
+            >>> index = spec.shard(tempfile.mkdtemp())
+            >>> [shard['file'] for shard in index['x-shards']['shards']]
+            ['pets.a5f4cc9820910cd3.json']
+        """
+        return shard_spec(self, directory, by=by, workers=workers)
+
+    def freeze(self):
+        """
+        Returns an immutable, hashable snapshot of the spec, which can be
+        shared between threads without copying. ``evolve`` and ``remove``
+        on it return edited snapshots that copy only the values from the
+        root to the change, and ``to_spec`` returns a mutable spec again.
+
+        :returns FrozenSpec: the snapshot
+
+        Example:
+            >>> frozen = Spec.from_file('./tests/samples/valid/petstore.yaml').freeze()
+            >>> edited = frozen.evolve('/paths/~1pets/get/summary', 'List pets')
+            >>> edited['components'] is frozen['components']
+            True
+        """
+        return freeze_spec(self)
 
     def to_dict(self):
         """
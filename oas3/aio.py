@@ -0,0 +1,86 @@
+"""
+oas3.aio
+~~~~~~~~
+Asyncio support for loading OAS3 objects without blocking the event loop.
+"""
+
+import asyncio
+import threading
+from .remote import make_session, fetch
+
+
+class AsyncLoader:
+    """
+    Loads OAS3 objects from files and URLs in coroutines. Blocking file
+    reads, HTTP requests and parsing all run in an executor, HTTP requests
+    share a pooled session with retries, and at most ``concurrency`` loads
+    run at the same time.
+
+    :param concurrency: Maximum number of loads in progress at once
+    :param timeout: Seconds to wait for a server to connect or respond
+    :param retries: Number of retries of a failed HTTP request
+    :param executor: A ``concurrent.futures`` executor, defaults to the loop's one
+
+    Example:
+        >>> loader = AsyncLoader(concurrency=20, timeout=10)
+        >>> specs = await asyncio.gather(*[Spec.from_url_async(url, loader=loader) for url in urls])
+    """
+
+    def __init__(self, concurrency=10, timeout=30, retries=3, executor=None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.executor = executor
+        self.session = make_session(pool_size=concurrency, retries=retries)
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _semaphore(self):
+        loop = asyncio.get_event_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                for old in [old for old in self._semaphores if old.is_closed()]:
+                    del self._semaphores[old]
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.concurrency)
+        return semaphore
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self.executor, function, *args)
+
+    async def load_file(self, cls, path):
+        """Loads an object of type ``cls`` from a file."""
+        async with self._semaphore():
+            return await self._run(cls.from_file, path)
+
+    async def load_url(self, cls, url, format_type=None):
+        """Loads an object of type ``cls`` from a URL."""
+        async with self._semaphore():
+            response = await self._run(fetch, url, self.session, self.timeout)
+            return await self._run(cls.from_string, response.text, format_type)
+
+    async def load_all(self, cls, sources, return_exceptions=True):
+        """
+        Loads many objects concurrently from file paths and ``http(s)://`` URLs.
+
+        :param return_exceptions: If True a failed load gives its exception in
+            the results instead of raising
+        :returns list: the loaded objects in the order of ``sources``
+        """
+        loads = [self.load_url(cls, source) if source.startswith(('http://', 'https://'))
+                 else self.load_file(cls, source) for source in sources]
+        return await asyncio.gather(*loads, return_exceptions=return_exceptions)
+
+    def close(self):
+        self.session.close()
+
+
+_default_loader = None
+
+
+def default_loader():
+    """Returns the ``AsyncLoader`` used when none is given."""
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = AsyncLoader()
+    return _default_loader
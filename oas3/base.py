@@ -12,6 +12,45 @@ import marshmallow
 from inspect import cleandoc
 from marshmallow import post_dump, post_load
 from .errors import ValidationError, LoadingError, DumpingError
+from .aio import default_loader
+from .files import decode, read_bytes, strip_compression, is_archive, Archive
+
+
+def format_of(path):
+    """
+    Infers `json` or `yaml` from the extension of a path, or None if unknown.
+    A compression suffix such as in ``spec.yaml.gz`` is ignored.
+    """
+    extension = pathlib.Path(strip_compression(path)).suffix.lower()
+    if extension == '.json':
+        return 'json'
+    if extension in ['.yaml', '.yml']:
+        return 'yaml'
+    return None
+
+
+def parse_data(data, format_type=None):
+    """
+    Parses a JSON or YAML document into python builtin data types.
+
+    :param data: The document, a string or undecoded ``bytes``; JSON is parsed
+        from bytes directly, YAML is decoded first
+    :param format_type: either `json` or `yaml` or None, if None JSON and then
+        YAML are attempted
+    :raises ValidationError: if the document could not be parsed
+    """
+    if format_type != 'yaml':
+        try:
+            return json.loads(data)
+        except:
+            if format_type == 'json':
+                raise ValidationError('Unable to load, invalid JSON data')
+    try:
+        if isinstance(data, (bytes, bytearray)):
+            data = decode(data)
+        return yaml.load(data)
+    except:
+        raise ValidationError('Unable to load, invalid YAML data')
 
 
 class BaseSchema(marshmallow.Schema):
@@ -35,62 +74,179 @@ class BaseSchema(marshmallow.Schema):
 
 
 class BaseObject:
-    """Provides a base class for all OAS3 objects to inherit from."""
+    """
+    Provides a base class for all OAS3 objects to inherit from.
+
+    Subclasses declare their fields in ``__slots__`` so instances carry no
+    per-instance ``__dict__``, which dominates memory use for large specs.
+    """
+
+    __slots__ = ()
+
+    def content_digest(self):
+        """
+        Returns the hex digest of the Merkle hash of the object, equal for
+        objects of the same class holding equal data. It is not cached:
+        objects are mutable, in place edits of the raw dicts they hold cannot
+        be observed, so every call hashes the whole object again. Freeze a
+        spec, see ``Spec.freeze()``, to get Merkle hashes memoized per subtree.
+
+        :returns str: the hex digest
+        """
+        from .hashing import merkle
+        return merkle(self).digest.hex()
 
     @classmethod
-    def from_file(cls, path):
+    def from_file(cls, path, member=None, include=None, interner=None):
         """
         Reads in a file from a system path to load a spec object.
 
+        Files compressed with gzip, bzip2 or xz (``.gz``, ``.bz2``, ``.xz``) are
+        decompressed as they are read. Zip and tar archives are read in place:
+        the root document is loaded with every relative ``$ref`` to another
+        file of the archive inlined.
+
+        With ``include`` only a projection of a spec is loaded: the path items
+        and components entries matching the patterns, plus every components
+        entry they transitively reference, along with the other top level
+        fields. The rest is skipped while parsing and never validated.
+
         :param path: An absolute or local path to the file to be loaded
+        :param member: Name of the root document within an archive, found
+            automatically if None
+        :param include: Patterns like ``paths./pets*`` or ``components.schemas.Pet``
+            selecting what to load of a spec, see ``oas3.stream.Projection``
+        :param interner: An optional ``oas3.intern.Interner`` deduplicating the
+            strings and small values of the document, and of any other document
+            loaded with it
         :returns instance: Newly created object of the same type the method
             was called from
+        :raises LoadingError: if the root document of an archive is not found
+            or one of its references does not resolve
 
         Example:
             >>> from oas3 import Spec
             >>> spec = Spec.from_file('./tests/samples/valid/uspto.yaml')
+            >>> spec = Spec.from_file('./specs.tar.gz', member='api/openapi.yaml')
+            >>> spec = Spec.from_file('./tests/samples/valid/petstore.yaml',
+            ...                       include=['paths./pets/*'])
         """
-        data = open(path).read()
-        extension = pathlib.Path(path).suffix
-        if extension == '.json':
-            return cls.from_json(data)
-        if extension in ['.yaml', '.yml']:
-            return cls.from_yaml(data)
-        return cls.from_raw(data)
+        if is_archive(path):
+            return cls.from_archive(path, member, include, interner)
+        if include is not None:
+            from .stream import load_projection
+            return cls.from_dict(load_projection(path, include), interner)
+        return cls.from_string(read_bytes(path), format_of(path), interner)
 
     @classmethod
-    def from_url(cls, url, format_type=None):
+    def from_archive(cls, path, member=None, include=None, interner=None):
+        """
+        Loads the object from a multi-file spec stored in a zip or tar archive,
+        see ``from_file``.
+        """
+        from .refs import ArchiveReader, bundle
+        from .stream import Projection
+        with Archive(path) as archive:
+            try:
+                root = member or archive.root()
+                document, _ = bundle(root, ArchiveReader(archive))
+            except KeyError as e:
+                raise LoadingError('Unable to load {} from {}: {}'.format(
+                    member or 'the root document', path, e.args[0]))
+        if include is not None:
+            document = Projection(include).apply(document)
+        return cls.from_dict(document, interner)
+
+    @classmethod
+    def from_url(cls, url, format_type=None, cache=None):
         """
         Load a JSON or YAML OAS 3 spec object from a provided url string.
 
         :param url: The endpoint where the file is hosted at.
         :param format_type: either `json` or `yaml` or None, if  None it will attempt
         to be inferred.
+        :param cache: An optional ``oas3.remote.ConditionalCache``, unchanged documents
+            are then revalidated with the server instead of downloaded and parsed again
         :returns instance: a newly created object or the type this method was called from
 
         Example:
             >>> from oas3 import Spec
             >>> spec = Spec.from_url('https://raw.githubusercontent.com/OAI/OpenAPI-Specification/master/examples/v3.0/petstore.yaml')
         """
+        if cache is not None:
+            return cache.load(cls, url, format_type)
         response = requests.get(url)
         if not response.ok:
             raise LoadingError('HTTP Error: {}'.format(response.status_code))
+        return cls.from_string(response.text, format_type)
+
+    @classmethod
+    async def from_file_async(cls, path, loader=None):
+        """
+        Coroutine version of ``from_file``, reading and parsing the file in an
+        executor so the event loop is not blocked.
+
+        :param path: An absolute or local path to the file to be loaded
+        :param loader: The ``oas3.aio.AsyncLoader`` to use, a shared default if None
+        :returns instance: Newly created object of the same type the method
+            was called from
+
+        Example:
+            >>> spec = await Spec.from_file_async('./tests/samples/valid/uspto.yaml')
+        """
+        return await (loader or default_loader()).load_file(cls, path)
+
+    @classmethod
+    async def from_url_async(cls, url, format_type=None, loader=None):
+        """
+        Coroutine version of ``from_url``, fetching through the pooled session
+        of the loader, with its concurrency limit, timeout and retries.
+
+        :param url: The endpoint where the file is hosted at.
+        :param format_type: either `json` or `yaml` or None, if None it will attempt
+        to be inferred.
+        :param loader: The ``oas3.aio.AsyncLoader`` to use, a shared default if None
+        :returns instance: a newly created object or the type this method was called from
+
+        Example:
+            >>> specs = await asyncio.gather(Spec.from_url_async(first_url),
+            ...                              Spec.from_url_async(second_url))
+        """
+        return await (loader or default_loader()).load_url(cls, url, format_type)
+
+    @classmethod
+    def from_string(cls, data, format_type=None, interner=None):
+        """
+        Load the OAS3 object from a JSON or YAML string.
+
+        :param data: The JSON or YAML document, a string or undecoded ``bytes``
+        :param format_type: either `json` or `yaml` or None, if None it will attempt
+        to be inferred.
+        :param interner: An optional ``oas3.intern.Interner``, see ``from_dict``
+        :returns instance: a newly created object or the type this method was called from
+        """
+        if interner is not None:
+            return cls.from_dict(parse_data(data, format_type), interner)
         if format_type == 'yaml':
-            return cls.from_yaml(response.text)
+            return cls.from_yaml(data)
         elif format_type == 'json':
-            return cls.from_json(response.text)
+            return cls.from_json(data)
         else:
-            return cls.from_raw(response.text)
+            return cls.from_raw(data)
 
     @classmethod
-    def from_dict(cls, dictionary):
+    def from_dict(cls, dictionary, interner=None):
         """
         Load the object with a python dictionary.
 
+        :param interner: An optional ``oas3.intern.Interner``, the dictionary is
+            interned with it before loading
         :returns instance: Returns a newly created instance of the class this method
             was called from.
         :raises ValidationError: Raises if the data doesnt meet object defined schema.
         """
+        if interner is not None:
+            dictionary = interner.intern(dictionary)
         result, errors = cls.Schema().load(dictionary)
         if errors:
             raise ValidationError("Validation error encountered in [{}] ".format(cls.__name__) +
@@ -107,11 +263,7 @@ class BaseObject:
         :raises ValidationError: Raises if JSON is invalid or if the specification
             data was invalid.
         """
-        try:
-            dictionary = json.loads(json_string)
-        except:
-            raise ValidationError('Unable to load, invalid JSON data')
-        return cls.from_dict(dictionary)
+        return cls.from_dict(parse_data(json_string, 'json'))
 
     @classmethod
     def from_yaml(cls, yaml_string):
@@ -123,11 +275,7 @@ class BaseObject:
         :raises ValidationError: Raises if YAML is invalid or if the specification
             data was invalid.
         """
-        try:
-            dictionary = yaml.load(yaml_string)
-        except:
-            raise ValidationError('Unable to load, invalid YAML data')
-        return cls.from_dict(dictionary)
+        return cls.from_dict(parse_data(yaml_string, 'yaml'))
 
     @classmethod
     def from_docstring(cls, obj_or_cls_or_func):
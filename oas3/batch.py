@@ -0,0 +1,87 @@
+"""
+oas3.batch
+~~~~~~~~~~
+Loads many spec files concurrently: files are read on a pool of threads and
+parsed on a pool of processes.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from .base import format_of
+from .files import strip_compression, is_archive
+from .snapshot import Snapshot
+
+LoadResult = namedtuple('LoadResult', ['path', 'value', 'error'])
+
+
+def _read(path):
+    if is_archive(path) or strip_compression(path) != path:
+        # decompressed while parsing, to not hold both copies at once
+        return None
+    with open(path, 'rb') as file_ref:
+        return file_ref.read()
+
+
+def _parse(cls, path, data, snapshot):
+    if data is None:
+        obj = cls.from_file(path)
+    else:
+        obj = cls.from_string(data, format_of(path))
+    if snapshot:
+        return Snapshot.take(obj)
+    return obj
+
+
+def load_many(cls, paths, workers=None, io_workers=None, snapshot=False, window=None,
+              interner=None):
+    """
+    Loads OAS3 objects from many files, yielding a ``LoadResult`` for each
+    file as soon as it is done. A file that fails to load yields a result
+    with its exception in ``error`` and does not stop the others.
+
+    :param cls: The OAS3 object class to load
+    :param paths: Iterable of file paths
+    :param workers: Number of parsing processes, defaults to the number of CPUs
+    :param io_workers: Number of reading threads, defaults to twice ``workers``
+    :param snapshot: If True results hold a ``Snapshot`` instead of the loaded object
+    :param window: Maximum number of files read or parsed at once, bounding memory use
+    :param interner: An optional ``oas3.intern.Interner`` the loaded objects are
+        interned with as they come back, sharing values across the whole batch
+    """
+    workers = workers or os.cpu_count() or 1
+    io_workers = io_workers or 2 * workers
+    window = window or 4 * workers
+    paths = iter(paths)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=io_workers) as readers, \
+            ProcessPoolExecutor(max_workers=workers) as parsers:
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        path = next(paths)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    pending[readers.submit(_read, path)] = (path, 'read')
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, stage = pending.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        yield LoadResult(path, None, error)
+                    elif stage == 'read':
+                        parse = parsers.submit(_parse, cls, path, future.result(), snapshot)
+                        pending[parse] = (path, 'parse')
+                    else:
+                        value = future.result()
+                        if interner is not None and not snapshot:
+                            value = interner.intern(value)
+                        yield LoadResult(path, value, None)
+        finally:
+            for future in pending:
+                future.cancel()
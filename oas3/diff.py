@@ -0,0 +1,452 @@
+"""
+oas3.diff
+~~~~~~~~~
+Structural differences between two versions of a spec, classified as
+breaking or non-breaking for the clients of the API.
+"""
+
+from collections import namedtuple
+from .frozen import FrozenDict, freeze, thaw
+from .hashing import merkle, diff_pointers
+from .index import HTTP_METHODS
+from .util import join_pointer, split_pointer
+from .validation import SECTION_ATTRIBUTES
+
+Change = namedtuple('Change', ['pointer', 'kind', 'breaking', 'message'])
+
+REQUEST = 'request'
+RESPONSE = 'response'
+COMPONENT = 'component'
+
+DOCUMENTATION = frozenset(('description', 'summary', 'title', 'example', 'examples',
+                           'externalDocs', 'tags', 'xml', 'info',
+                           'servers', 'contact', 'license', 'termsOfService'))
+
+# Fields not compared one by one whose changes still break clients
+BREAKING_FIELDS = frozenset(('security', 'securitySchemes', 'style', 'explode',
+                             'allowReserved', 'content'))
+
+_SCHEMA_HANDLED = frozenset(('$ref', 'type', 'enum', 'required', 'properties', 'items',
+                             'additionalProperties', 'not', 'allOf', 'anyOf', 'oneOf'))
+
+
+class SpecDiff:
+    """
+    The changes between two versions of a spec, each a ``Change`` tuple of
+    the JSON pointer of the change in the new version (the old one for
+    removals), its kind, whether it breaks clients, and a message.
+    """
+
+    def __init__(self, changes):
+        self.changes = sorted(changes)
+
+    def __iter__(self):
+        return iter(self.changes)
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def __repr__(self):
+        return 'SpecDiff({} changes, {} breaking)'.format(len(self.changes), len(self.breaking))
+
+    @property
+    def breaking(self):
+        """The changes that break existing clients."""
+        return [change for change in self.changes if change.breaking]
+
+    @property
+    def non_breaking(self):
+        return [change for change in self.changes if not change.breaking]
+
+    def is_breaking(self):
+        return any(change.breaking for change in self.changes)
+
+
+def _child(node, *keys):
+    """Returns the first child of a ``MerkleNode`` found among ``keys``."""
+    if node is None or not isinstance(node.children, dict):
+        return None
+    for key in keys:
+        if key in node.children:
+            return node.children[key]
+    return None
+
+
+def _same(left, right):
+    return left is not None and right is not None and left.digest == right.digest
+
+
+def _as_list(value):
+    return value if isinstance(value, list) else []
+
+
+def _as_dict(value):
+    return value if isinstance(value, (dict, FrozenDict)) else {}
+
+
+def diff_specs(old, new):
+    """
+    Compares two versions of a spec. Subtrees with equal Merkle hashes are
+    skipped, path items and components entries that changed are compared
+    field by field, and operations are aligned by path and method, or by
+    operationId when they moved to another path.
+
+    Specs are compared in their frozen form, where keys such as response
+    codes are always strings, so a spec loaded from YAML and the same spec
+    loaded from JSON are equal. Frozen specs, see ``Spec.freeze()``, memoize
+    their hashes, so once computed the comparison costs time proportional to
+    the path items and components entries that changed; other specs are
+    frozen first, in linear time.
+
+    :param old: A ``Spec`` or ``FrozenSpec``
+    :param new: A ``Spec`` or ``FrozenSpec``
+    :returns SpecDiff: the classified changes
+    """
+    changes = []
+    old, new = freeze(old), freeze(new)
+    left, right = merkle(old), merkle(new)
+    if left.digest == right.digest:
+        return SpecDiff(changes)
+    for key in sorted(set(left.children) | set(right.children)):
+        if _same(left.children.get(key), right.children.get(key)):
+            continue
+        if key == 'paths':
+            _diff_paths(changes, _as_dict(old.get(key)), _as_dict(new.get(key)),
+                        left.children.get(key), right.children.get(key))
+        elif key == 'components':
+            _diff_components(changes, _as_dict(old.get(key)), _as_dict(new.get(key)),
+                             left.children.get(key), right.children.get(key))
+        else:
+            _diff_generic(changes, join_pointer(key), thaw(old.get(key)), thaw(new.get(key)))
+    return SpecDiff(changes)
+
+
+def _is_extension(token):
+    return str(token).startswith('x-')
+
+
+def _diff_generic(changes, pointer, old, new, breaking=False):
+    """
+    Reports each differing value of fields not compared one by one. Changes
+    to documentation and ``x-`` extensions never break clients, others only
+    do under ``BREAKING_FIELDS`` or if ``breaking`` is set.
+    """
+    for location in diff_pointers(old, new):
+        tokens = split_pointer(pointer + location)
+        if any(_is_extension(token) for token in tokens):
+            changes.append(Change(pointer + location, 'extension-changed', False,
+                                  'Extension changed'))
+        elif DOCUMENTATION.intersection(tokens):
+            changes.append(Change(pointer + location, 'documentation-changed', False,
+                                  'Documentation changed'))
+        else:
+            changes.append(Change(pointer + location, 'changed',
+                                  breaking or bool(BREAKING_FIELDS.intersection(tokens)),
+                                  'Value changed'))
+
+
+def _operation_pointer(path, method):
+    return join_pointer('paths', path, method)
+
+
+def _diff_paths(changes, old_paths, new_paths, left, right):
+    left = left.children if left is not None else {}
+    right = right.children if right is not None else {}
+    removed = {}
+    added = {}
+    for path in sorted(set(old_paths) | set(new_paths), key=str):
+        if _same(left.get(path), right.get(path)):
+            continue
+        old_item = _as_dict(thaw(old_paths.get(path)))
+        new_item = _as_dict(thaw(new_paths.get(path)))
+        pointer = join_pointer('paths', path)
+        _diff_parameters(changes, pointer, old_item.get('parameters'), new_item.get('parameters'))
+        for method in HTTP_METHODS:
+            old_operation = old_item.get(method)
+            new_operation = new_item.get(method)
+            if isinstance(old_operation, dict) and isinstance(new_operation, dict):
+                _diff_operation(changes, pointer + join_pointer(method),
+                                old_operation, new_operation)
+            elif isinstance(old_operation, dict):
+                removed[path, method] = old_operation
+            elif isinstance(new_operation, dict):
+                added[path, method] = new_operation
+        others = set(old_item) | set(new_item)
+        others -= set(HTTP_METHODS) | {'parameters'}
+        for key in sorted(others):
+            if old_item.get(key) != new_item.get(key):
+                _diff_generic(changes, pointer + join_pointer(key), old_item.get(key),
+                              new_item.get(key))
+
+    added_by_id = {operation['operationId']: key for key, operation in added.items()
+                   if operation.get('operationId')}
+    for key in sorted(removed):
+        operation = removed[key]
+        moved = added_by_id.pop(operation.get('operationId'), None)
+        if moved is None:
+            changes.append(Change(_operation_pointer(*key), 'operation-removed', True,
+                                  'Operation {} {} removed'.format(key[1].upper(), key[0])))
+            continue
+        pointer = _operation_pointer(*moved)
+        changes.append(Change(pointer, 'operation-moved', True, 'Operation {} moved from {} {}'
+                              .format(operation['operationId'], key[1].upper(), key[0])))
+        _diff_operation(changes, pointer, operation, added.pop(moved))
+    for key in sorted(added):
+        changes.append(Change(_operation_pointer(*key), 'operation-added', False,
+                              'Operation {} {} added'.format(key[1].upper(), key[0])))
+
+
+def _diff_operation(changes, pointer, old, new):
+    if old == new:
+        return
+    _diff_parameters(changes, pointer, old.get('parameters'), new.get('parameters'))
+    if old.get('requestBody') != new.get('requestBody'):
+        _diff_request_body(changes, pointer + '/requestBody', old.get('requestBody'),
+                           new.get('requestBody'))
+    if old.get('responses') != new.get('responses'):
+        _diff_responses(changes, pointer + '/responses', _as_dict(old.get('responses')),
+                        _as_dict(new.get('responses')))
+    if not old.get('deprecated') and new.get('deprecated'):
+        changes.append(Change(pointer + '/deprecated', 'operation-deprecated', False,
+                              'Operation deprecated'))
+    others = set(old) | set(new)
+    others -= {'parameters', 'requestBody', 'responses', 'deprecated'}
+    for key in sorted(others):
+        if old.get(key) != new.get(key):
+            _diff_generic(changes, pointer + join_pointer(key), old.get(key), new.get(key))
+
+
+def _parameter_key(parameter):
+    if '$ref' in parameter:
+        return '$ref', parameter['$ref']
+    return parameter.get('name'), parameter.get('in')
+
+
+def _diff_parameters(changes, pointer, old, new):
+    old = {_parameter_key(parameter): (index, parameter)
+           for index, parameter in enumerate(_as_list(old)) if isinstance(parameter, dict)}
+    new = {_parameter_key(parameter): (index, parameter)
+           for index, parameter in enumerate(_as_list(new)) if isinstance(parameter, dict)}
+    for key in sorted(set(old) | set(new), key=str):
+        if key not in new:
+            changes.append(Change(pointer + join_pointer('parameters', old[key][0]),
+                                  'parameter-removed', True,
+                                  'Parameter {} removed'.format(key[0])))
+        elif key not in old:
+            required = bool(new[key][1].get('required'))
+            changes.append(Change(pointer + join_pointer('parameters', new[key][0]),
+                                  'required-parameter-added' if required else 'parameter-added',
+                                  required, 'Parameter {} added'.format(key[0])))
+        else:
+            _diff_parameter(changes, pointer + join_pointer('parameters', new[key][0]),
+                            old[key][1], new[key][1])
+
+
+def _diff_parameter(changes, pointer, old, new):
+    if old == new:
+        return
+    if not old.get('required') and new.get('required'):
+        changes.append(Change(pointer + '/required', 'parameter-required', True,
+                              'Parameter {} became required'.format(new.get('name'))))
+    elif old.get('required') and not new.get('required'):
+        changes.append(Change(pointer + '/required', 'parameter-optional', False,
+                              'Parameter {} became optional'.format(new.get('name'))))
+    _diff_schema(changes, pointer + '/schema', old.get('schema'), new.get('schema'), REQUEST)
+    for key in sorted((set(old) | set(new)) - {'required', 'schema'}):
+        if old.get(key) != new.get(key):
+            _diff_generic(changes, pointer + join_pointer(key), old.get(key), new.get(key))
+
+
+def _diff_content(changes, pointer, old, new, context):
+    old, new = _as_dict(old), _as_dict(new)
+    for media_type in sorted(set(old) | set(new)):
+        media_pointer = pointer + join_pointer(media_type)
+        if media_type not in new:
+            changes.append(Change(media_pointer, 'media-type-removed', True,
+                                  'Media type {} removed'.format(media_type)))
+        elif media_type not in old:
+            changes.append(Change(media_pointer, 'media-type-added', False,
+                                  'Media type {} added'.format(media_type)))
+        else:
+            old_media, new_media = _as_dict(old[media_type]), _as_dict(new[media_type])
+            _diff_schema(changes, media_pointer + '/schema', old_media.get('schema'),
+                         new_media.get('schema'), context)
+            for key in sorted((set(old_media) | set(new_media)) - {'schema'}):
+                if old_media.get(key) != new_media.get(key):
+                    _diff_generic(changes, media_pointer + join_pointer(key),
+                                  old_media.get(key), new_media.get(key))
+
+
+def _diff_request_body(changes, pointer, old, new):
+    if not isinstance(new, dict):
+        changes.append(Change(pointer, 'request-body-removed', True, 'Request body removed'))
+        return
+    if not isinstance(old, dict):
+        required = bool(new.get('required'))
+        changes.append(Change(pointer, 'request-body-added', required, 'Request body added'))
+        return
+    if '$ref' in old or '$ref' in new:
+        _diff_generic(changes, pointer, old, new, breaking=True)
+        return
+    if not old.get('required') and new.get('required'):
+        changes.append(Change(pointer + '/required', 'request-body-required', True,
+                              'Request body became required'))
+    _diff_content(changes, pointer + '/content', old.get('content'), new.get('content'), REQUEST)
+    for key in sorted((set(old) | set(new)) - {'required', 'content'}):
+        if old.get(key) != new.get(key):
+            _diff_generic(changes, pointer + join_pointer(key), old.get(key), new.get(key))
+
+
+def _diff_responses(changes, pointer, old, new):
+    for status in sorted(set(old) | set(new), key=str):
+        status_pointer = pointer + join_pointer(status)
+        if status not in new:
+            changes.append(Change(status_pointer, 'response-removed', True,
+                                  'Response {} removed'.format(status)))
+        elif status not in old:
+            changes.append(Change(status_pointer, 'response-added', False,
+                                  'Response {} added'.format(status)))
+        else:
+            _diff_response(changes, status_pointer, old[status], new[status])
+
+
+def _diff_response(changes, pointer, old, new):
+    old, new = _as_dict(old), _as_dict(new)
+    if old == new:
+        return
+    if '$ref' in old or '$ref' in new:
+        _diff_generic(changes, pointer, old, new, breaking=True)
+        return
+    _diff_content(changes, pointer + '/content', old.get('content'), new.get('content'),
+                  RESPONSE)
+    for key in sorted((set(old) | set(new)) - {'content'}):
+        if old.get(key) != new.get(key):
+            _diff_generic(changes, pointer + join_pointer(key), old.get(key), new.get(key))
+
+
+def _diff_schema(changes, pointer, old, new, context):
+    """
+    Compares two raw Schema objects. ``context`` tells whether the schema
+    describes data sent by clients, data received by them, or, for a
+    components entry, possibly both, in which case a change is breaking if it
+    would be in either direction.
+    """
+    if old == new:
+        return
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        changes.append(Change(pointer, 'schema-changed', True, 'Schema changed'))
+        return
+    if old.get('$ref') != new.get('$ref'):
+        changes.append(Change(pointer, 'schema-changed', True, 'Referenced schema changed'))
+        return
+    if old.get('type') != new.get('type'):
+        changes.append(Change(pointer + '/type', 'type-changed', True, 'Type changed from {} to {}'
+                              .format(old.get('type'), new.get('type'))))
+    _diff_enum(changes, pointer + '/enum', old.get('enum'), new.get('enum'), context)
+    old_required = set(_as_list(old.get('required')))
+    new_required = set(_as_list(new.get('required')))
+    for name in sorted(new_required - old_required):
+        changes.append(Change(pointer + '/required', 'required-property-added',
+                              context != RESPONSE, 'Property {} became required'.format(name)))
+    for name in sorted(old_required - new_required):
+        changes.append(Change(pointer + '/required', 'required-property-removed',
+                              context != REQUEST, 'Property {} became optional'.format(name)))
+    old_properties = _as_dict(old.get('properties'))
+    new_properties = _as_dict(new.get('properties'))
+    for name in sorted(set(old_properties) | set(new_properties)):
+        property_pointer = pointer + join_pointer('properties', name)
+        if name not in new_properties:
+            changes.append(Change(property_pointer, 'property-removed', context != REQUEST,
+                                  'Property {} removed'.format(name)))
+        elif name not in old_properties:
+            changes.append(Change(property_pointer, 'property-added', False,
+                                  'Property {} added'.format(name)))
+        else:
+            _diff_schema(changes, property_pointer, old_properties[name],
+                         new_properties[name], context)
+    for keyword in ('items', 'additionalProperties', 'not'):
+        if old.get(keyword) != new.get(keyword):
+            _diff_schema(changes, pointer + join_pointer(keyword), old.get(keyword),
+                         new.get(keyword), context)
+    for keyword in ('allOf', 'anyOf', 'oneOf'):
+        old_list, new_list = old.get(keyword), new.get(keyword)
+        if old_list == new_list:
+            continue
+        if isinstance(old_list, list) and isinstance(new_list, list) and \
+                len(old_list) == len(new_list):
+            for index, item in enumerate(old_list):
+                _diff_schema(changes, pointer + join_pointer(keyword, index), item,
+                             new_list[index], context)
+        else:
+            changes.append(Change(pointer + join_pointer(keyword), 'schema-changed', True,
+                                  'Composition {} changed'.format(keyword)))
+    for keyword in sorted((set(old) | set(new)) - _SCHEMA_HANDLED):
+        if old.get(keyword) == new.get(keyword):
+            continue
+        if _is_extension(keyword):
+            changes.append(Change(pointer + join_pointer(keyword), 'extension-changed',
+                                  False, 'Extension changed'))
+        elif keyword in DOCUMENTATION:
+            changes.append(Change(pointer + join_pointer(keyword), 'documentation-changed',
+                                  False, 'Documentation changed'))
+        else:
+            changes.append(Change(pointer + join_pointer(keyword), 'constraint-changed', True,
+                                  'Constraint {} changed'.format(keyword)))
+
+
+def _diff_enum(changes, pointer, old, new, context):
+    if old == new:
+        return
+    if new is None:
+        changes.append(Change(pointer, 'enum-widened', context != REQUEST, 'Enum removed'))
+        return
+    if old is None:
+        changes.append(Change(pointer, 'enum-narrowed', context != RESPONSE, 'Enum added'))
+        return
+    removed = [value for value in _as_list(old) if value not in _as_list(new)]
+    added = [value for value in _as_list(new) if value not in _as_list(old)]
+    if removed:
+        changes.append(Change(pointer, 'enum-narrowed', context != RESPONSE,
+                              'Enum values removed: {}'.format(removed)))
+    if added:
+        changes.append(Change(pointer, 'enum-widened', context != REQUEST,
+                              'Enum values added: {}'.format(added)))
+
+
+def _diff_components(changes, old, new, left, right):
+    for section in sorted(SECTION_ATTRIBUTES):
+        old_entries = _as_dict(old.get(section))
+        new_entries = _as_dict(new.get(section))
+        left_section = _child(left, section)
+        right_section = _child(right, section)
+        if _same(left_section, right_section):
+            continue
+        for name in sorted(set(old_entries) | set(new_entries)):
+            pointer = join_pointer('components', section, name)
+            if _same(_child(left_section, name), _child(right_section, name)):
+                continue
+            if name not in new_entries:
+                changes.append(Change(pointer, 'component-removed', True,
+                                      'Component {} removed'.format(name)))
+            elif name not in old_entries:
+                changes.append(Change(pointer, 'component-added', False,
+                                      'Component {} added'.format(name)))
+            else:
+                _diff_component(changes, pointer, section, thaw(old_entries[name]),
+                                thaw(new_entries[name]))
+
+
+def _diff_component(changes, pointer, section, old, new):
+    if section == 'schemas':
+        _diff_schema(changes, pointer, old, new, COMPONENT)
+    elif section == 'parameters':
+        _diff_parameter(changes, pointer, _as_dict(old), _as_dict(new))
+    elif section == 'requestBodies':
+        _diff_request_body(changes, pointer, old, new)
+    elif section == 'responses':
+        _diff_response(changes, pointer, old, new)
+    else:
+        _diff_generic(changes, pointer, old, new)
@@ -0,0 +1,189 @@
+"""
+oas3.extract
+~~~~~~~~~~~~
+Hoisting of repeated inline Schema objects into ``components.schemas``.
+"""
+
+from collections import namedtuple
+from .base import BaseObject
+from .hashing import digest
+from .index import field
+from .objects.components import Components
+from .shapes import SchemaTable, iter_subschemas, map_subschemas
+from .util import to_builtin, join_pointer
+from .validation import SECTION_ATTRIBUTES
+
+ExtractResult = namedtuple('ExtractResult', ['added', 'replaced'])
+
+# Schemas worth a components entry of their own, rather than scalar types
+_COMPOSITE = ('properties', 'allOf', 'anyOf', 'oneOf')
+
+# Values of these keys are user data, no Schema object is looked for within
+_DATA = ('example', 'examples', 'default', 'enum')
+
+# Sections of components holding no Schema objects
+_SKIPPED_SECTIONS = ('schemas', 'examples', 'securitySchemes', 'links')
+
+
+def _hoistable(schema):
+    return '$ref' not in schema and (schema.get('type') == 'object' or
+                                     any(keyword in schema for keyword in _COMPOSITE))
+
+
+def _iter_schemas(value):
+    """Yields every raw Schema object held under a ``schema`` key within raw data."""
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if key == 'schema':
+                    if isinstance(item, dict):
+                        yield item
+                elif key not in _DATA and not str(key).startswith('x-'):
+                    stack.append(item)
+        elif isinstance(value, list):
+            stack.extend(value)
+
+
+def _map_schemas(value, function):
+    """Returns a copy of raw data with ``function`` applied to the values of ``schema`` keys."""
+    if isinstance(value, dict):
+        return {key: function(item) if key == 'schema' and isinstance(item, dict)
+                else item if key in _DATA or str(key).startswith('x-')
+                else _map_schemas(item, function)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_map_schemas(item, function) for item in value]
+    return value
+
+
+class SchemaExtractor:
+    """
+    Finds object schemas repeated inline across a spec and replaces them
+    with a ``$ref`` to a single components entry. Inline schemas equal to an
+    existing entry of ``components.schemas`` refer to it instead, other
+    repeated ones get a new entry named ``prefix`` followed by a digest of
+    their content, so the names are stable across runs.
+
+    Schemas are compared by the shape IDs of a ``oas3.shapes.SchemaTable``,
+    which hashes every subtree once, and only the first occurrence of a
+    repeated schema is walked, so a spec is processed in time linear in its
+    size.
+
+    :param prefix: Prefix of the names of new components entries
+    :param min_count: Number of inline occurrences from which a schema is hoisted
+
+    Example:
+        >>> SchemaExtractor().extract(spec)
+        ExtractResult(added=['Inline3f2a9c81d0'], replaced=12)
+    """
+
+    def __init__(self, prefix='Inline', min_count=2):
+        self.prefix = prefix
+        self.min_count = min_count
+        self.shapes = SchemaTable()
+
+    def extract(self, spec):
+        """
+        Hoists the repeated inline schemas of a spec, in place.
+
+        :returns ExtractResult: ``(added, replaced)``, the names of the new
+            components entries and the number of inline schemas replaced
+        """
+        components = spec.components
+        named = {name: to_builtin(schema)
+                 for name, schema in (field(components, 'schemas') or {}).items()}
+        sections = {}
+        for section, attribute in SECTION_ATTRIBUTES.items():
+            entries = field(components, attribute, section)
+            if section not in _SKIPPED_SECTIONS and entries:
+                sections[section] = to_builtin(entries)
+        paths = to_builtin(spec.paths or {})
+
+        self._counts = {}
+        self._seen = set()
+        self._names = {}
+        for name, schema in named.items():
+            if isinstance(schema, dict):
+                shape = self.shapes.shape(schema)
+                self._names.setdefault(shape, name)
+                self._seen.add(shape)
+                for item in iter_subschemas(schema):
+                    self._count(item)
+        for value in [paths] + list(sections.values()):
+            for schema in _iter_schemas(value):
+                self._count(schema)
+        self._hoisted = {shape for shape, count in self._counts.items()
+                         if count >= self.min_count or shape in self._names}
+        if not self._hoisted:
+            return ExtractResult([], 0)
+
+        self._taken = set(named)
+        self._refs = {}
+        self._definitions = {}
+        self._replaced = 0
+        named = {name: map_subschemas(schema, self._rewrite) if isinstance(schema, dict)
+                 else schema for name, schema in named.items()}
+        spec.paths = _map_schemas(paths, self._rewrite)
+        for section, entries in sections.items():
+            entries = _map_schemas(entries, self._rewrite)
+            if isinstance(components, BaseObject):
+                setattr(components, SECTION_ATTRIBUTES[section], entries)
+            else:
+                components[section] = entries
+        for name in sorted(self._definitions):
+            named[name] = self._definitions[name]
+        if components is None:
+            spec.components = Components(schemas=named)
+        elif isinstance(components, BaseObject):
+            components.schemas = named
+        else:
+            components['schemas'] = named
+        spec.invalidate()
+        return ExtractResult(sorted(self._definitions), self._replaced)
+
+    def _count(self, schema):
+        stack = [schema]
+        while stack:
+            schema = stack.pop()
+            if _hoistable(schema):
+                shape = self.shapes.shape(schema)
+                self._counts[shape] = self._counts.get(shape, 0) + 1
+                if shape in self._seen:
+                    # its subschemas were counted on its first occurrence
+                    continue
+                self._seen.add(shape)
+            stack.extend(iter_subschemas(schema))
+
+    def _rewrite(self, schema):
+        if not _hoistable(schema):
+            return map_subschemas(schema, self._rewrite)
+        shape = self.shapes.shape(schema)
+        if shape not in self._hoisted:
+            return map_subschemas(schema, self._rewrite)
+        self._replaced += 1
+        ref = self._refs.get(shape)
+        if ref is None:
+            name = self._names.get(shape)
+            if name is None:
+                definition = map_subschemas(schema, self._rewrite)
+                name = self._name(definition)
+                self._definitions[name] = definition
+            ref = self._refs[shape] = '#' + join_pointer('components', 'schemas', name)
+        return {'$ref': ref}
+
+    def _name(self, definition):
+        """Names a new entry after the digest of its content, its subschemas being refs."""
+        hexdigest = digest(definition)
+        for length in range(10, len(hexdigest) + 1):
+            name = self.prefix + hexdigest[:length]
+            if name not in self._taken:
+                self._taken.add(name)
+                return name
+        raise ValueError('Unable to name the extracted schema {}'.format(hexdigest))
+
+
+def extract_schemas(spec, prefix='Inline', min_count=2):
+    """Hoists the repeated inline schemas of a spec, see ``SchemaExtractor``."""
+    return SchemaExtractor(prefix=prefix, min_count=min_count).extract(spec)
@@ -0,0 +1,210 @@
+"""
+oas3.files
+~~~~~~~~~~
+Reading of spec documents from files and bytes, which may be compressed
+or stored inside an archive.
+"""
+
+import bz2
+import codecs
+import gzip
+import lzma
+import os
+import posixpath
+import tarfile
+import zipfile
+
+CHUNK_SIZE = 1 << 16
+
+COMPRESSIONS = {
+    '.gz': gzip.open,
+    '.bz2': bz2.open,
+    '.xz': lzma.open,
+}
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tgz', '.tar.gz', '.tbz2', '.tar.bz2', '.txz', '.tar.xz')
+
+DOCUMENT_SUFFIXES = ('.json', '.yaml', '.yml')
+
+_BOMS = (
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+)
+
+
+def detect_encoding(head):
+    """
+    Detects the Unicode encoding of a JSON or YAML document from its first
+    bytes, using its byte order mark or, as RFC 8259 and RFC 4627 describe,
+    the pattern of null bytes around the first ASCII characters.
+
+    :param head: At least the first four bytes of the document, if it has them
+    :returns str: the name of the codec to decode the document with
+    """
+    head = bytes(head[:4])
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    if len(head) >= 4:
+        if head[:3] == b'\x00\x00\x00':
+            return 'utf-32-be'
+        if head[1:] == b'\x00\x00\x00':
+            return 'utf-32-le'
+    if len(head) >= 2:
+        if head[0] == 0 and head[1] != 0:
+            return 'utf-16-be'
+        if head[0] != 0 and head[1] == 0:
+            return 'utf-16-le'
+    return 'utf-8'
+
+
+def decode(data):
+    """Decodes a JSON or YAML document held in ``bytes`` or any buffer."""
+    return str(data, detect_encoding(data[:4]))
+
+
+def strip_compression(path):
+    """Returns ``path`` without a ``.gz``, ``.bz2`` or ``.xz`` suffix."""
+    root, extension = os.path.splitext(path)
+    if extension.lower() in COMPRESSIONS:
+        return root
+    return path
+
+
+def is_archive(path):
+    """Determines from its name if ``path`` is a zip or tar archive."""
+    return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def read_stream(stream):
+    """
+    Reads and decodes a binary stream chunk by chunk, so a decompressing
+    stream never holds more than one chunk of undecoded data.
+
+    :returns str: the decoded document
+    """
+    head = stream.read(CHUNK_SIZE)
+    decoder = codecs.getincrementaldecoder(detect_encoding(head))()
+    parts = [decoder.decode(head)]
+    while head:
+        head = stream.read(CHUNK_SIZE)
+        parts.append(decoder.decode(head, final=not head))
+    return ''.join(parts)
+
+
+def read_bytes(path):
+    """
+    Reads a JSON or YAML document from a file as undecoded bytes, which
+    ``oas3.base.parse_data`` parses without first decoding them into a
+    string when the document is JSON. The file is closed before returning.
+    Files ending in ``.gz``, ``.bz2`` or ``.xz`` are decompressed while they
+    are read.
+
+    :param path: An absolute or local path to the file
+    :returns bytes: the document
+    """
+    opener = COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+    with (open if opener is None else opener)(path, 'rb') as file_ref:
+        return file_ref.read()
+
+
+def read_text(path):
+    """
+    Reads and decodes a JSON or YAML document from a file, detecting its
+    encoding rather than using the platform default one. Files ending in
+    ``.gz``, ``.bz2`` or ``.xz`` are decompressed while they are read.
+
+    :param path: An absolute or local path to the file
+    :returns str: the decoded document
+    """
+    opener = COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+    if opener is not None:
+        with opener(path, 'rb') as stream:
+            return read_stream(stream)
+    with open(path, 'rb') as file_ref:
+        return decode(file_ref.read())
+
+
+class Archive:
+    """
+    Read access to the documents stored in a zip or tar archive, optionally
+    compressed. Members are decompressed as they are read, nothing is
+    extracted to disk.
+
+    Example:
+        >>> with Archive('./specs.zip') as archive:
+        ...     text = archive.read_text(archive.root())
+    """
+
+    def __init__(self, path):
+        self.path = path
+        if zipfile.is_zipfile(path):
+            self._zip = zipfile.ZipFile(path)
+            self._tar = None
+            self._members = {posixpath.normpath(info.filename): info
+                             for info in self._zip.infolist() if not info.filename.endswith('/')}
+        else:
+            self._zip = None
+            self._tar = tarfile.open(path, 'r:*')
+            self._members = {posixpath.normpath(info.name): info
+                             for info in self._tar.getmembers() if info.isfile()}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        (self._zip or self._tar).close()
+
+    def names(self):
+        """Returns the sorted names of the files in the archive."""
+        return sorted(self._members)
+
+    def stamp(self, name):
+        """Returns a value that changes whenever the member ``name`` changes."""
+        info = self._members[posixpath.normpath(name)]
+        if self._zip is not None:
+            return info.date_time, info.CRC, info.file_size
+        return info.mtime, info.size
+
+    def read_text(self, name):
+        """
+        Reads and decodes the member ``name``, which may itself be compressed.
+
+        :raises KeyError: if there is no such member
+        """
+        info = self._members[posixpath.normpath(name)]
+        if self._zip is not None:
+            stream = self._zip.open(info)
+        else:
+            stream = self._tar.extractfile(info)
+        with stream:
+            opener = COMPRESSIONS.get(posixpath.splitext(name)[1].lower())
+            if opener is not None:
+                with opener(stream, 'rb') as decompressed:
+                    return read_stream(decompressed)
+            return read_stream(stream)
+
+    def root(self):
+        """
+        Finds the root document of the spec: the only document at the top
+        most level of the archive, or among those the one named ``openapi``.
+
+        :raises KeyError: if there is no single such document
+        """
+        documents = [name for name in self._members
+                     if strip_compression(name).lower().endswith(DOCUMENT_SUFFIXES)]
+        if documents:
+            depth = min(name.count('/') for name in documents)
+            documents = sorted(name for name in documents if name.count('/') == depth)
+        if len(documents) > 1:
+            documents = [name for name in documents if posixpath.basename(
+                posixpath.splitext(strip_compression(name))[0]).lower() == 'openapi']
+        if len(documents) != 1:
+            raise KeyError('No single root document in {}'.format(self.path))
+        return documents[0]
@@ -0,0 +1,199 @@
+"""
+oas3.frozen
+~~~~~~~~~~~
+Immutable, hashable snapshots of specs, edited by copying only the path
+from the root to the changed value.
+"""
+
+from collections.abc import Mapping
+from .util import to_builtin, split_pointer
+
+
+class FrozenDict(Mapping):
+    """
+    An immutable mapping. Its hash, and its Merkle hash computed by
+    ``oas3.hashing.merkle``, are computed on first use from those of its
+    entries, which are memoized as well, so after an ``evolve`` only the
+    copied mappings are hashed again.
+    """
+
+    __slots__ = ('_items', '_hash', '_merkle')
+
+    def __init__(self, items=()):
+        object.__setattr__(self, '_items', {str(key): freeze(value)
+                                            for key, value in dict(items).items()})
+        object.__setattr__(self, '_hash', None)
+        object.__setattr__(self, '_merkle', None)
+
+    @classmethod
+    def _make(cls, items):
+        """Builds an instance around a dict of already frozen values, without copying it."""
+        result = cls.__new__(cls)
+        object.__setattr__(result, '_items', items)
+        object.__setattr__(result, '_hash', None)
+        object.__setattr__(result, '_merkle', None)
+        return result
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __hash__(self):
+        if self._hash is None:
+            object.__setattr__(self, '_hash', hash(frozenset(self._items.items())))
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, FrozenDict):
+            return hash(self) == hash(other) and self._items == other._items
+        return Mapping.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self._items)
+
+    def __reduce__(self):
+        return self._make, (self._items,)
+
+    def get_in(self, pointer):
+        """
+        Looks up the value a JSON pointer points at.
+
+        :raises KeyError: if the pointer cannot be resolved
+        """
+        value = self
+        for token in split_pointer(pointer):
+            try:
+                value = value[int(token)] if isinstance(value, tuple) else value[token]
+            except (ValueError, IndexError, KeyError, TypeError):
+                raise KeyError(pointer)
+        return value
+
+    def evolve(self, pointer, value):
+        """
+        Returns a copy with the value at a JSON pointer replaced, or added if
+        its parent exists. Only the mappings and sequences from the root to
+        that value are copied, everything else is shared with this instance.
+
+        :raises KeyError: if the parent of the pointer cannot be resolved
+        """
+        tokens = split_pointer(pointer)
+        if not tokens:
+            raise KeyError('Unable to replace the root, use freeze() instead')
+        return _assoc(self, tokens, freeze(value), pointer)
+
+    def remove(self, pointer):
+        """
+        Returns a copy without the value at a JSON pointer, see ``evolve``.
+
+        :raises KeyError: if the pointer cannot be resolved
+        """
+        tokens = split_pointer(pointer)
+        if not tokens:
+            raise KeyError('Unable to remove the root')
+        return _assoc(self, tokens, _REMOVE, pointer)
+
+    def thaw(self):
+        """:returns dict: a mutable copy in python builtin data types"""
+        return thaw(self)
+
+
+_REMOVE = object()
+
+
+def _assoc(node, tokens, value, pointer):
+    token, rest = tokens[0], tokens[1:]
+    if isinstance(node, tuple):
+        try:
+            index = len(node) if token == '-' else int(token)
+        except ValueError:
+            raise KeyError(pointer)
+        if index > len(node) or (index == len(node) and (rest or value is _REMOVE)):
+            raise KeyError(pointer)
+        if rest:
+            return node[:index] + (_assoc(node[index], rest, value, pointer),) + node[index + 1:]
+        if value is _REMOVE:
+            return node[:index] + node[index + 1:]
+        return node[:index] + (value,) + node[index + 1:]
+    if not isinstance(node, FrozenDict) or ((rest or value is _REMOVE) and token not in node):
+        raise KeyError(pointer)
+    items = dict(node._items)
+    if rest:
+        items[token] = _assoc(items[token], rest, value, pointer)
+    elif value is _REMOVE:
+        del items[token]
+    else:
+        items[token] = value
+    return type(node)._make(items)
+
+
+class FrozenSpec(FrozenDict):
+    """
+    An immutable snapshot of a spec as a mapping of its JSON form, where
+    mappings are ``FrozenDict`` with string keys and sequences are tuples.
+    It can be shared between threads without copying, used as a dict key,
+    and edited with ``evolve`` and ``remove``, which return new snapshots
+    sharing every unchanged value with this one.
+
+    Example:
+        >>> frozen = Spec.from_file('./tests/samples/valid/petstore.yaml').freeze()
+        >>> edited = frozen.evolve('/info/title', 'Pet Store')
+        >>> edited['paths'] is frozen['paths']
+        True
+    """
+
+    __slots__ = ()
+
+    def to_spec(self, cls=None):
+        """
+        :param cls: The spec class to build, defaults to ``oas3.Spec``
+        :returns: a new mutable spec
+        """
+        if cls is None:
+            from . import Spec as cls
+        return cls.from_dict(self.thaw())
+
+
+def freeze(value):
+    """
+    Converts python builtin data, or OAS3 objects, into immutable values:
+    dicts become ``FrozenDict`` and lists tuples. Frozen values are returned
+    as they are.
+    """
+    if isinstance(value, (FrozenDict, str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    data = to_builtin(value)
+    return value if data is value else freeze(data)
+
+
+def thaw(value):
+    """Reverses ``freeze``, returning mutable python builtin data."""
+    if isinstance(value, FrozenDict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def freeze_spec(spec):
+    """:returns FrozenSpec: an immutable snapshot of a spec"""
+    return FrozenSpec(to_builtin(spec))
@@ -0,0 +1,239 @@
+"""
+oas3.graph
+~~~~~~~~~~
+Dependency graph between the components, paths and operations of a spec.
+"""
+
+from array import array
+from .index import HTTP_METHODS
+from .util import to_builtin, join_pointer, split_pointer, resolve_pointer
+
+COMPONENT_SECTIONS = ('schemas', 'responses', 'parameters', 'examples', 'requestBodies',
+                      'headers', 'securitySchemes', 'links', 'callbacks')
+
+ROOT = ''
+
+
+def iter_refs(value):
+    """
+    Yields every reference found anywhere within raw data: ``$ref`` strings,
+    and the values of discriminator mappings, where bare schema names are
+    turned into references to ``components.schemas``.
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            ref = value.get('$ref')
+            if isinstance(ref, str):
+                yield ref
+            discriminator = value.get('discriminator')
+            if isinstance(discriminator, dict) and isinstance(discriminator.get('mapping'), dict):
+                for target in discriminator['mapping'].values():
+                    if isinstance(target, str):
+                        yield mapping_ref(target)
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+
+
+def mapping_ref(target):
+    """
+    Returns the reference a discriminator mapping value stands for: either a
+    reference already, or the name of an entry of ``components.schemas``.
+    """
+    if target.startswith('#') or '/' in target:
+        return target
+    return '#' + join_pointer('components', 'schemas', target)
+
+
+def _security_schemes(requirements):
+    for requirement in requirements or ():
+        for name in requirement:
+            yield join_pointer('components', 'securitySchemes', name)
+
+
+def _compress(adjacency):
+    """Packs a list of sets of node IDs into CSR offset and target arrays."""
+    offsets = array('l', [0])
+    targets = array('l')
+    for neighbours in adjacency:
+        targets.extend(sorted(neighbours))
+        offsets.append(len(targets))
+    return offsets, targets
+
+
+class DependencyGraph:
+    """
+    A directed graph where an edge ``a -> b`` means node ``a`` depends on
+    node ``b``, because ``a`` contains ``b`` or references it with ``$ref``
+    or a security requirement. Nodes are identified by JSON pointers:
+
+    - ``''``, the document itself
+    - ``/paths/<path>`` and ``/paths/<path>/<method>``
+    - the ``responses/<status>``, ``parameters/<index>`` and ``requestBody``
+      of path items and operations
+    - ``/components/<section>/<name>``
+
+    Edges are stored as arrays of integer node IDs in both directions, and
+    transitive queries are memoized.
+
+    Example:
+        >>> graph = DependencyGraph(spec)
+        >>> graph.dependents('/components/schemas/Pet')
+        ['', '/components/schemas/Pets', '/paths/~1pets', '/paths/~1pets/get', ...]
+    """
+
+    def __init__(self, spec):
+        document = to_builtin(spec)
+        self.pointers = []
+        self.ids = {}
+        self.unresolved = []
+        self._pending = []
+        self._add(ROOT, None)
+        for section in COMPONENT_SECTIONS:
+            entries = (document.get('components') or {}).get(section) or {}
+            for name in sorted(entries):
+                self._add(join_pointer('components', section, name), None, entries[name])
+        paths = document.get('paths') or {}
+        for path in sorted(paths):
+            self._add_path(path, paths[path])
+        self._pending.extend((ROOT, target) for target in
+                             _security_schemes(document.get('security')))
+
+        forward = [set() for _ in self.pointers]
+        for source, target in self._pending:
+            target_id = self._node_for(document, target)
+            if target_id is None:
+                self.unresolved.append((source, target))
+            elif target_id != self.ids[source]:
+                forward[self.ids[source]].add(target_id)
+        del self._pending
+        reverse = [set() for _ in self.pointers]
+        for source, targets in enumerate(forward):
+            for target in targets:
+                reverse[target].add(source)
+        self._forward = _compress(forward)
+        self._reverse = _compress(reverse)
+        self._closures = ({}, {})
+
+    def __len__(self):
+        return len(self.pointers)
+
+    def __contains__(self, pointer):
+        return pointer in self.ids
+
+    def dependencies(self, pointer, transitive=True):
+        """
+        :returns list: sorted pointers of the nodes ``pointer`` depends on
+        :raises KeyError: if ``pointer`` is not a node of the graph
+        """
+        return self._query(pointer, transitive, 0)
+
+    def dependents(self, pointer, transitive=True):
+        """
+        :returns list: sorted pointers of the nodes that depend on ``pointer``
+        :raises KeyError: if ``pointer`` is not a node of the graph
+        """
+        return self._query(pointer, transitive, 1)
+
+    def closure(self, node_ids, reverse=False):
+        """
+        :returns frozenset: IDs of every node reachable from the given node IDs,
+            following dependencies or, if ``reverse`` is True, dependents
+        """
+        direction = 1 if reverse else 0
+        result = set()
+        for node_id in node_ids:
+            result |= self._closure(node_id, direction)
+        return frozenset(result)
+
+    def _query(self, pointer, transitive, direction):
+        node_id = self.ids[pointer]
+        if transitive:
+            node_ids = self._closure(node_id, direction)
+        else:
+            node_ids = self._neighbours(node_id, direction)
+        return sorted(self.pointers[other] for other in node_ids)
+
+    def _neighbours(self, node_id, direction):
+        offsets, targets = self._reverse if direction else self._forward
+        return targets[offsets[node_id]:offsets[node_id + 1]]
+
+    def _closure(self, node_id, direction):
+        memo = self._closures[direction]
+        if node_id in memo:
+            return memo[node_id]
+        seen = set()
+        stack = list(self._neighbours(node_id, direction))
+        while stack:
+            other = stack.pop()
+            if other in seen:
+                continue
+            known = memo.get(other)
+            if known is not None:
+                seen.add(other)
+                seen |= known
+                continue
+            seen.add(other)
+            stack.extend(self._neighbours(other, direction))
+        seen.discard(node_id)
+        memo[node_id] = frozenset(seen)
+        return memo[node_id]
+
+    def _add(self, pointer, parent, content=None):
+        self.ids[pointer] = len(self.pointers)
+        self.pointers.append(pointer)
+        if parent is not None:
+            self._pending.append((parent, pointer))
+        if content is not None:
+            self._pending.extend((pointer, ref) for ref in iter_refs(content))
+
+    def _add_path(self, path, item):
+        pointer = join_pointer('paths', path)
+        self._add(pointer, ROOT)
+        if not isinstance(item, dict):
+            return
+        own = {key: value for key, value in item.items()
+               if key not in HTTP_METHODS and key != 'parameters'}
+        self._pending.extend((pointer, ref) for ref in iter_refs(own))
+        self._add_parameters(pointer, item.get('parameters'))
+        for method in HTTP_METHODS:
+            operation = item.get(method)
+            if isinstance(operation, dict):
+                self._add_operation(pointer + join_pointer(method), pointer, operation)
+
+    def _add_operation(self, pointer, parent, operation):
+        own = {key: value for key, value in operation.items()
+               if key not in ('responses', 'parameters', 'requestBody')}
+        self._add(pointer, parent, own)
+        self._pending.extend((pointer, target) for target in
+                             _security_schemes(operation.get('security')))
+        self._add_parameters(pointer, operation.get('parameters'))
+        if 'requestBody' in operation:
+            self._add(pointer + '/requestBody', pointer, operation['requestBody'])
+        responses = operation.get('responses') or {}
+        for status in sorted(responses, key=str):
+            self._add(pointer + join_pointer('responses', status), pointer, responses[status])
+
+    def _add_parameters(self, pointer, parameters):
+        for index, parameter in enumerate(parameters or ()):
+            self._add(pointer + join_pointer('parameters', index), pointer, parameter)
+
+    def _node_for(self, document, target):
+        """Maps a resolvable pointer or local ``$ref`` to the closest enclosing node."""
+        if target in self.ids:
+            return self.ids[target]
+        if not target.startswith('#/'):
+            return None
+        try:
+            resolve_pointer(document, target)
+        except KeyError:
+            return None
+        tokens = split_pointer(target)
+        while tokens:
+            node_id = self.ids.get(join_pointer(*tokens))
+            if node_id is not None:
+                return node_id
+            tokens.pop()
+        return None
@@ -0,0 +1,138 @@
+"""
+oas3.hashing
+~~~~~~~~~~~~
+Canonical serialization, content hashing and Merkle hashing of OAS3 data.
+"""
+
+import datetime
+import hashlib
+import json
+from collections import namedtuple
+from .base import BaseObject
+from .frozen import FrozenDict
+from .util import to_builtin, slot_names, join_pointer
+
+
+def _default(value):
+    if isinstance(value, FrozenDict):
+        return dict(value)
+    if isinstance(value, BaseObject):
+        return to_builtin(value)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError('{!r} is not JSON serializable'.format(value))
+
+
+def _string_keys(value):
+    """YAML may load keys such as response codes as integers, JSON only has strings."""
+    if isinstance(value, dict):
+        return {str(key): _string_keys(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_string_keys(item) for item in value]
+    return value
+
+
+def canonical_bytes(value):
+    """
+    Serializes python builtin data, or OAS3 objects, into canonical JSON bytes:
+    keys are sorted and no insignificant whitespace is emitted, so equal data
+    always gives equal bytes.
+    """
+    try:
+        text = json.dumps(value, sort_keys=True, separators=(',', ':'),
+                          ensure_ascii=False, default=_default)
+    except TypeError:
+        text = json.dumps(_string_keys(to_builtin(value)), sort_keys=True,
+                          separators=(',', ':'), ensure_ascii=False, default=_default)
+    return text.encode('utf-8')
+
+
+def digest(value):
+    """
+    Returns a hex digest of the canonical bytes of ``value``. Raw ``bytes``
+    are hashed as they are.
+    """
+    if not isinstance(value, bytes):
+        value = canonical_bytes(value)
+    return hashlib.sha1(value).hexdigest()
+
+
+class MerkleNode(namedtuple('MerkleNode', ['digest', 'children'])):
+    """
+    The Merkle hash of a value: ``digest`` is the SHA-1 digest of the value,
+    computed from the digests of its ``children``, a dict of the nodes of the
+    fields of an OAS3 object or of a mapping, a list for a list, or None for
+    a scalar.
+    """
+
+    __slots__ = ()
+
+
+def _digest(*parts):
+    return hashlib.sha1(b''.join(parts)).digest()
+
+
+def merkle(value):
+    """
+    Returns the ``MerkleNode`` of python builtin data, frozen data or OAS3
+    objects. Only the nodes of ``FrozenDict`` mappings are memoized, as they
+    cannot change; mutable data is hashed again on every call.
+    """
+    if isinstance(value, FrozenDict):
+        if value._merkle is None:
+            children = {key: merkle(item) for key, item in value.items()}
+            object.__setattr__(value, '_merkle',
+                               MerkleNode(_digest(b'd', *_entries(children)), children))
+        return value._merkle
+    if isinstance(value, BaseObject):
+        children = {}
+        for name in slot_names(type(value)):
+            item = getattr(value, name, None)
+            if item is not None:
+                children[name] = merkle(item)
+        return MerkleNode(_digest(b'o', type(value).__qualname__.encode('utf-8'),
+                                  *_entries(children)), children)
+    if isinstance(value, dict):
+        # YAML may load keys such as response codes as integers
+        children = {str(key): merkle(item) for key, item in value.items()}
+        return MerkleNode(_digest(b'd', *_entries(children)), children)
+    if isinstance(value, (list, tuple)):
+        children = [merkle(item) for item in value]
+        return MerkleNode(_digest(b'l', *(child.digest for child in children)), children)
+    return MerkleNode(_digest(b's', canonical_bytes(value)), None)
+
+
+def _entries(children):
+    for key in sorted(children):
+        yield canonical_bytes(key)
+        yield children[key].digest
+
+
+def diff_pointers(old, new):
+    """
+    Lists the JSON pointers at which two values differ, comparing their
+    Merkle hashes so identical subtrees are skipped without being walked.
+    Pointers of OAS3 object fields use the attribute names.
+
+    :returns list: sorted pointers of the values added, removed or changed
+    """
+    result = []
+    stack = [('', merkle(old), merkle(new))]
+    while stack:
+        pointer, left, right = stack.pop()
+        if left.digest == right.digest:
+            continue
+        if isinstance(left.children, dict) and isinstance(right.children, dict):
+            for key in set(left.children) | set(right.children):
+                child = pointer + join_pointer(key)
+                if key not in left.children or key not in right.children:
+                    result.append(child)
+                else:
+                    stack.append((child, left.children[key], right.children[key]))
+        elif isinstance(left.children, list) and isinstance(right.children, list) and \
+                len(left.children) == len(right.children):
+            stack.extend((pointer + join_pointer(index), item, right.children[index])
+                         for index, item in enumerate(left.children))
+        else:
+            result.append(pointer)
+    return sorted(result)
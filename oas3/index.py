@@ -0,0 +1,79 @@
+"""
+oas3.index
+~~~~~~~~~~
+Lookup tables over the operations of a spec.
+"""
+
+from collections import namedtuple
+from .errors import ValidationError
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+OperationRef = namedtuple('OperationRef', ['path', 'method', 'operation'])
+
+
+def field(node, attribute, key=None):
+    """
+    Reads a field from either a loaded OAS3 object or its raw dict form, as
+    both can appear inside a spec.
+
+    :param attribute: Attribute name on the OAS3 object, e.g. ``operation_id``
+    :param key: Key in the raw dict, e.g. ``operationId``, defaults to ``attribute``
+    """
+    if isinstance(node, dict):
+        return node.get(key or attribute)
+    return getattr(node, attribute, None)
+
+
+def iter_operations(paths):
+    """Yields an ``OperationRef`` for every operation in a ``paths`` mapping."""
+    for path in sorted(paths or {}):
+        item = paths[path]
+        for method in HTTP_METHODS:
+            operation = field(item, method)
+            if operation is not None:
+                yield OperationRef(path, method, operation)
+
+
+class OperationIndex:
+    """
+    Indexes the operations of a ``paths`` mapping by operationId, by tag and
+    by HTTP method in a single pass.
+    """
+
+    def __init__(self, paths):
+        self.by_id = {}
+        self.by_tag = {}
+        self.by_method = {method: [] for method in HTTP_METHODS}
+        self.duplicates = {}
+        for ref in iter_operations(paths):
+            self.by_method[ref.method].append(ref)
+            for tag in field(ref.operation, 'tags') or ():
+                self.by_tag.setdefault(tag, []).append(ref)
+            operation_id = field(ref.operation, 'operation_id', 'operationId')
+            if operation_id is None:
+                continue
+            if operation_id in self.by_id:
+                self.duplicates.setdefault(operation_id, [self.by_id[operation_id]]).append(ref)
+            else:
+                self.by_id[operation_id] = ref
+
+    def operation(self, operation_id):
+        """
+        :returns OperationRef: the operation with the given operationId
+        :raises KeyError: if no operation has the operationId
+        :raises ValidationError: if several operations share the operationId
+        """
+        if operation_id in self.duplicates:
+            raise ValidationError('Duplicate operationId [{}] used by {}'.format(
+                operation_id,
+                ', '.join('{} {}'.format(ref.method.upper(), ref.path)
+                          for ref in self.duplicates[operation_id])))
+        return self.by_id[operation_id]
+
+    def check(self):
+        """
+        :raises ValidationError: if any operationId is used more than once
+        """
+        for operation_id in sorted(self.duplicates):
+            self.operation(operation_id)
@@ -0,0 +1,119 @@
+"""
+oas3.intern
+~~~~~~~~~~~
+Deduplication of the strings and small values repeated throughout specs.
+"""
+
+import sys
+from .base import BaseObject
+from .shapes import SchemaTable
+from .util import slot_names
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+class Interner:
+    """
+    Replaces equal values throughout loaded data with a single shared
+    instance: every mapping key, string values up to ``max_length``
+    characters such as media types, ``in`` locations and schema types, and,
+    if ``leaves`` is True, mappings holding only scalars such as repeated
+    inline schemas like ``{'type': 'string'}``.
+
+    An interner can be shared by many loads, so values repeated across
+    specs are kept once. Strings are immutable, but shared mappings are the
+    same object in every place they appear: editing one in place, such as
+    through an attribute of a loaded spec, changes every other place. This
+    is why sharing mappings is opt-in, for specs that are only read.
+
+    :param max_length: Longest string value to intern, keys are always interned
+    :param leaves: If True, equal mappings of scalars are shared as well, and
+        must then be treated as read only
+    :param schemas: If True, structurally equal Schema objects of any depth are
+        shared as well, through the ``oas3.shapes.SchemaTable`` in ``schemas``,
+        and must then be treated as read only
+
+    Example:
+        >>> interner = Interner()
+        >>> first = Spec.from_file('./first.yaml', interner=interner)
+        >>> second = Spec.from_file('./second.yaml', interner=interner)
+        >>> interner.saved
+        183424
+    """
+
+    def __init__(self, max_length=200, leaves=False, schemas=False):
+        self.max_length = max_length
+        self.leaves = leaves
+        self.schemas = SchemaTable() if schemas else None
+        self.saved = 0
+        self.hits = 0
+        self._strings = {}
+        self._leaves = {}
+
+    def __len__(self):
+        return len(self._strings) + len(self._leaves)
+
+    def stats(self):
+        """
+        :returns dict: number of distinct strings and mappings held, number
+            of values replaced, and the estimated bytes saved by replacing them
+        """
+        stats = {'strings': len(self._strings), 'leaves': len(self._leaves),
+                 'hits': self.hits, 'saved': self.saved}
+        if self.schemas is not None:
+            stats['shapes'] = len(self.schemas)
+        return stats
+
+    def clear(self):
+        self._strings.clear()
+        self._leaves.clear()
+
+    def intern(self, value):
+        """
+        Interns python builtin data, or the fields of OAS3 objects in place.
+
+        :returns: the interned value, which callers should use in place of ``value``
+        """
+        value = self._intern(value)
+        if self.schemas is not None:
+            value = self.schemas.canonicalize(value)
+        return value
+
+    def _intern(self, value):
+        if isinstance(value, str):
+            if len(value) > self.max_length:
+                return value
+            return self.string(value)
+        if isinstance(value, dict):
+            value = {self.string(key) if isinstance(key, str) else key: self._intern(item)
+                     for key, item in value.items()}
+            if self.leaves and all(isinstance(item, _SCALARS) for item in value.values()):
+                return self._leaf(value)
+            return value
+        if isinstance(value, list):
+            return [self._intern(item) for item in value]
+        if isinstance(value, BaseObject):
+            for name in slot_names(type(value)):
+                item = getattr(value, name, None)
+                if item is not None:
+                    setattr(value, name, self._intern(item))
+        return value
+
+    def string(self, value):
+        """Returns the shared instance of a string."""
+        shared = self._strings.setdefault(value, value)
+        if shared is not value:
+            self.hits += 1
+            self.saved += sys.getsizeof(value)
+        return shared
+
+    def _leaf(self, value):
+        key = tuple((name, type(item), item) for name, item in value.items())
+        try:
+            shared = self._leaves.setdefault(key, value)
+        except TypeError:
+            return value
+        if shared is not value:
+            self.hits += 1
+            self.saved += sys.getsizeof(value)
+        return shared
@@ -0,0 +1,247 @@
+"""
+oas3.merge
+~~~~~~~~~~
+Composition of one spec out of many partial specs.
+"""
+
+from .errors import ValidationError
+from .hashing import digest
+from .index import HTTP_METHODS
+from .util import to_builtin, join_pointer, split_pointer
+
+ERROR = 'error'
+PREFER_LEFT = 'prefer-left'
+RENAME = 'rename'
+POLICIES = (ERROR, PREFER_LEFT, RENAME)
+
+
+def _rewrite(value, renames):
+    """
+    Returns a copy of raw data with local references to renamed components
+    entries updated: ``$ref`` values, discriminator mappings and the names
+    of security schemes in security requirements.
+
+    :param renames: ``(section, old name)`` mapped to the new name
+    """
+    if isinstance(value, list):
+        return [_rewrite(item, renames) for item in value]
+    if not isinstance(value, dict):
+        return value
+    result = {}
+    for key, item in value.items():
+        if key == '$ref' and isinstance(item, str):
+            item = _rename_ref(item, renames)
+        elif key == 'mapping' and isinstance(item, dict):
+            item = {name: _rename_ref(ref, renames) if isinstance(ref, str) else ref
+                    for name, ref in item.items()}
+        elif key == 'security' and isinstance(item, list):
+            item = [{renames.get(('securitySchemes', name), name): scopes
+                     for name, scopes in requirement.items()}
+                    if isinstance(requirement, dict) else requirement for requirement in item]
+        else:
+            item = _rewrite(item, renames)
+        result[key] = item
+    return result
+
+
+def _rename_ref(ref, renames):
+    if not ref.startswith('#/components/'):
+        return ref
+    tokens = split_pointer(ref)
+    if len(tokens) < 3 or (tokens[1], tokens[2]) not in renames:
+        return ref
+    tokens[2] = renames[tokens[1], tokens[2]]
+    return '#' + join_pointer(*tokens)
+
+
+class SpecMerger:
+    """
+    Merges partial specs one at a time into a single spec. Adding a spec
+    only costs time proportional to its own size: the merged paths and
+    components are kept along with the digests of the components entries.
+
+    - ``paths`` are merged per operation, operations present in several
+      specs must be equal
+    - ``components`` entries equal to an entry already merged, whatever its
+      name, are deduplicated, and references to them are updated
+    - ``tags`` are merged by name, ``servers`` and ``security`` requirements
+      are merged without duplicates
+    - ``openapi``, ``info`` and ``externalDocs`` come from the first spec
+
+    Conflicting paths, operations, components entries or tags are resolved
+    according to ``policy``:
+
+    - ``error`` raises a ``ValidationError``
+    - ``prefer-left`` keeps the value merged first
+    - ``rename`` adds a conflicting components entry under its name suffixed
+      with a digest of its content and updates references to it; other
+      conflicts are errors
+
+    :raises ValueError: if ``policy`` is not supported
+
+    Example:
+        >>> merger = SpecMerger(policy='rename')
+        >>> for path in glob.glob('./partials/*.yaml'):
+        ...     merger.add(Spec.from_file(path))
+        >>> spec = merger.spec()
+    """
+
+    def __init__(self, policy=ERROR):
+        if policy not in POLICIES:
+            raise ValueError('Unsupported merge policy {}, expected one of {}'
+                             .format(policy, ', '.join(POLICIES)))
+        self.policy = policy
+        self.count = 0
+        self._base = {}
+        self._paths = {}
+        self._components = {}
+        self._digests = {}
+        self._tags = {}
+        self._servers = {}
+        self._security = {}
+
+    def add(self, spec):
+        """
+        Merges a spec, an OAS3 object or raw data, into the result. Every
+        conflict is found before anything is merged, so the merger is left
+        unchanged if this raises.
+
+        :raises ValidationError: on a conflict under the ``error`` policy, or
+            on conflicting paths or tags under the ``rename`` policy
+        """
+        document = to_builtin(spec)
+        renames, added = self._plan_components(document.get('components') or {})
+        if renames:
+            document = _rewrite(document, renames)
+        paths = {path: self._plan_path(path, item)
+                 for path, item in (document.get('paths') or {}).items()}
+        tags = [tag for tag in document.get('tags') or () if self._plan_tag(tag)]
+
+        self.count += 1
+        for key in ('openapi', 'info', 'externalDocs'):
+            if key in document:
+                self._base.setdefault(key, document[key])
+        for (section, name), (hexdigest, entry) in added.items():
+            self._components.setdefault(section, {})[name] = entry
+            self._digests.setdefault(section, {})[hexdigest] = name
+        for path, item in paths.items():
+            self._paths.setdefault(path, {}).update(item)
+        for tag in tags:
+            self._tags[tag.get('name') if isinstance(tag, dict) else None] = tag
+        for server in document.get('servers') or ():
+            self._servers.setdefault(digest(server), server)
+        for requirement in document.get('security') or ():
+            self._security.setdefault(digest(requirement), requirement)
+        return self
+
+    def spec(self, cls=None):
+        """
+        :param cls: The spec class to build, defaults to ``oas3.Spec``
+        :returns: the merged spec
+        """
+        if cls is None:
+            from . import Spec as cls
+        return cls.from_dict(self.to_dict())
+
+    def to_dict(self):
+        """:returns dict: the merged spec in python builtin data types"""
+        document = dict(self._base)
+        document['paths'] = {path: dict(item) for path, item in self._paths.items()}
+        if self._components:
+            document['components'] = {section: dict(entries)
+                                      for section, entries in self._components.items()}
+        for key, values in (('tags', self._tags), ('servers', self._servers),
+                            ('security', self._security)):
+            if values:
+                document[key] = list(values.values())
+        return document
+
+    def _conflict(self, message):
+        raise ValidationError('Merge conflict: {}'.format(message))
+
+    def _plan_components(self, components):
+        """
+        Decides where each components entry of a spec goes. Entries are
+        compared by the digest of their content with references to renamed
+        entries already updated, and since renaming an entry changes the
+        content of the entries referring to it, decisions are repeated until
+        the renames no longer change.
+
+        :returns tuple: the renames, ``(section, name)`` mapped to the merged
+            name, and ``(digest, entry)`` to add keyed by ``(section, merged name)``
+        """
+        entries = [(section, name, entry) for section, values in components.items()
+                   if isinstance(values, dict) for name, entry in values.items()]
+        renames = {}
+        for _ in range(len(entries) + 1):
+            decided, added = self._decide(entries, renames)
+            if decided == renames:
+                return renames, added
+            renames = decided
+        self._conflict('unable to settle the names of the components entries')
+
+    def _decide(self, entries, renames):
+        decided = {}
+        added = {}
+        planned = {}
+        for section, name, entry in entries:
+            entry = _rewrite(entry, renames)
+            hexdigest = digest(entry)
+            merged = self._components.get(section, {})
+            existing = self._digests.get(section, {}).get(hexdigest) or \
+                planned.get((section, hexdigest))
+            if existing is not None:
+                if existing != name:
+                    decided[section, name] = existing
+                continue
+            if name in merged or (section, name) in added:
+                if self.policy == ERROR:
+                    self._conflict('components entry {} differs'.format(
+                        join_pointer('components', section, name)))
+                if self.policy == PREFER_LEFT:
+                    continue
+                decided[section, name] = self._free_name(section, name, hexdigest, added)
+                name = decided[section, name]
+            planned[section, hexdigest] = name
+            added[section, name] = (hexdigest, entry)
+        return decided, added
+
+    def _free_name(self, section, name, hexdigest, added):
+        merged = self._components.get(section, {})
+        for length in range(8, len(hexdigest) + 1):
+            candidate = '{}_{}'.format(name, hexdigest[:length])
+            if candidate not in merged and (section, candidate) not in added:
+                return candidate
+        self._conflict('unable to rename components entry {}'.format(name))
+
+    def _plan_path(self, path, item):
+        """:returns dict: the fields of a path item to merge, missing from the merged one"""
+        merged = self._paths.get(path, {})
+        result = {}
+        for key, value in item.items():
+            if key not in merged:
+                result[key] = value
+            elif merged[key] != value and self.policy != PREFER_LEFT:
+                kind = 'operation' if key in HTTP_METHODS else 'path item field'
+                self._conflict('{} {} differs'.format(kind, join_pointer('paths', path, key)))
+        return result
+
+    def _plan_tag(self, tag):
+        """:returns bool: True if the tag is new"""
+        name = tag.get('name') if isinstance(tag, dict) else None
+        merged = self._tags.get(name)
+        if merged is not None and merged != tag and self.policy != PREFER_LEFT:
+            self._conflict('tag {} differs'.format(name))
+        return merged is None
+
+
+def merge_specs(specs, policy=ERROR, cls=None):
+    """
+    Merges specs in order, see ``SpecMerger``.
+
+    :returns: the merged spec
+    """
+    merger = SpecMerger(policy=policy)
+    for spec in specs:
+        merger.add(spec)
+    return merger.spec(cls)
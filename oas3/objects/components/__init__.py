@@ -26,14 +26,17 @@ class Components(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#componentsObject
     """
 
+    __slots__ = ('schemas', 'responses', 'parameters', 'examples', 'request_bodies', 'headers',
+                 'security_schemes', 'links', 'callbacks')
+
     class Schema(BaseSchema):
         schemas = fields.Dict(keys=fields.Str,
                               values=fields.Nested(Schema.Schema))
         responses = fields.Dict()
         parameters = fields.Dict()
         examples = fields.Dict()
-        response_bodies = fields.Dict(load_from='responseBodies',
-                                      dump_to='responseBodies')
+        request_bodies = fields.Dict(load_from='requestBodies',
+                                     dump_to='requestBodies')
         headers = fields.Dict()
         security_schemes = fields.Dict(load_from='securitySchemes',
                                        dump_to='securitySchemes')
@@ -48,15 +51,16 @@ class Components(BaseObject):
                  responses=None,
                  parameters=None,
                  examples=None,
-                 response_bodies=None,
+                 request_bodies=None,
                  headers=None,
                  security_schemes=None,
                  links=None,
                  callbacks=None):
         self.schemas = schemas
         self.responses = responses
+        self.parameters = parameters
         self.examples = examples
-        self.response_bodies = response_bodies
+        self.request_bodies = request_bodies
         self.headers = headers
         self.security_schemes = security_schemes
         self.links = links
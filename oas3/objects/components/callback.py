@@ -17,6 +17,8 @@ class Callback(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#componentsObject
     """
 
+    __slots__ = ()
+
     class Schema(BaseSchema):
         pass
 
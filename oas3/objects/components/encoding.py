@@ -15,6 +15,8 @@ class Encoding(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#encodingObject
     """
 
+    __slots__ = ('content_type', 'headers', 'style', 'explode', 'allow_reserved')
+
     class Schema(BaseSchema):
         content_type = fields.Str(load_from='contentType',
                                   dump_to='contentType')
@@ -14,6 +14,8 @@ class Example(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#exampleObject
     """
 
+    __slots__ = ('summary', 'description', 'value')
+
     class Schema(BaseSchema):
         summary = fields.Str()
         description = fields.Str()
@@ -14,6 +14,8 @@ class Header(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#headerObject
     """
 
+    __slots__ = ()
+
     class Schema(BaseSchema):
         pass
 
@@ -19,6 +19,9 @@ class Link(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#linkObject
     """
 
+    __slots__ = ('operation_ref', 'operation_id', 'parameters', 'request_body', 'description',
+                 'server')
+
     class Schema(BaseSchema):
         operation_ref = fields.Str(load_from='operationRef',
                                    dump_to='operationRef')
@@ -18,6 +18,8 @@ class MediaType(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#mediaTypeObject
     """
 
+    __slots__ = ('schema', 'example', 'examples', 'encoding')
+
     class Schema(BaseSchema):
         schema = RefOrSchema(Schema.Schema)
         example = fields.Raw()
@@ -17,6 +17,9 @@ class Parameter(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#componentsObject
     """
 
+    __slots__ = ('name', 'location', 'description', 'required', 'deprecated', 'allow_empty_value',
+                 'style', 'explode', 'allow_reserved', 'schema', 'example', 'examples')
+
     class Schema(BaseSchema):
         name = fields.Str()
         location = fields.Str(load_from='in',
@@ -15,6 +15,8 @@ class RequestBody(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#requestBodyObject
     """
 
+    __slots__ = ('content', 'description', 'required')
+
     class Schema(BaseSchema):
         content = fields.Dict(required=True, keys=fields.Str, values=fields.Dict)
         description = fields.Str()
@@ -18,6 +18,8 @@ class Response(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#responseObject
     """
 
+    __slots__ = ('description', 'headers', 'content', 'links')
+
     class Schema(BaseSchema):
         description = fields.Str(required=True)
         headers = fields.Dict()
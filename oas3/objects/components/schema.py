@@ -17,6 +17,8 @@ class Schema(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#schemaObject
     """
 
+    __slots__ = ('properties', 'required', 'schema_type', 'all_of', 'example', 'items')
+
     class Schema(BaseSchema):
         #title =
         #multiple_of =
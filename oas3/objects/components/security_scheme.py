@@ -15,6 +15,8 @@ class OAuthFlow(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#oauthFlowObject
     """
 
+    __slots__ = ('authorization_url', 'token_url', 'refresh_url', 'scopes')
+
     class Schema(BaseSchema):
         authorization_url = fields.Url(load_from='authorizationUrl',
                                        dump_to='authorizationUrl')
@@ -42,6 +44,8 @@ class OAuthFlows(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#oauthFlowsObject
     """
 
+    __slots__ = ('implicit', 'password', 'client_credentials', 'authorization_code')
+
     class Schema(BaseSchema):
         implicit = fields.Nested(OAuthFlow.Schema)
         password = fields.Nested(OAuthFlow.Schema)
@@ -74,6 +78,9 @@ class SecurityScheme(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#securitySchemeObject
     """
 
+    __slots__ = ('scheme_type', 'description', 'name', 'location', 'scheme', 'bearer_format',
+                 'flows', 'open_id_connect_url')
+
     class Schema(BaseSchema):
         scheme_type = fields.Str(required=True,
                                  load_from='type',
@@ -15,6 +15,8 @@ class ExternalDocs(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#externalDocumentationObject
     """
 
+    __slots__ = ('url', 'description')
+
     class Schema(BaseSchema):
         url = fields.Url(required=True)
         description = fields.Str()
@@ -15,6 +15,8 @@ class Contact(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#contactObject
     """
 
+    __slots__ = ('name', 'url', 'email')
+
     class Schema(BaseSchema):
         name = fields.Str(required=True)
         url = fields.Url(required=True)
@@ -36,6 +38,9 @@ class License(BaseObject):
     .. note:
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#licenseObject
     """
+
+    __slots__ = ('name', 'url')
+
     class Schema(BaseSchema):
         name = fields.Str(required=True)
         url = fields.Url()
@@ -56,6 +61,8 @@ class Info(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.1.md#infoObject
     """
 
+    __slots__ = ('title', 'version', 'description', 'terms_of_service', 'contact', 'license')
+
     class Schema(BaseSchema):
         version = fields.Str(required=True)
         title = fields.Str(required=True)
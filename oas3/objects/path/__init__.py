@@ -20,6 +20,9 @@ class Path(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#pathItemObject
     """
 
+    __slots__ = ('ref', 'summary', 'description', 'get', 'post', 'put', 'patch', 'delete',
+                 'options', 'trace', 'head', 'servers', 'parameters')
+
     class Schema(BaseSchema):
         ref = fields.Str()
         summary = fields.Str()
@@ -45,6 +48,7 @@ class Path(BaseObject):
         self.get = get
         self.post = post
         self.put = put
+        self.patch = patch
         self.delete = delete
         self.options = options
         self.trace = trace
@@ -20,6 +20,9 @@ class Operation(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#operationObject
     """
 
+    __slots__ = ('responses', 'tags', 'summary', 'description', 'external_docs', 'operation_id',
+                 'parameters', 'request_body', 'callbacks', 'deprecated', 'security', 'servers')
+
     class Schema(BaseSchema):
         responses = fields.Dict(required=True,
                                 keys=fields.Str,
@@ -30,7 +33,8 @@ class Operation(BaseObject):
         external_docs = fields.Nested(ExternalDocs.Schema,
                                       load_from='externalDocs',
                                       dump_to='externalDocs')
-        operation_id = fields.Str()
+        operation_id = fields.Str(load_from='operationId',
+                                  dump_to='operationId')
         parameters = fields.List(fields.Dict())
         request_body = fields.Nested(RequestBody.Schema,
                                      load_from='requestBody',
@@ -15,6 +15,8 @@ class ServerVariable(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#serverVariableObject
     """
 
+    __slots__ = ('default', 'enum', 'description')
+
     class Schema(BaseSchema):
         default = fields.Str(required=True)
         enum = fields.List(fields.Str)
@@ -37,6 +39,8 @@ class Server(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#serverObject
     """
 
+    __slots__ = ('url', 'description', 'variables')
+
     class Schema(BaseSchema):
         url = fields.Str(required=True)
         description = fields.Str()
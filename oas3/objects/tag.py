@@ -18,6 +18,8 @@ class Tag(BaseObject):
         https://github.com/OAI/OpenAPI-Specification/blob/master/versions/3.0.0.md#tagObject
     """
 
+    __slots__ = ('name', 'description', 'external_docs')
+
     class Schema(BaseSchema):
         name = fields.Str(required=True)
         description = fields.Str()
@@ -0,0 +1,508 @@
+"""
+oas3.payload
+~~~~~~~~~~~~
+Validates request and response payloads against the Schema objects of a spec.
+"""
+
+import json
+import re
+from collections import namedtuple
+from .cache import LRUCache
+from .errors import ValidationError
+from .graph import DependencyGraph, iter_refs
+from .hashing import canonical_bytes, digest
+from .index import HTTP_METHODS
+from .shapes import SchemaTable
+from .util import to_builtin, resolve_pointer, join_pointer
+
+PayloadError = namedtuple('PayloadError', ['pointer', 'message'])
+
+_TYPE_CHECKS = {
+    'object': lambda value: isinstance(value, dict),
+    'array': lambda value: isinstance(value, list),
+    'string': lambda value: isinstance(value, str),
+    'boolean': lambda value: isinstance(value, bool),
+    'integer': lambda value: (isinstance(value, int) and not isinstance(value, bool)) or
+                             (isinstance(value, float) and value.is_integer()),
+    'number': lambda value: isinstance(value, (int, float)) and not isinstance(value, bool),
+}
+
+
+def _valid(value, pointer):
+    return []
+
+
+class SchemaCompiler:
+    """
+    Compiles raw Schema objects into validator functions. A validator takes a
+    payload and a JSON pointer to report errors at, and returns a list of
+    ``PayloadError``.
+
+    Local ``$ref`` values are resolved against ``document``, and recursive
+    schemas are supported. Schemas are compiled once per distinct shape, as
+    identified by ``shapes``, however many times they appear.
+
+    :param document: The raw spec ``$ref`` values are resolved against
+    :param shapes: The ``oas3.shapes.SchemaTable`` identifying equal schemas
+    """
+
+    def __init__(self, document=None, shapes=None):
+        self.document = document or {}
+        self.shapes = shapes if shapes is not None else SchemaTable()
+        self._refs = {}
+        self._compiled = {}
+        # (cache, key) entries added while a ``$ref`` is being compiled
+        self._journal = None
+
+    def compile(self, schema):
+        """
+        Compiles a single raw Schema object.
+
+        :param schema: A dict holding a Schema object or a ``$ref`` to one
+        :returns function: validator(payload, pointer='') -> list of PayloadError
+        """
+        if not isinstance(schema, dict) or not schema:
+            return _valid
+        if '$ref' in schema:
+            return self._compile_ref(schema['$ref'])
+        schema = self.shapes.canonical(schema)
+        shape = self.shapes.shape(schema)
+        validator = self._compiled.get(shape)
+        if validator is None:
+            validator = self._compiled[shape] = self._build(schema)
+            if self._journal is not None:
+                self._journal.append((self._compiled, shape))
+        return validator
+
+    def _build(self, schema):
+        checks = []
+        for keyword, build in _KEYWORDS:
+            if keyword in schema:
+                check = build(self, schema)
+                if check is not None:
+                    checks.append(check)
+        nullable = schema.get('nullable', False)
+
+        def validate(value, pointer=''):
+            if value is None and nullable:
+                return []
+            errors = []
+            for check in checks:
+                errors.extend(check(value, pointer))
+            return errors
+        return validate
+
+    def _compile_ref(self, ref):
+        """
+        Compiles the target of a ``$ref``. Its validator is cached before the
+        target is compiled so recursive references find it; if compiling
+        fails, it and every validator compiled meanwhile, which may call it,
+        are removed from the caches again.
+        """
+        if ref in self._refs:
+            return self._refs[ref]
+        compiled = []
+
+        def validate(value, pointer=''):
+            return compiled[0](value, pointer)
+        outermost = self._journal is None
+        if outermost:
+            self._journal = []
+        self._refs[ref] = validate
+        self._journal.append((self._refs, ref))
+        try:
+            try:
+                target = resolve_pointer(self.document, ref)
+            except KeyError:
+                raise ValidationError('Unable to resolve reference {}'.format(ref))
+            compiled.append(self.compile(target))
+        except Exception:
+            if outermost:
+                for cache, key in self._journal:
+                    cache.pop(key, None)
+            raise
+        finally:
+            if outermost:
+                self._journal = None
+        return validate
+
+
+def _build_type(compiler, schema):
+    expected = schema['type']
+    check = _TYPE_CHECKS.get(expected)
+    if check is None:
+        return None
+
+    def validate(value, pointer):
+        if value is None or not check(value):
+            return [PayloadError(pointer, 'Expected type {}'.format(expected))]
+        return []
+    return validate
+
+
+def _build_enum(compiler, schema):
+    allowed = schema['enum']
+
+    def validate(value, pointer):
+        if value not in allowed:
+            return [PayloadError(pointer, 'Value {!r} is not one of {!r}'.format(value, allowed))]
+        return []
+    return validate
+
+
+def _build_required(compiler, schema):
+    required = schema['required']
+
+    def validate(value, pointer):
+        if not isinstance(value, dict):
+            return []
+        return [PayloadError(pointer + join_pointer(name), 'Missing required property')
+                for name in required if name not in value]
+    return validate
+
+
+def _build_properties(compiler, schema):
+    properties = {name: compiler.compile(subschema)
+                  for name, subschema in schema['properties'].items()}
+    additional = schema.get('additionalProperties', True)
+    if isinstance(additional, dict):
+        additional = compiler.compile(additional)
+
+    def validate(value, pointer):
+        if not isinstance(value, dict):
+            return []
+        errors = []
+        for name, item in value.items():
+            validator = properties.get(name)
+            if validator is not None:
+                errors.extend(validator(item, pointer + join_pointer(name)))
+            elif additional is False:
+                errors.append(PayloadError(pointer + join_pointer(name),
+                                           'Additional property is not allowed'))
+            elif additional is not True:
+                errors.extend(additional(item, pointer + join_pointer(name)))
+        return errors
+    return validate
+
+
+def _build_items(compiler, schema):
+    items = compiler.compile(schema['items'])
+
+    def validate(value, pointer):
+        if not isinstance(value, list):
+            return []
+        errors = []
+        for index, item in enumerate(value):
+            errors.extend(items(item, pointer + join_pointer(index)))
+        return errors
+    return validate
+
+
+def _build_all_of(compiler, schema):
+    validators = [compiler.compile(subschema) for subschema in schema['allOf']]
+
+    def validate(value, pointer):
+        errors = []
+        for validator in validators:
+            errors.extend(validator(value, pointer))
+        return errors
+    return validate
+
+
+def _build_any_of(compiler, schema):
+    validators = [compiler.compile(subschema) for subschema in schema['anyOf']]
+
+    def validate(value, pointer):
+        if any(not validator(value, pointer) for validator in validators):
+            return []
+        return [PayloadError(pointer, 'Value does not match any of the anyOf schemas')]
+    return validate
+
+
+def _build_one_of(compiler, schema):
+    validators = [compiler.compile(subschema) for subschema in schema['oneOf']]
+
+    def validate(value, pointer):
+        matches = sum(1 for validator in validators if not validator(value, pointer))
+        if matches == 1:
+            return []
+        return [PayloadError(pointer, 'Value matches {} of the oneOf schemas'.format(matches))]
+    return validate
+
+
+def _build_not(compiler, schema):
+    validator = compiler.compile(schema['not'])
+
+    def validate(value, pointer):
+        if validator(value, pointer):
+            return []
+        return [PayloadError(pointer, 'Value must not match the not schema')]
+    return validate
+
+
+def _build_bound(keyword, exclusive_keyword, measure, compare, message):
+    def build(compiler, schema):
+        limit = schema[keyword]
+        exclusive = exclusive_keyword is not None and schema.get(exclusive_keyword, False)
+
+        def validate(value, pointer):
+            size = measure(value)
+            if size is None:
+                return []
+            if compare(size, limit) or (exclusive and size == limit):
+                return [PayloadError(pointer, message.format(limit))]
+            return []
+        return validate
+    return build
+
+
+def _number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return None
+
+
+def _length(kind):
+    def measure(value):
+        if isinstance(value, kind):
+            return len(value)
+        return None
+    return measure
+
+
+def _build_pattern(compiler, schema):
+    pattern = re.compile(schema['pattern'])
+
+    def validate(value, pointer):
+        if isinstance(value, str) and not pattern.search(value):
+            return [PayloadError(pointer, 'Value does not match pattern {}'.format(pattern.pattern))]
+        return []
+    return validate
+
+
+_KEYWORDS = (
+    ('type', _build_type),
+    ('enum', _build_enum),
+    ('required', _build_required),
+    ('properties', _build_properties),
+    ('items', _build_items),
+    ('allOf', _build_all_of),
+    ('anyOf', _build_any_of),
+    ('oneOf', _build_one_of),
+    ('not', _build_not),
+    ('pattern', _build_pattern),
+    ('minimum', _build_bound('minimum', 'exclusiveMinimum', _number,
+                             lambda size, limit: size < limit, 'Value is less than {}')),
+    ('maximum', _build_bound('maximum', 'exclusiveMaximum', _number,
+                             lambda size, limit: size > limit, 'Value is greater than {}')),
+    ('minLength', _build_bound('minLength', None, _length(str),
+                               lambda size, limit: size < limit, 'Shorter than {} characters')),
+    ('maxLength', _build_bound('maxLength', None, _length(str),
+                               lambda size, limit: size > limit, 'Longer than {} characters')),
+    ('minItems', _build_bound('minItems', None, _length(list),
+                              lambda size, limit: size < limit, 'Fewer than {} items')),
+    ('maxItems', _build_bound('maxItems', None, _length(list),
+                              lambda size, limit: size > limit, 'More than {} items')),
+    ('minProperties', _build_bound('minProperties', None, _length(dict),
+                                   lambda size, limit: size < limit, 'Fewer than {} properties')),
+    ('maxProperties', _build_bound('maxProperties', None, _length(dict),
+                                   lambda size, limit: size > limit, 'More than {} properties')),
+)
+
+
+def decode(payload):
+    """Decodes ``bytes`` or ``str`` JSON payloads, leaving decoded data untouched."""
+    if isinstance(payload, bytes):
+        payload = payload.decode('utf-8')
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    return payload
+
+
+class ValidationCache:
+    """
+    Memoizes validation verdicts by the hash of a payload and the content of
+    the Schema it was validated against, so repeated identical payloads are
+    only validated once. Payloads are hashed in their canonical form, so
+    ``bytes`` or ``str`` payloads differing only in key order or whitespace
+    share their verdicts. Verdicts are keyed on content rather than on Schema
+    objects, so a cache shared by the validators of successive versions of a
+    spec holds no reference to the older versions, and reuses the verdicts
+    of unchanged schemas.
+
+    :param maxsize: Maximum number of verdicts kept
+    :param ttl: Seconds a verdict stays valid, or None to keep it until evicted
+
+    Example:
+        >>> cache = ValidationCache(maxsize=4096, ttl=60)
+        >>> validator = ResponseValidator(spec, cache=cache)
+        >>> cache.stats()
+        {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 4096}
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.verdicts = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def wrap(self, validator, identity):
+        """
+        Puts the cache in front of a compiled validator.
+
+        :param validator: A validator returned by ``SchemaCompiler.compile``
+        :param identity: A hashable value identifying what the validator checks,
+            such as a digest of the Schema object it was compiled from; equal
+            for validators giving equal verdicts
+        :returns function: validator(payload, pointer='') accepting raw payloads too
+        """
+        def validate(payload, pointer=''):
+            value = decode(payload)
+            key = (identity, pointer, digest(canonical_bytes(value)))
+            verdict = self.verdicts.get(key)
+            if verdict is None:
+                verdict = tuple(validator(value, pointer))
+                self.verdicts.set(key, verdict)
+            return list(verdict)
+        return validate
+
+    @property
+    def hits(self):
+        return self.verdicts.hits
+
+    @property
+    def misses(self):
+        return self.verdicts.misses
+
+    def stats(self):
+        """Returns the hit and miss counters and the number of cached verdicts."""
+        return self.verdicts.stats()
+
+    def clear(self):
+        self.verdicts.clear()
+
+
+class ResponseValidator:
+    """
+    Validates response payloads against the responses declared by the
+    operations of a spec. Validators are compiled on first use and reused.
+
+    Example:
+        >>> from oas3 import Spec
+        >>> spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+        >>> validator = ResponseValidator(spec)
+        >>> validator.validate('/pets', 'get', 200, [{'id': 1, 'name': 'Rex'}])
+        []
+    """
+
+    def __init__(self, spec, cache=None):
+        self.document = to_builtin(spec)
+        self.compiler = SchemaCompiler(self.document)
+        self.cache = cache
+        self._validators = {}
+
+    def evolve(self, spec, changed):
+        """
+        Returns a validator for a new version of the spec. Compiled validators
+        of operations depending on none of the changed units are carried over
+        instead of being compiled again.
+
+        :param spec: The new version of the spec
+        :param changed: Pointers of the path items and components entries that
+            changed, as reported by ``oas3.validation.iter_units``
+        """
+        validator = ResponseValidator(spec, cache=self.cache)
+        affected = set(changed)
+        for document in (self.document, validator.document):
+            graph = DependencyGraph(document)
+            for pointer in changed:
+                if pointer in graph:
+                    affected.update(graph.dependents(pointer))
+        paths = validator.document.get('paths') or {}
+        for key, compiled in self._validators.items():
+            if key[0] in paths and join_pointer('paths', key[0]) not in affected:
+                validator._validators[key] = compiled
+        return validator
+
+    def operation_key(self, path, method):
+        """Returns the operationId of an operation, or ``METHOD path`` if it has none."""
+        operation = self._operation(path, method)
+        return operation.get('operationId') or '{} {}'.format(method.upper(), path)
+
+    def validate(self, path, method, status, payload, media_type='application/json'):
+        """
+        Validates a decoded response payload.
+
+        :param path: The path template the request was routed to, e.g. ``/pets/{petId}``
+        :param method: HTTP method of the operation
+        :param status: HTTP status code of the response
+        :param payload: The response body, either decoded or as JSON ``bytes``/``str``
+        :param media_type: The content type the response was served as
+        :returns list: ``PayloadError`` tuples, empty if the payload is valid
+        :raises ValidationError: if the spec has no such operation
+        """
+        validator = self.validator(path, method, status, media_type)
+        if self.cache is None:
+            return validator(decode(payload), '')
+        return validator(payload, '')
+
+    def validator(self, path, method, status, media_type='application/json'):
+        """Returns the compiled validator for a single operation response."""
+        key = (path, method.lower(), str(status), media_type)
+        validator = self._validators.get(key)
+        if validator is None:
+            identity, validator = self._compile(*key)
+            if self.cache is not None:
+                validator = self.cache.wrap(validator, identity)
+            self._validators[key] = validator
+        return validator
+
+    def _operation(self, path, method):
+        operation = self.document.get('paths', {}).get(path, {}).get(method.lower())
+        if method.lower() not in HTTP_METHODS or not isinstance(operation, dict):
+            raise ValidationError('Unknown operation {} {}'.format(method.upper(), path))
+        return operation
+
+    def _compile(self, path, method, status, media_type):
+        """
+        :returns tuple: the value identifying what payloads are validated
+            against in a ``ValidationCache``, and the validator. Validators
+            reporting an undocumented status or media type identify themselves,
+            as their message is specific to the response.
+        """
+        responses = self._operation(path, method).get('responses', {})
+        response = (responses.get(status) or
+                    responses.get(status[:1] + 'XX') or
+                    responses.get('default'))
+        if response is None:
+            def undocumented(value, pointer=''):
+                return [PayloadError(pointer, 'Undocumented response status {}'.format(status))]
+            return undocumented, undocumented
+        if '$ref' in response:
+            response = resolve_pointer(self.document, response['$ref'])
+        content = response.get('content') or {}
+        media = content.get(media_type) or content.get(media_type.split('/')[0] + '/*') or content.get('*/*')
+        if media is None:
+            if not content:
+                return _valid, _valid
+
+            def undeclared(value, pointer=''):
+                return [PayloadError(pointer, 'Undocumented media type {}'.format(media_type))]
+            return undeclared, undeclared
+        schema = media.get('schema')
+        return self._identity(schema), self.compiler.compile(schema)
+
+    def _identity(self, schema):
+        """
+        Digest of a Schema object along with every Schema it transitively
+        references, which tells apart equal schemas referring to changed ones.
+        """
+        resolved = {}
+        pending = list(iter_refs(schema))
+        while pending:
+            ref = pending.pop()
+            if ref in resolved:
+                continue
+            try:
+                resolved[ref] = resolve_pointer(self.document, ref)
+            except KeyError:
+                resolved[ref] = None
+            pending.extend(iter_refs(resolved[ref]))
+        return digest([schema, resolved])
@@ -0,0 +1,108 @@
+"""
+oas3.prune
+~~~~~~~~~~
+Removal of unused components entries and of documentation text from specs.
+"""
+
+from collections import namedtuple
+from .base import BaseObject
+from .graph import DependencyGraph, ROOT
+from .hashing import canonical_bytes
+from .index import field
+from .objects.components import Response
+from .util import slot_names, split_pointer
+from .validation import SECTION_ATTRIBUTES
+
+PruneResult = namedtuple('PruneResult', ['removed', 'saved'])
+
+DOCUMENTATION = frozenset(('description', 'summary', 'example', 'examples'))
+
+# Values of these keys map names chosen by the author, such as property or
+# status names, to objects: their keys are never keywords to strip.
+NAMED = frozenset(('paths', 'properties', 'schemas', 'responses', 'parameters', 'requestBodies',
+                   'request_bodies', 'headers', 'securitySchemes', 'security_schemes', 'links',
+                   'callbacks', 'content', 'encoding', 'variables', 'scopes', 'mapping'))
+
+# Values of these keys are user data, not OAS3 objects, and are left as they are.
+DATA = frozenset(('default', 'enum'))
+
+
+def unused_components(spec):
+    """
+    Returns the pointers of the components entries of a spec not reachable
+    from its ``paths`` or top level ``security``, following ``$ref``, security
+    requirements, callbacks and links transitively.
+
+    :returns list: sorted pointers such as ``/components/schemas/Unused``
+    """
+    graph = DependencyGraph(spec)
+    used = graph.dependencies(ROOT)
+    return sorted(pointer for pointer in graph.pointers
+                  if pointer.startswith('/components/') and pointer not in used)
+
+
+def strip_documentation(value, key=None):
+    """
+    Returns raw data, or OAS3 objects, without ``description``, ``summary``,
+    ``example`` and ``examples`` fields. The required description of
+    responses is emptied instead. Dicts and lists are copied rather than
+    modified, as they may be shared with other specs by an interner; OAS3
+    objects are modified in place.
+    """
+    if isinstance(value, BaseObject):
+        for name in slot_names(type(value)):
+            item = getattr(value, name, None)
+            if item is None:
+                continue
+            if name in DOCUMENTATION:
+                required = name == 'description' and isinstance(value, Response)
+                setattr(value, name, '' if required else None)
+            else:
+                setattr(value, name, strip_documentation(item, name))
+        return value
+    if isinstance(value, dict):
+        if key in NAMED:
+            return {name: _minify_entry(item, key) for name, item in value.items()}
+        return {name: item if name in DATA or str(name).startswith('x-')
+                else strip_documentation(item, name)
+                for name, item in value.items() if name not in DOCUMENTATION}
+    if isinstance(value, list):
+        return [strip_documentation(item) for item in value]
+    return value
+
+
+def _minify_entry(value, key):
+    value = strip_documentation(value)
+    if key == 'responses' and isinstance(value, dict) and '$ref' not in value:
+        value['description'] = ''
+    return value
+
+
+def prune(spec, minify=False):
+    """
+    Removes, in place, the components entries a spec does not use, see
+    ``unused_components``, after optionally stripping documentation text
+    with ``strip_documentation``, which can leave more entries unused.
+
+    :returns PruneResult: ``(removed, saved)``, the pointers of the removed
+        entries and the number of bytes saved in the compact JSON form of the spec
+    """
+    before = len(canonical_bytes(spec))
+    if minify:
+        strip_documentation(spec)
+    removed = unused_components(spec)
+    unused = {}
+    for pointer in removed:
+        section, name = split_pointer(pointer)[1:3]
+        unused.setdefault(section, set()).add(name)
+    components = spec.components
+    for section, names in unused.items():
+        entries = {name: entry for name, entry in field(components, SECTION_ATTRIBUTES[section],
+                                                          section).items()
+                   if name not in names}
+        if isinstance(components, BaseObject):
+            setattr(components, SECTION_ATTRIBUTES[section], entries)
+        else:
+            components[section] = entries
+    spec.invalidate()
+    return PruneResult(removed, before - len(canonical_bytes(spec)))
@@ -0,0 +1,115 @@
+"""
+oas3.refs
+~~~~~~~~~
+Resolution of ``$ref`` values pointing into other files of a multi-file spec.
+"""
+
+import os
+import posixpath
+from .base import parse_data, format_of
+from .errors import LoadingError
+from .files import read_text
+from .util import resolve_pointer
+
+
+class FileReader:
+    """
+    Reads and parses the documents of a multi-file spec from the file system.
+    Parsed documents are kept, and only parsed again once their file changed.
+    """
+
+    def __init__(self):
+        self._documents = {}
+
+    def join(self, base, reference):
+        """Resolves a relative file reference against the file it was found in."""
+        return os.path.normpath(os.path.join(os.path.dirname(base), reference))
+
+    def stamp(self, path):
+        """Returns a value that changes whenever the file at ``path`` changes."""
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def read_text(self, path):
+        """Returns the decoded text of the file at ``path``."""
+        return read_text(path)
+
+    def read(self, path):
+        """Returns the parsed document stored at ``path``."""
+        stamp = self.stamp(path)
+        cached = self._documents.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        document = parse_data(self.read_text(path), format_of(path))
+        self._documents[path] = (stamp, document)
+        return document
+
+
+class ArchiveReader(FileReader):
+    """
+    Reads and parses the documents of a multi-file spec from an open
+    ``oas3.files.Archive``, where paths are the names of archive members.
+    """
+
+    def __init__(self, archive):
+        super().__init__()
+        self.archive = archive
+
+    def join(self, base, reference):
+        return posixpath.normpath(posixpath.join(posixpath.dirname(base), reference))
+
+    def stamp(self, path):
+        return self.archive.stamp(path)
+
+    def read_text(self, path):
+        return self.archive.read_text(path)
+
+
+def _split(ref):
+    location, _, fragment = ref.partition('#')
+    return location, '#' + fragment
+
+
+def bundle(root, reader=None):
+    """
+    Loads the document at ``root`` and replaces every ``$ref`` into another
+    file with a copy of the value it points at, giving a single document.
+    References within the root document are kept as they are, and references
+    to URLs are not followed.
+
+    :param root: Path of the root document
+    :param reader: The ``FileReader``, or an object with the same methods, to read files with
+    :returns tuple: the bundled document and the set of paths of every file it was built from
+    :raises LoadingError: if a referenced file or value is missing, or references are circular
+    """
+    reader = reader or FileReader()
+    files = {root}
+
+    def resolve(path, pointer, active):
+        key = (path, pointer)
+        if key in active:
+            raise LoadingError('Circular reference to {}{}'.format(path, pointer))
+        files.add(path)
+        try:
+            value = resolve_pointer(reader.read(path), pointer)
+        except (IOError, OSError, KeyError):
+            raise LoadingError('Unable to resolve reference to {}{}'.format(path, pointer))
+        return inline(value, path, active | {key})
+
+    def inline(value, path, active):
+        if isinstance(value, list):
+            return [inline(item, path, active) for item in value]
+        if not isinstance(value, dict):
+            return value
+        ref = value.get('$ref')
+        if isinstance(ref, str) and '://' not in ref:
+            location, pointer = _split(ref)
+            if location:
+                return resolve(reader.join(path, location), pointer, active)
+            if path != root:
+                return resolve(path, pointer, active)
+        return {key: inline(item, path, active) for key, item in value.items()}
+
+    document = inline(reader.read(root), root, frozenset())
+    return document, files
+
@@ -0,0 +1,215 @@
+"""
+oas3.remote
+~~~~~~~~~~~
+Fetching of specs over HTTP with pooled connections, retries and caching.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .cache import LRUCache
+from .errors import LoadingError
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Request headers removing any validators, such as session defaults, from a request
+_UNCONDITIONAL = {'If-None-Match': None, 'If-Modified-Since': None, 'Cache-Control': 'no-cache'}
+
+
+def make_session(pool_size=10, retries=3, backoff=0.2):
+    """
+    Creates a ``requests.Session`` keeping up to ``pool_size`` connections per
+    host open, which retries failed connections and transient HTTP errors.
+
+    :param pool_size: Maximum number of pooled connections per host
+    :param retries: Number of retries of a failed request
+    :param backoff: Backoff factor in seconds between retries
+    """
+    retry = Retry(total=retries, backoff_factor=backoff,
+                  status_forcelist=RETRY_STATUSES)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def fetch(url, session=None, timeout=None, headers=None):
+    """
+    Downloads a document.
+
+    :returns requests.Response: the successful response
+    :raises LoadingError: if the request failed or returned an error status
+    """
+    try:
+        response = (session or requests).get(url, timeout=timeout, headers=headers)
+    except requests.RequestException as e:
+        raise LoadingError('HTTP Error: {}'.format(e))
+    if not response.ok:
+        raise LoadingError('HTTP Error: {}'.format(response.status_code))
+    return response
+
+
+class CacheEntry:
+    """A parsed document along with the validators needed to revalidate it."""
+
+    __slots__ = ('value', 'etag', 'last_modified', 'checked')
+
+    def __init__(self, value, etag=None, last_modified=None, checked=0.0):
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.checked = checked
+
+    def __getstate__(self):
+        return (self.value, self.etag, self.last_modified, self.checked)
+
+    def __setstate__(self, state):
+        self.value, self.etag, self.last_modified, self.checked = state
+
+
+class MemoryStore:
+    """Keeps cache entries in memory, evicting the least recently used ones."""
+
+    def __init__(self, maxsize=128):
+        self.entries = LRUCache(maxsize=maxsize)
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def set(self, key, entry):
+        self.entries.set(key, entry)
+
+
+class DiskStore:
+    """Keeps pickled cache entries as files in a directory, so they survive restarts."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + '.pickle')
+
+    def get(self, key):
+        """:returns CacheEntry: the stored entry, or None if missing or unreadable"""
+        try:
+            with open(self._path(key), 'rb') as file_ref:
+                entry = pickle.load(file_ref)
+        except Exception:
+            # truncated, corrupt, or written by an incompatible version: a miss
+            return None
+        return entry if isinstance(entry, CacheEntry) else None
+
+    def set(self, key, entry):
+        # a temporary file unique across threads and processes sharing the directory
+        handle, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as file_ref:
+                pickle.dump(entry, file_ref, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+
+
+class _Flight:
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ConditionalCache:
+    """
+    Caches documents loaded from URLs along with their ``ETag`` and
+    ``Last-Modified`` headers. Once ``ttl`` seconds have passed the document
+    is revalidated with a conditional request, and the cached object is
+    returned as is when the server answers ``304 Not Modified``. Concurrent
+    loads of the same URL share a single request.
+
+    Cached objects are shared between callers and should not be modified.
+
+    :param store: A ``MemoryStore`` (the default) or a ``DiskStore``
+    :param ttl: Seconds during which a document is served without asking the
+        server, 0 to revalidate on every load
+    :param session: The ``requests.Session`` to fetch with, a pooled one if None
+    :param timeout: Seconds to wait for the server to connect or respond
+
+    Example:
+        >>> cache = ConditionalCache(ttl=5)
+        >>> spec = Spec.from_url('https://example.com/openapi.yaml', cache=cache)
+    """
+
+    def __init__(self, store=None, ttl=0, session=None, timeout=None, clock=time.time):
+        self.store = store if store is not None else MemoryStore()
+        self.ttl = ttl
+        self.session = session or make_session()
+        self.timeout = timeout
+        self.clock = clock
+        self.requests = 0
+        self.not_modified = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def load(self, cls, url, format_type=None):
+        """Loads an object of type ``cls`` from ``url``, going through the cache."""
+        key = (cls.__module__, cls.__qualname__, url, format_type)
+        entry = self.store.get(key)
+        if entry is not None and self.clock() - entry.checked < self.ttl:
+            return entry.value
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = self._revalidate(cls, key, url, format_type, entry)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _revalidate(self, cls, key, url, format_type, entry):
+        headers = {}
+        if entry is not None and entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        self.requests += 1
+        response = fetch(url, self.session, self.timeout, headers)
+        if response.status_code == 304 and entry is not None:
+            self.not_modified += 1
+            entry.checked = self.clock()
+            self.store.set(key, entry)
+            return entry.value
+        if response.status_code == 304:
+            # nothing to reuse, such as when validators come from the session
+            self.requests += 1
+            response = fetch(url, self.session, self.timeout, dict(_UNCONDITIONAL))
+            if response.status_code == 304:
+                raise LoadingError('HTTP Error: 304 without a cached document for {}'
+                                   .format(url))
+        value = cls.from_string(response.text, format_type)
+        self.store.set(key, CacheEntry(value, response.headers.get('ETag'),
+                                       response.headers.get('Last-Modified'), self.clock()))
+        return value
@@ -0,0 +1,238 @@
+"""
+oas3.shadow
+~~~~~~~~~~~
+Sampled, asynchronous response validation that runs off the request path.
+"""
+
+import queue
+import random
+import threading
+import time
+from .payload import ResponseValidator, PayloadError
+
+_cpu_clock = getattr(time, 'thread_time', time.perf_counter)
+
+# Key of the statistics of responses to requests matching no documented operation
+UNMATCHED = '<unmatched>'
+
+
+class OperationStats:
+    """
+    Counters and a bounded reservoir of recent validation errors for a single
+    operation. The reservoir keeps a uniform sample of all failures seen.
+    """
+
+    def __init__(self, reservoir_size):
+        self.seen = 0
+        self.sampled = 0
+        self.dropped = 0
+        self.validated = 0
+        self.failed = 0
+        self.reservoir_size = reservoir_size
+        self.errors = []
+
+    def record_failure(self, errors, rng):
+        self.failed += 1
+        if len(self.errors) < self.reservoir_size:
+            self.errors.append(errors)
+            return
+        slot = rng.randrange(self.failed)
+        if slot < self.reservoir_size:
+            self.errors[slot] = errors
+
+    def as_dict(self):
+        return {
+            'seen': self.seen,
+            'sampled': self.sampled,
+            'dropped': self.dropped,
+            'validated': self.validated,
+            'failed': self.failed,
+            'errors': [[{'pointer': error.pointer, 'message': error.message} for error in errors]
+                       for errors in self.errors],
+        }
+
+
+class CPUBudget:
+    """
+    Caps the CPU time spent by the workers to a share of one core. CPU time is
+    earned at ``share`` seconds per wall clock second, up to ``burst`` seconds,
+    and workers that have overspent wait until the debt is paid back before
+    starting their next job.
+    """
+
+    def __init__(self, share, burst=1.0, clock=time.monotonic):
+        self.share = share
+        self.burst = burst * share
+        self.clock = clock
+        self.balance = self.burst
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def charge(self, seconds):
+        with self._lock:
+            self._refill()
+            self.balance -= seconds
+
+    def wait(self, stopped):
+        """Blocks until spending is back under the cap, or ``stopped`` is set."""
+        while not stopped.is_set():
+            with self._lock:
+                self._refill()
+                debt = -self.balance
+            if debt <= 0:
+                return
+            stopped.wait(debt / self.share)
+
+    def _refill(self):
+        now = self.clock()
+        self.balance = min(self.burst, self.balance + (now - self.updated) * self.share)
+        self.updated = now
+
+
+class ShadowValidator:
+    """
+    Validates a sample of responses on a pool of background threads. Calls to
+    ``submit`` never block: payloads that are not sampled, or that do not fit
+    in the bounded queue, are only counted.
+
+    :param spec: The ``Spec`` responses are validated against
+    :param sample_rate: Fraction of submitted responses to validate, from 0 to 1
+    :param workers: Number of background worker threads
+    :param max_queue: Maximum number of sampled responses waiting to be validated
+    :param cpu_share: Maximum share of one CPU core the workers may use, from 0 to 1
+    :param reservoir_size: Number of failed validations kept per operation
+    :param cache: An optional ``ValidationCache`` shared by the workers
+
+    Example:
+        >>> from oas3 import Spec
+        >>> spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+        >>> shadow = ShadowValidator(spec, sample_rate=0.05)
+        >>> queued = shadow.submit('/pets', 'get', 200, b'[{"id": 1, "name": "Rex"}]')
+        >>> shadow.stats()['listPets']['seen']
+        1
+    """
+
+    def __init__(self, spec, sample_rate=0.01, workers=1, max_queue=1000,
+                 cpu_share=0.1, reservoir_size=20, cache=None, seed=None):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError('sample_rate must be between 0 and 1')
+        if not 0 < cpu_share <= 1:
+            raise ValueError('cpu_share must be greater than 0 and at most 1')
+        self.validator = ResponseValidator(spec, cache=cache)
+        self.sample_rate = sample_rate
+        self.reservoir_size = reservoir_size
+        self.budget = CPUBudget(cpu_share)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._stopped = threading.Event()
+        self._workers = []
+        for number in range(workers):
+            worker = threading.Thread(target=self._work,
+                                      name='oas3-shadow-{}'.format(number))
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, path, method, status, payload, media_type='application/json'):
+        """
+        Offers a response for validation. Decoding of ``bytes`` or ``str``
+        payloads also happens in the background.
+
+        :returns bool: True if the response was queued for validation
+        """
+        key = (path, method, status, media_type)
+        with self._lock:
+            stats = self._operation_stats(path, method)
+            stats.seen += 1
+            if self._stopped.is_set() or self._rng.random() >= self.sample_rate:
+                return False
+            stats.sampled += 1
+            # queued under the lock, so nothing is queued once close() has stopped
+            try:
+                self._queue.put_nowait((stats, key, payload))
+            except queue.Full:
+                stats.dropped += 1
+                return False
+        return True
+
+    def stats(self):
+        """
+        Returns a snapshot of the counters and error reservoirs of every
+        operation, keyed by operationId (or ``METHOD path``). Responses to
+        requests matching no operation are counted under ``<unmatched>``.
+        """
+        with self._lock:
+            return {key: stats.as_dict() for key, stats in self._stats.items()}
+
+    @property
+    def queue_depth(self):
+        """Number of sampled responses waiting to be validated."""
+        return self._queue.qsize()
+
+    def close(self, wait=True):
+        """
+        Stops accepting new responses and shuts the workers down.
+
+        :param wait: If True the responses already queued are validated first,
+            in this thread when there are no workers, otherwise they are dropped
+        """
+        with self._lock:
+            self._stopped.set()
+        if not wait:
+            self._drain(validate=False)
+        elif self._workers:
+            self._queue.join()
+        else:
+            self._drain(validate=True)
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+
+    def _drain(self, validate):
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if validate:
+                    self._validate(*job)
+            finally:
+                self._queue.task_done()
+
+    def _operation_stats(self, path, method):
+        try:
+            key = self.validator.operation_key(path, method)
+        except Exception:
+            # one bucket whatever the path, as paths come from arbitrary requests
+            key = UNMATCHED
+        stats = self._stats.get(key)
+        if stats is None:
+            stats = self._stats[key] = OperationStats(self.reservoir_size)
+        return stats
+
+    def _work(self):
+        while True:
+            self.budget.wait(self._stopped)
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._validate(*job)
+            finally:
+                self._queue.task_done()
+
+    def _validate(self, stats, key, payload):
+        started = _cpu_clock()
+        try:
+            errors = self.validator.validate(*key[:3], payload=payload, media_type=key[3])
+        except Exception as e:
+            errors = [PayloadError('', str(e))]
+        self.budget.charge(_cpu_clock() - started)
+        with self._lock:
+            stats.validated += 1
+            if errors:
+                stats.record_failure(errors, self._rng)
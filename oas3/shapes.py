@@ -0,0 +1,177 @@
+"""
+oas3.shapes
+~~~~~~~~~~~
+Hash-consing of Schema objects: structurally equal schema subtrees are
+stored once and identified by an integer shape ID.
+"""
+
+import hashlib
+from .base import BaseObject
+from .cache import LRUCache
+from .hashing import canonical_bytes
+from .util import slot_names
+
+_SUBSCHEMA = ('items', 'not', 'additionalProperties')
+_SUBSCHEMA_LISTS = ('allOf', 'anyOf', 'oneOf')
+# Values of these keys are user data, no Schema object is looked for within. Unlike
+# in schemas, ``default`` is not one of them outside schemas: it is a response code.
+_SKIPPED = ('example', 'examples', 'enum')
+
+
+def iter_subschemas(schema):
+    """Yields the direct subschemas of a raw Schema object, see ``map_subschemas``."""
+    for keyword in _SUBSCHEMA:
+        if isinstance(schema.get(keyword), dict):
+            yield schema[keyword]
+    for keyword in _SUBSCHEMA_LISTS:
+        if isinstance(schema.get(keyword), list):
+            for item in schema[keyword]:
+                if isinstance(item, dict):
+                    yield item
+    if isinstance(schema.get('properties'), dict):
+        for item in schema['properties'].values():
+            if isinstance(item, dict):
+                yield item
+
+
+def map_subschemas(schema, function):
+    """
+    Returns a copy of a raw Schema object with ``function`` applied to each
+    of its direct subschemas: ``properties``, ``items``, ``additionalProperties``,
+    ``not`` and the entries of ``allOf``, ``anyOf`` and ``oneOf``.
+    """
+    result = dict(schema)
+    for keyword in _SUBSCHEMA:
+        if isinstance(result.get(keyword), dict):
+            result[keyword] = function(result[keyword])
+    for keyword in _SUBSCHEMA_LISTS:
+        if isinstance(result.get(keyword), list):
+            result[keyword] = [function(item) if isinstance(item, dict) else item
+                               for item in result[keyword]]
+    if isinstance(result.get('properties'), dict):
+        result['properties'] = {name: function(item) if isinstance(item, dict) else item
+                                for name, item in result['properties'].items()}
+    return result
+
+
+class SchemaTable:
+    """
+    Keeps a single canonical instance of every distinct raw Schema object.
+    The structural key of a schema is computed from its own keywords and the
+    shape IDs of its subschemas, so each subtree is only hashed once.
+
+    Canonical schemas are shared between every place they appear and must be
+    treated as read only. Two canonical schemas are equal if and only if
+    they are the same object, or equivalently have the same shape ID.
+
+    Example:
+        >>> table = SchemaTable()
+        >>> first = table.canonical({'type': 'array', 'items': {'type': 'string'}})
+        >>> second = table.canonical({'type': 'array', 'items': {'type': 'string'}})
+        >>> first is second
+        True
+    """
+
+    def __init__(self, aliases=1024):
+        self.hits = 0
+        self._nodes = {}
+        self._shapes = {}
+        # recently seen duplicates mapped to their canonical instance, bounded
+        # so the table does not keep every schema it was given alive
+        self._aliases = LRUCache(maxsize=aliases)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def stats(self):
+        """:returns dict: number of distinct schemas held and of duplicates replaced"""
+        return {'shapes': len(self._nodes), 'hits': self.hits}
+
+    def shape(self, schema):
+        """
+        Returns the shape ID of a raw Schema object, equal for structurally
+        equal schemas. It is O(1) for canonical schemas and recently seen
+        duplicates.
+        """
+        return self._shapes[id(self.canonical(schema))]
+
+    def canonical(self, schema):
+        """
+        Returns the canonical instance of a raw Schema object, values other
+        than dicts are returned as they are. The first occurrence of a shape
+        becomes its canonical instance as it is, unless some of its
+        subschemas had to be replaced by their canonical instance, in which
+        case it is copied.
+        """
+        if not isinstance(schema, dict) or id(schema) in self._shapes:
+            return schema
+        alias = self._aliases.get(id(schema))
+        if alias is not None and alias[0] is schema:
+            return alias[1]
+        replaced = {}
+        key = dict(schema)
+        for keyword in _SUBSCHEMA:
+            if isinstance(schema.get(keyword), dict):
+                item = self._canonical_child(schema[keyword], keyword, replaced)
+                key[keyword] = {'$shape': self._shapes[id(item)]}
+        for keyword in _SUBSCHEMA_LISTS:
+            if isinstance(schema.get(keyword), list):
+                items = [self.canonical(item) for item in schema[keyword]]
+                if any(item is not original for item, original in zip(items, schema[keyword])):
+                    replaced[keyword] = items
+                key[keyword] = [{'$shape': self._shapes[id(item)]} if isinstance(item, dict)
+                                else item for item in items]
+        if isinstance(schema.get('properties'), dict):
+            properties = {name: self.canonical(item)
+                          for name, item in schema['properties'].items()}
+            if any(item is not schema['properties'][name] for name, item in properties.items()):
+                replaced['properties'] = properties
+            key['properties'] = {name: {'$shape': self._shapes[id(item)]}
+                                 if isinstance(item, dict) else item
+                                 for name, item in properties.items()}
+        node = dict(schema, **replaced) if replaced else schema
+        shared = self._nodes.setdefault(hashlib.sha1(canonical_bytes(key)).digest(), node)
+        if shared is node:
+            self._shapes[id(node)] = len(self._shapes)
+        else:
+            self.hits += 1
+            self._aliases.set(id(schema), (schema, shared))
+        return shared
+
+    def _canonical_child(self, item, keyword, replaced):
+        canonical = self.canonical(item)
+        if canonical is not item:
+            replaced[keyword] = canonical
+        return canonical
+
+    def canonicalize(self, value):
+        """
+        Replaces, in place, every Schema object found in a spec with its
+        canonical instance: the ``schema`` of media types, parameters and
+        headers, and the entries of ``components.schemas``.
+
+        :param value: A spec or any part of it, as OAS3 objects or raw data
+        :returns: ``value``
+        """
+        if isinstance(value, BaseObject):
+            for name in slot_names(type(value)):
+                item = getattr(value, name, None)
+                if item is not None:
+                    setattr(value, name, self._child(name, item))
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if key not in _SKIPPED:
+                    value[key] = self._child(key, item)
+        elif isinstance(value, list):
+            value[:] = [self.canonicalize(item) for item in value]
+        return value
+
+    def _child(self, key, item):
+        if key == 'schema':
+            return self.canonical(item)
+        if key == 'schemas' and isinstance(item, dict):
+            for name in item:
+                item[name] = self.canonical(item[name])
+            return item
+        return self.canonicalize(item)
+
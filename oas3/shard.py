@@ -0,0 +1,210 @@
+"""
+oas3.shard
+~~~~~~~~~~
+Splits a spec into self-contained fragments, one per tag, path or
+operation, with an index document listing them.
+"""
+
+import os
+import re
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from .graph import DependencyGraph, ROOT, iter_refs
+from .hashing import canonical_bytes, digest
+from .index import HTTP_METHODS
+from .util import to_builtin, join_pointer, split_pointer
+from .validation import unit_of
+
+INDEX = 'index.json'
+UNTAGGED = 'default'
+SHARD_KINDS = ('tag', 'path', 'operation')
+
+
+def _slug(name):
+    return re.sub(r'[^A-Za-z0-9_-]+', '-', str(name)).strip('-') or 'root'
+
+
+def fragment_file(name, data):
+    """
+    Names the file of a fragment after its shard and the digest of its
+    content, so a fragment can be cached for as long as its name is used.
+
+    :param data: The serialized fragment
+    """
+    return '{}.{}.json'.format(_slug(name), digest(data)[:16])
+
+
+def _replace(path, data):
+    """
+    Writes a file atomically: the data is written to a temporary file in the
+    same directory, which then replaces ``path``, so readers and concurrent
+    writers never see a partially written file. The file is created with
+    the usual permissions, 0666 less the umask, so it can be served as is.
+    """
+    temporary = '{}.{}.tmp'.format(path, uuid.uuid4().hex)
+    handle = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def _write(directory, fragments):
+    """Serializes and writes ``(name, fragment)`` pairs, returning their file names."""
+    files = []
+    for name, fragment in fragments:
+        data = canonical_bytes(fragment)
+        filename = fragment_file(name, data)
+        path = os.path.join(directory, filename)
+        if not os.path.exists(path):
+            _replace(path, data)
+        files.append(filename)
+    return files
+
+
+class Sharder:
+    """
+    Builds the fragments of a spec. A fragment is a spec of its own holding
+    the top level fields, the operations of its shard along with the fields
+    of their path items, and only the components entries these transitively
+    reach, found with a ``DependencyGraph`` of the spec.
+
+    :param by: ``tag``, ``path`` or ``operation``; an operation with several
+        tags appears in the shard of each, untagged ones in the ``default`` shard
+    :raises ValueError: if ``by`` is not supported
+    """
+
+    def __init__(self, spec, by='tag'):
+        if by not in SHARD_KINDS:
+            raise ValueError('Unsupported shard kind {}, expected one of {}'
+                             .format(by, ', '.join(SHARD_KINDS)))
+        self.by = by
+        self.document = to_builtin(spec)
+        self.graph = DependencyGraph(spec)
+        self.base = {key: value for key, value in self.document.items()
+                     if key not in ('paths', 'components')}
+        # the schemes of the top level security requirements
+        self.security = {self.graph.ids[pointer]
+                         for pointer in self.graph.dependencies(ROOT, transitive=False)
+                         if pointer.startswith('/components/')}
+
+    def shards(self):
+        """
+        :returns dict: shard names mapped to the sorted ``(path, method)`` of
+            their operations, the method being None for a whole path item
+        """
+        shards = {}
+        paths = self.document.get('paths') or {}
+        for path in sorted(paths):
+            item = paths[path]
+            if self.by == 'path':
+                shards[path] = [(path, None)]
+                continue
+            if not isinstance(item, dict):
+                continue
+            for method in HTTP_METHODS:
+                operation = item.get(method)
+                if not isinstance(operation, dict):
+                    continue
+                if self.by == 'operation':
+                    names = [operation.get('operationId') or '{} {}'.format(method, path)]
+                else:
+                    names = operation.get('tags') or [UNTAGGED]
+                for name in names:
+                    shards.setdefault(name, []).append((path, method))
+        return shards
+
+    def fragment(self, operations):
+        """Builds the fragment holding ``(path, method)`` operations."""
+        paths = self.document['paths']
+        selected = {}
+        roots = set(self.security)
+        for path, method in operations:
+            pointer = join_pointer('paths', path)
+            item = paths[path]
+            if method is None:
+                selected[path] = item
+                roots.add(self.graph.ids[pointer])
+                continue
+            if path not in selected:
+                selected[path] = {key: value for key, value in item.items()
+                                  if key not in HTTP_METHODS}
+                roots |= self._path_roots(pointer, selected[path])
+            selected[path][method] = item[method]
+            roots.add(self.graph.ids[pointer + join_pointer(method)])
+        fragment = dict(self.base)
+        fragment['paths'] = selected
+        components = {}
+        for node_id in sorted(roots | self.graph.closure(roots)):
+            pointer = self.graph.pointers[node_id]
+            tokens = split_pointer(pointer)
+            if tokens[:1] == ['components']:
+                section, name = tokens[1:3]
+                components.setdefault(section, {})[name] = \
+                    self.document['components'][section][name]
+        if components:
+            fragment['components'] = components
+        return fragment
+
+    def _path_roots(self, pointer, own):
+        """Nodes the fields of a path item other than its operations depend on."""
+        roots = set()
+        for index, parameter in enumerate(own.get('parameters') or ()):
+            roots.add(self.graph.ids[pointer + join_pointer('parameters', index)])
+        fields = {key: value for key, value in own.items() if key != 'parameters'}
+        for ref in iter_refs(fields):
+            unit = unit_of(ref) if ref.startswith('#/') else ROOT
+            if unit != ROOT and unit in self.graph.ids:
+                roots.add(self.graph.ids[unit])
+        return roots
+
+
+def shard_spec(spec, directory, by='tag', workers=None, shards_per_worker=4):
+    """
+    Writes one fragment per shard of a spec to ``directory``, see ``Sharder``,
+    and an ``index.json`` listing the shards, their operations and files.
+    Fragments are serialized canonically and named after their digest, so
+    the output is the same on every run and unchanged fragments keep their
+    file name; existing files are not rewritten. Files are written
+    atomically, so an interrupted run never leaves a truncated fragment.
+
+    :param workers: Number of processes serializing and writing fragments,
+        None or 1 writes them in this process
+    :returns dict: the index document
+    """
+    sharder = Sharder(spec, by=by)
+    shards = sharder.shards()
+    names = sorted(shards)
+    fragments = [(name, sharder.fragment(shards[name])) for name in names]
+    os.makedirs(directory, exist_ok=True)
+    if workers is None or workers <= 1 or not fragments:
+        files = _write(directory, fragments)
+    else:
+        count = min(len(fragments), workers * shards_per_worker)
+        size = -(-len(fragments) // count)
+        batches = [fragments[start:start + size] for start in range(0, len(fragments), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            files = [filename for batch in pool.map(_write, repeat(directory), batches)
+                     for filename in batch]
+    paths = sharder.document.get('paths') or {}
+    index = dict(sharder.base, paths={})
+    index['x-shards'] = {'by': by, 'shards': [
+        {'name': name, 'file': filename, 'operations': [
+            _operation_entry(paths, path, method) for path, method in shards[name]]}
+        for name, filename in zip(names, files)]}
+    _replace(os.path.join(directory, INDEX), canonical_bytes(index))
+    return index
+
+
+def _operation_entry(paths, path, method):
+    entry = {'path': path}
+    if method is not None:
+        entry['method'] = method
+        operation_id = paths[path][method].get('operationId')
+        if operation_id is not None:
+            entry['operationId'] = operation_id
+    return entry
@@ -0,0 +1,434 @@
+"""
+oas3.snapshot
+~~~~~~~~~~~~~
+Compact binary snapshots of loaded OAS3 objects, which can be memory mapped
+and decoded lazily node by node.
+
+A snapshot is laid out as follows, all integers little endian:
+
+- a header: magic ``OAS3SNAP``, format version, CRC-32 of everything after
+  the header, node and string counts, root node ID, string ID of the class
+  name, and the offsets of the string and node indexes
+- the string table: UTF-8 strings back to back, then their offsets
+- the nodes, each a one byte type followed by its payload, then their offsets
+
+Scalars and containers are nodes identified by their position in the node
+index. Mappings and lists hold the IDs of their children, and equal values
+are stored once, whatever the number of places they appear in.
+"""
+
+import datetime
+import mmap
+import os
+import struct
+import zlib
+from collections.abc import Mapping, Sequence
+from .errors import LoadingError
+from .util import to_builtin
+
+MAGIC = b'OAS3SNAP'
+VERSION = 1
+
+_HEADER = struct.Struct('<8sHHIIIIIII')
+_OFFSET = struct.Struct('<I')
+_COUNT = struct.Struct('<I')
+_ID = struct.Struct('<I')
+_PAIR = struct.Struct('<II')
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+_NO_CLASS = 0xFFFFFFFF
+
+NULL, FALSE, TRUE, INT, FLOAT, STRING, LIST, MAPPING, BIG_INT = range(9)
+
+
+def _order(key):
+    """Sort order of mapping keys, which may mix strings and integers."""
+    return type(key).__name__, key
+
+
+class _Writer:
+    def __init__(self):
+        self.strings = {}
+        self.nodes = []
+        self.ids = {}
+
+    def string(self, value):
+        string_id = self.strings.get(value)
+        if string_id is None:
+            string_id = self.strings[value] = len(self.strings)
+        return string_id
+
+    def node(self, value):
+        if value is None:
+            encoded = bytes((NULL,))
+        elif value is True:
+            encoded = bytes((TRUE,))
+        elif value is False:
+            encoded = bytes((FALSE,))
+        elif isinstance(value, int):
+            if -(1 << 63) <= value < (1 << 63):
+                encoded = bytes((INT,)) + _INT.pack(value)
+            else:
+                encoded = bytes((BIG_INT,)) + _ID.pack(self.string(str(value)))
+        elif isinstance(value, float):
+            encoded = bytes((FLOAT,)) + _FLOAT.pack(value)
+        elif isinstance(value, str):
+            encoded = bytes((STRING,)) + _ID.pack(self.string(value))
+        elif isinstance(value, (datetime.date, datetime.datetime)):
+            encoded = bytes((STRING,)) + _ID.pack(self.string(value.isoformat()))
+        elif isinstance(value, dict):
+            items = sorted(value.items(), key=lambda item: _order(item[0]))
+            pairs = [_PAIR.pack(self.node(key), self.node(item)) for key, item in items]
+            encoded = bytes((MAPPING,)) + _COUNT.pack(len(pairs)) + b''.join(pairs)
+        elif isinstance(value, (list, tuple)):
+            children = [_ID.pack(self.node(item)) for item in value]
+            encoded = bytes((LIST,)) + _COUNT.pack(len(children)) + b''.join(children)
+        else:
+            raise TypeError('{!r} cannot be stored in a snapshot'.format(value))
+        node_id = self.ids.get(encoded)
+        if node_id is None:
+            node_id = self.ids[encoded] = len(self.nodes)
+            self.nodes.append(encoded)
+        return node_id
+
+    def build(self, root, class_name):
+        class_id = _NO_CLASS if class_name is None else self.string(class_name)
+        body = bytearray()
+        string_offsets = []
+        for string in self.strings:
+            string_offsets.append(_HEADER.size + len(body))
+            body += string.encode('utf-8')
+        string_offsets.append(_HEADER.size + len(body))
+        string_index = _HEADER.size + len(body)
+        for offset in string_offsets:
+            body += _OFFSET.pack(offset)
+        node_offsets = []
+        for encoded in self.nodes:
+            node_offsets.append(_HEADER.size + len(body))
+            body += encoded
+        node_index = _HEADER.size + len(body)
+        if node_index + _OFFSET.size * len(node_offsets) > 0xFFFFFFFF:
+            raise ValueError('Snapshots are limited to 4 GiB')
+        for offset in node_offsets:
+            body += _OFFSET.pack(offset)
+        header = _HEADER.pack(MAGIC, VERSION, 0, zlib.crc32(body), len(self.nodes),
+                              len(self.strings), root, class_id, string_index, node_index)
+        return header + bytes(body)
+
+
+def encode(value, cls=None):
+    """
+    Encodes python builtin data, or an OAS3 object, into the binary snapshot format.
+
+    :param cls: The class recorded in the snapshot, to load it back with
+    :returns bytes: the encoded snapshot
+    """
+    writer = _Writer()
+    root = writer.node(to_builtin(value))
+    class_name = None if cls is None else _class_name(cls)
+    return writer.build(root, class_name)
+
+
+# Classes snapshots can be loaded back into, keyed by the name they record
+_CLASSES = {}
+
+
+def _class_name(cls):
+    return '{}:{}'.format(cls.__module__, cls.__qualname__)
+
+
+def register(cls):
+    """
+    Registers an OAS3 object class, so snapshots recording it can be opened
+    without passing the class. The classes of this package are registered
+    already; snapshots only ever load registered classes, never importing
+    the module a snapshot names.
+
+    Example:
+        >>> @register
+        ... class MySpec(Spec):
+        ...     pass
+    """
+    _CLASSES[_class_name(cls)] = cls
+    return cls
+
+
+def unregister(cls):
+    """Removes a class registered with ``register``."""
+    _CLASSES.pop(_class_name(cls), None)
+
+
+def _registered(class_name):
+    if class_name not in _CLASSES:
+        from .base import BaseObject
+        classes = list(BaseObject.__subclasses__())
+        while classes:
+            cls = classes.pop()
+            if cls.__module__ == 'oas3' or cls.__module__.startswith('oas3.'):
+                _CLASSES.setdefault(_class_name(cls), cls)
+            classes.extend(cls.__subclasses__())
+    try:
+        return _CLASSES[class_name]
+    except KeyError:
+        raise LoadingError('Unable to load, the snapshot class {} is not registered'
+                           .format(class_name))
+
+
+class SnapshotMapping(Mapping):
+    """
+    Read only mapping over a mapping node, decoding values on access. Keys
+    are stored sorted, so a lookup only decodes the keys of a binary search.
+    """
+
+    __slots__ = ('_snapshot', '_pairs', '_children')
+
+    def __init__(self, snapshot, pairs):
+        self._snapshot = snapshot
+        self._pairs = pairs
+        self._children = None
+
+    def __getitem__(self, key):
+        if self._children is not None:
+            return self._snapshot.node(self._children[key])
+        pairs = self._pairs
+        low, high = 0, len(pairs) // 2
+        try:
+            target = _order(key)
+            while low < high:
+                middle = (low + high) // 2
+                found = _order(self._snapshot._scalar(pairs[2 * middle]))
+                if found == target:
+                    return self._snapshot.node(pairs[2 * middle + 1])
+                if found < target:
+                    low = middle + 1
+                else:
+                    high = middle
+        except TypeError:
+            pass
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._pairs) // 2
+
+    def __repr__(self):
+        return 'SnapshotMapping({!r})'.format(list(self._keys()))
+
+    def _keys(self):
+        if self._children is None:
+            scalar = self._snapshot._scalar
+            pairs = self._pairs
+            self._children = {scalar(pairs[index]): pairs[index + 1]
+                              for index in range(0, len(pairs), 2)}
+        return self._children
+
+
+class SnapshotList(Sequence):
+    """Read only sequence over a list node, decoding items on access."""
+
+    __slots__ = ('_snapshot', '_children')
+
+    def __init__(self, snapshot, children):
+        self._snapshot = snapshot
+        self._children = children
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._snapshot.node(child) for child in self._children[index]]
+        return self._snapshot.node(self._children[index])
+
+    def __len__(self):
+        return len(self._children)
+
+    def __repr__(self):
+        return 'SnapshotList(<{} items>)'.format(len(self._children))
+
+
+class Snapshot:
+    """
+    Holds a loaded OAS3 object in the binary snapshot format. A snapshot is a
+    single buffer, so it is far cheaper to pickle between processes than the
+    object graph it stands for, and a snapshot written to a file can be
+    memory mapped by any number of processes sharing the same pages.
+
+    Nodes are only decoded when they are reached through ``root``, while
+    ``to_dict`` and ``load`` decode the whole snapshot.
+
+    :param cls: The OAS3 object class the snapshot was taken from, or None
+    :param data: The encoded snapshot, ``bytes`` or any buffer such as an ``mmap``
+    :raises LoadingError: if the data is not a snapshot of a supported
+        version, its checksum does not match, or it records a class that is
+        not registered, see ``register``
+
+    Example:
+        >>> snapshot = Snapshot.take(spec)
+        >>> snapshot.write('./petstore.snapshot')
+        >>> shared = Snapshot.open('./petstore.snapshot')
+        >>> shared.root['paths']['/pets']['get']['operationId']
+        'listPets'
+    """
+
+    __slots__ = ('cls', 'data', '_view', '_header', '_strings')
+
+    def __init__(self, cls, data, verify=True):
+        self.data = data
+        self._view = memoryview(data)
+        if len(self._view) < _HEADER.size:
+            raise LoadingError('Unable to load, not a snapshot')
+        self._header = _HEADER.unpack_from(self._view)
+        magic, version, _, checksum = self._header[:4]
+        if magic != MAGIC:
+            raise LoadingError('Unable to load, not a snapshot')
+        if version != VERSION:
+            raise LoadingError('Unable to load snapshot version {}, expected {}'.format(
+                version, VERSION))
+        if verify and zlib.crc32(self._view[_HEADER.size:]) != checksum:
+            raise LoadingError('Unable to load, the snapshot checksum does not match')
+        nodes, strings, _, _, string_index, node_index = self._header[4:]
+        if not (_HEADER.size <= string_index and
+                string_index + _OFFSET.size * (strings + 1) <= node_index and
+                node_index + _OFFSET.size * nodes <= len(self._view)):
+            raise LoadingError('Unable to load, the snapshot is truncated or corrupt')
+        self._strings = {}
+        class_id = self._header[7]
+        if cls is None and class_id != _NO_CLASS:
+            cls = _registered(self.string(class_id))
+        self.cls = cls
+
+    @classmethod
+    def take(cls, obj):
+        """Takes a snapshot of a loaded OAS3 object."""
+        return cls(type(obj), encode(obj, type(obj)), verify=False)
+
+    @classmethod
+    def open(cls, path, verify=True):
+        """
+        Memory maps a snapshot file. The mapping is read only and shared with
+        every other process mapping the same file.
+
+        :param verify: If False the checksum is not computed, which avoids
+            reading every page of the file up front
+        """
+        with open(path, 'rb') as file_ref:
+            if os.fstat(file_ref.fileno()).st_size < _HEADER.size:
+                raise LoadingError('Unable to load, not a snapshot')
+            mapped = mmap.mmap(file_ref.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(None, mapped, verify=verify)
+
+    def write(self, path):
+        """Writes the snapshot to a file, to be mapped with ``Snapshot.open``."""
+        with open(path, 'wb') as file_ref:
+            file_ref.write(self._view)
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getstate__(self):
+        return self.cls, bytes(self._view)
+
+    def __setstate__(self, state):
+        self.__init__(state[0], state[1], verify=False)
+
+    @property
+    def root(self):
+        """The root node, containers are returned as lazy read only views."""
+        return self.node(self._header[6])
+
+    def string(self, string_id):
+        """Decodes a string of the string table."""
+        value = self._strings.get(string_id)
+        if value is None:
+            if not 0 <= string_id < self._header[5]:
+                raise LoadingError('Unable to load, invalid snapshot string {}'.format(string_id))
+            string_index = self._header[8]
+            start, end = struct.unpack_from('<II', self._view,
+                                            string_index + string_id * _OFFSET.size)
+            if not _HEADER.size <= start <= end <= string_index:
+                raise LoadingError('Unable to load, invalid snapshot string {}'.format(string_id))
+            try:
+                value = str(self._view[start:end], 'utf-8')
+            except UnicodeDecodeError:
+                raise LoadingError('Unable to load, invalid snapshot string {}'.format(string_id))
+            self._strings[string_id] = value
+        return value
+
+    def node(self, node_id):
+        """
+        Decodes a single node: scalars are returned as they are, mappings and
+        lists as ``SnapshotMapping`` and ``SnapshotList`` views.
+        """
+        kind, offset = self._read(node_id)
+        if kind == MAPPING:
+            return SnapshotMapping(self, self._children(offset, 2))
+        if kind == LIST:
+            return SnapshotList(self, self._children(offset, 1))
+        return self._decode_scalar(kind, offset)
+
+    def to_dict(self):
+        """Returns the raw data of the snapshot without validating it."""
+        return self._materialize(self._header[6], {})
+
+    def load(self):
+        """Loads the snapshot back into a new instance of its OAS3 object class."""
+        if self.cls is None:
+            raise LoadingError('Unable to load, the snapshot does not record its class')
+        return self.cls.from_dict(self.to_dict())
+
+    def _read(self, node_id):
+        if not 0 <= node_id < self._header[4]:
+            raise LoadingError('Unable to load, invalid snapshot node {}'.format(node_id))
+        offset, = _OFFSET.unpack_from(self._view, self._header[9] + node_id * _OFFSET.size)
+        if not self._header[8] <= offset < self._header[9]:
+            raise LoadingError('Unable to load, invalid snapshot node {}'.format(node_id))
+        return self._view[offset], offset + 1
+
+    def _unpack(self, layout, offset):
+        """Unpacks a node payload, which must end before the node index."""
+        if offset + layout.size > self._header[9]:
+            raise LoadingError('Unable to load, the snapshot is truncated or corrupt')
+        return layout.unpack_from(self._view, offset)
+
+    def _children(self, offset, width):
+        """Unpacks the child IDs of a list, ``width`` 1, or mapping, ``width`` 2, node."""
+        count, = self._unpack(_COUNT, offset)
+        return self._unpack(struct.Struct('<{}I'.format(width * count)), offset + _COUNT.size)
+
+    def _scalar(self, node_id):
+        kind, offset = self._read(node_id)
+        return self._decode_scalar(kind, offset)
+
+    def _decode_scalar(self, kind, offset):
+        if kind == STRING:
+            return self.string(self._unpack(_ID, offset)[0])
+        if kind == INT:
+            return self._unpack(_INT, offset)[0]
+        if kind == NULL:
+            return None
+        if kind == TRUE:
+            return True
+        if kind == FALSE:
+            return False
+        if kind == FLOAT:
+            return self._unpack(_FLOAT, offset)[0]
+        if kind == BIG_INT:
+            try:
+                return int(self.string(self._unpack(_ID, offset)[0]))
+            except ValueError:
+                raise LoadingError('Unable to load, invalid snapshot integer')
+        raise LoadingError('Unable to load, invalid snapshot node type {}'.format(kind))
+
+    def _materialize(self, node_id, memo):
+        kind, offset = self._read(node_id)
+        if kind == MAPPING:
+            pairs = self._children(offset, 2)
+            return {self._scalar(pairs[index]): self._materialize(pairs[index + 1], memo)
+                    for index in range(0, len(pairs), 2)}
+        if kind == LIST:
+            children = self._children(offset, 1)
+            return [self._materialize(child, memo) for child in children]
+        scalar = memo.get(node_id)
+        if scalar is None:
+            scalar = memo[node_id] = self._decode_scalar(kind, offset)
+        return scalar
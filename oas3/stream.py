@@ -0,0 +1,369 @@
+"""
+oas3.stream
+~~~~~~~~~~~
+Reads selected top level values of a spec from the parser event stream,
+without parsing the rest of the document.
+"""
+
+import codecs
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+from fnmatch import fnmatchcase
+import yaml
+from yaml.events import (StreamStartEvent, DocumentStartEvent, MappingStartEvent,
+                         MappingEndEvent, SequenceStartEvent, SequenceEndEvent, ScalarEvent)
+from .base import parse_data, format_of
+from .errors import ValidationError
+from .files import COMPRESSIONS, detect_encoding, strip_compression, read_bytes
+from .graph import iter_refs
+from .index import HTTP_METHODS
+from .objects.info import Info
+from .util import split_pointer
+
+Header = namedtuple('Header', ['openapi', 'info'])
+
+
+class _UndefinedAlias(ValidationError):
+    pass
+
+
+class _JSONText:
+    """
+    Text stream over a JSON document that YAML can tokenize: tabs, which JSON
+    only allows as whitespace outside of strings, become spaces.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def read(self, size=-1):
+        return self.stream.read(size).replace('\t', ' ')
+
+
+def _skip(loader, event=None):
+    """
+    Consumes the events of the value at the head of the event stream, or of
+    the value started by ``event`` if it was already consumed.
+    """
+    depth = 0
+    while True:
+        event = event or loader.get_event()
+        if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return
+        event = None
+
+
+def iter_top_level(stream, json=False):
+    """
+    Yields ``(key, value)`` for each key of the top level mapping of a JSON
+    or YAML document, reading the text stream only as far as needed. The
+    value is only constructed if the consumer calls ``value.read()``,
+    otherwise its events are skipped.
+
+    :param stream: A text stream of the document
+    :param json: If True the document is JSON, which may use tabs as whitespace
+    """
+    loader = yaml.SafeLoader(_JSONText(stream) if json else stream)
+    try:
+        for kind in (StreamStartEvent, DocumentStartEvent):
+            if not loader.check_event(kind):
+                raise ValidationError('Unable to read, the document is empty')
+            loader.get_event()
+        if not loader.check_event(MappingStartEvent):
+            raise ValidationError('Unable to read, the document is not a mapping')
+        for item in _Value(loader).items():
+            yield item
+    finally:
+        loader.dispose()
+
+
+class _Value:
+    """The value at the head of the event stream of a loader."""
+
+    def __init__(self, loader):
+        self._loader = loader
+        self.consumed = False
+
+    def read(self):
+        """Constructs the value into python builtin data types."""
+        self.consumed = True
+        node = self._loader.compose_node(None, None)
+        return self._loader.construct_document(node)
+
+    def items(self):
+        """
+        Yields ``(key, value)`` for each entry of a mapping, like
+        ``iter_top_level``. Values other than mappings are skipped.
+        """
+        self.consumed = True
+        loader = self._loader
+        if not loader.check_event(MappingStartEvent):
+            _skip(loader)
+            return
+        loader.get_event()
+        while not loader.check_event(MappingEndEvent):
+            key = loader.get_event()
+            if not isinstance(key, ScalarEvent):
+                _skip(loader, key)
+                _skip(loader)
+                continue
+            value = _Value(loader)
+            yield key.value, value
+            if not value.consumed:
+                _skip(loader)
+        loader.get_event()
+
+    def refs(self):
+        """Consumes the value and returns the set of ``$ref`` strings within it."""
+        self.consumed = True
+        loader = self._loader
+        refs = set()
+        # one entry per open collection, True for mappings expecting a key
+        stack = []
+        while True:
+            event = loader.get_event()
+            if isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+                stack.pop()
+            elif stack and stack[-1] is True and isinstance(event, ScalarEvent) and \
+                    event.value == '$ref' and loader.check_event(ScalarEvent):
+                refs.add(loader.get_event().value)
+                continue
+            if stack and stack[-1] is not None and not isinstance(event, (MappingEndEvent,
+                                                                         SequenceEndEvent)):
+                stack[-1] = not stack[-1]
+            if isinstance(event, MappingStartEvent):
+                stack.append(True)
+            elif isinstance(event, SequenceStartEvent):
+                stack.append(None)
+            if not stack:
+                return refs
+
+
+@contextmanager
+def open_document(path):
+    """
+    Opens a JSON or YAML file, which may be compressed, and yields the
+    ``(key, value)`` pairs of ``iter_top_level`` for it.
+
+    :raises ValidationError: if the document cannot be parsed
+    """
+    opener = COMPRESSIONS.get(os.path.splitext(path)[1].lower(), open)
+    with opener(path, 'rb') as raw:
+        text = codecs.getreader(detect_encoding(raw.peek(4)[:4]))(raw)
+        json = strip_compression(path).lower().endswith('.json')
+        try:
+            yield iter_top_level(text, json=json)
+        except yaml.composer.ComposerError as e:
+            raise _UndefinedAlias('Unable to load, invalid document: {}'.format(e))
+        except yaml.YAMLError as e:
+            raise ValidationError('Unable to load, invalid document: {}'.format(e))
+
+
+def peek(path):
+    """
+    Reads ``openapi`` and ``info`` from a spec file, stopping as soon as both
+    were found. Values before them are skipped at the event level, values
+    after them are never read.
+
+    :param path: An absolute or local path to a JSON or YAML file, which may
+        be compressed
+    :returns Header: the ``openapi`` version string and the ``Info`` object
+    :raises ValidationError: if the document is not a mapping, cannot be parsed,
+        or the ``info`` object is invalid
+    """
+    wanted = {'openapi': None, 'info': None}
+    with open_document(path) as entries:
+        for key, value in entries:
+            if key in wanted:
+                wanted[key] = value.read()
+                if all(item is not None for item in wanted.values()):
+                    break
+    info = wanted['info']
+    if info is not None:
+        info = Info.from_dict(info)
+    openapi = wanted['openapi']
+    return Header(openapi if openapi is None else str(openapi), info)
+
+
+def component_refs(value):
+    """
+    Returns the ``(section, name)`` of every components entry that raw data
+    refers to with a local ``$ref`` or a security requirement.
+    """
+    return _components_of(iter_refs(value)) | _security_of(value)
+
+
+def _components_of(refs):
+    result = set()
+    for ref in refs:
+        if ref.startswith('#/components/'):
+            tokens = split_pointer(ref)
+            if len(tokens) >= 3:
+                result.add((tokens[1], tokens[2]))
+    return result
+
+
+def _security_of(value):
+    result = set()
+    if not isinstance(value, dict):
+        return result
+    operations = [value] + [value[method] for method in HTTP_METHODS
+                            if isinstance(value.get(method), dict)]
+    for operation in operations:
+        for requirement in operation.get('security') or ():
+            if isinstance(requirement, dict):
+                result.update(('securitySchemes', name) for name in requirement)
+    return result
+
+
+class Projection:
+    """
+    A selection of the path items and components entries of a spec, written
+    as patterns like ``paths./pets*`` or ``components.schemas.Pet``, where
+    ``*``, ``?`` and ``[...]`` match as in shell wildcards. A projection of a
+    spec keeps every other top level field, the selected path items and
+    components entries, and every components entry these transitively
+    reference.
+
+    :raises ValueError: if a pattern does not start with ``paths`` or ``components``
+
+    Example:
+        >>> projection = Projection(['paths./pets*', 'components.schemas.Error'])
+        >>> projection.selects_path('/pets/{petId}')
+        True
+    """
+
+    def __init__(self, include):
+        self.paths = []
+        self.components = []
+        for pattern in include:
+            section, _, rest = pattern.partition('.')
+            if section == 'paths':
+                self.paths.append(rest or '*')
+            elif section == 'components':
+                kind, _, name = rest.partition('.')
+                self.components.append((kind or '*', name or '*'))
+            else:
+                raise ValueError('Unsupported projection {}, expected paths.<path> '
+                                 'or components.<section>.<name>'.format(pattern))
+
+    def selects_path(self, path):
+        return any(fnmatchcase(path, pattern) for pattern in self.paths)
+
+    def selects_component(self, section, name):
+        return any(fnmatchcase(section, kind) and fnmatchcase(name, pattern)
+                   for kind, pattern in self.components)
+
+    def apply(self, document):
+        """Returns the projection of a spec held in python builtin data types."""
+        result = {key: value for key, value in document.items()
+                  if key not in ('paths', 'components')}
+        result['paths'] = {path: item for path, item in (document.get('paths') or {}).items()
+                           if self.selects_path(path)}
+        components = document.get('components')
+        if components is None:
+            return result
+        entries = {(section, name): value
+                   for section, values in components.items() if isinstance(values, dict)
+                   for name, value in values.items()}
+        needed = self._closure(self._roots(result, entries),
+                               lambda key: component_refs(entries[key]), entries)
+        result['components'] = self._components(entries, needed, entries)
+        return result
+
+    def load(self, path):
+        """
+        Reads the projection of a spec file. Unselected path items are skipped
+        at the parser event level, and unselected components entries are only
+        scanned for their references, so neither is ever constructed. A second
+        read of the components is needed only if an entry references another
+        one appearing earlier in the file.
+
+        :returns dict: the projected document in python builtin data types
+        """
+        result = {}
+        loaded = {}
+        refs = {}
+        components = False
+        with open_document(path) as entries:
+            for key, value in entries:
+                if key == 'paths':
+                    result['paths'] = {item_path: item.read() for item_path, item in value.items()
+                                       if self.selects_path(item_path)}
+                elif key == 'components':
+                    components = True
+                    known = self._roots(result, loaded)
+                    for section, values in value.items():
+                        for name, entry in values.items():
+                            entry_key = (section, name)
+                            if entry_key in known or self.selects_component(section, name):
+                                loaded[entry_key] = entry.read()
+                                refs[entry_key] = component_refs(loaded[entry_key])
+                                known |= refs[entry_key]
+                            else:
+                                refs[entry_key] = _components_of(entry.refs())
+                else:
+                    result[key] = value.read()
+        result.setdefault('paths', {})
+        if not components:
+            return result
+        needed = self._closure(self._roots(result, refs), refs.__getitem__, refs)
+        missing = needed - set(loaded)
+        if missing:
+            with open_document(path) as entries:
+                for key, value in entries:
+                    if key != 'components':
+                        continue
+                    for section, values in value.items():
+                        for name, entry in values.items():
+                            if (section, name) in missing:
+                                loaded[section, name] = entry.read()
+                    break
+        result['components'] = self._components(refs, needed, loaded)
+        return result
+
+    def _roots(self, document, entries):
+        roots = {key for key in entries if self.selects_component(*key)}
+        roots |= _security_of(document)
+        for item in document.get('paths', {}).values():
+            roots |= component_refs(item)
+        return roots
+
+    def _closure(self, roots, refs_of, entries):
+        needed = set()
+        stack = [key for key in roots if key in entries]
+        while stack:
+            key = stack.pop()
+            if key in needed:
+                continue
+            needed.add(key)
+            stack.extend(other for other in refs_of(key) if other in entries)
+        return needed
+
+    def _components(self, order, needed, entries):
+        """Rebuilds the components object from the needed entries, in ``order``."""
+        result = {}
+        for section, name in order:
+            if (section, name) in needed:
+                result.setdefault(section, {})[name] = entries[section, name]
+        return result
+
+
+def load_projection(path, include):
+    """
+    Reads the projection of a spec file selected by ``include`` patterns,
+    see ``Projection``.
+
+    :returns dict: the projected document in python builtin data types
+    """
+    projection = Projection(include)
+    try:
+        return projection.load(path)
+    except _UndefinedAlias:
+        # an alias to an anchor within a skipped value, read the whole document
+        return projection.apply(parse_data(read_bytes(path), format_of(path)))
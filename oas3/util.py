@@ -5,6 +5,7 @@ Utility functions within the library.
 """
 
 from marshmallow.fields import Field
+from .base import BaseObject
 
 
 class RefOrSchema(Field):
@@ -16,3 +17,83 @@ class RefOrSchema(Field):
 
     def _deserialize(self, value, attr, data):
         print(value, attr, data)
+
+
+def slot_names(cls):
+    """Yields the public ``__slots__`` fields of an OAS3 object class and its bases."""
+    for klass in cls.__mro__:
+        for name in getattr(klass, '__slots__', ()):
+            if not name.startswith('_'):
+                yield name
+
+
+def to_builtin(value):
+    """
+    Recursively converts OAS3 objects, and any containers holding them, into
+    python builtin data types. Unlike ``BaseObject.to_dict`` nothing is
+    validated and the objects are left untouched.
+
+    :param value: An OAS3 object, or a dict, list or scalar possibly containing them
+    :returns: The same data made only of dicts, lists and scalars
+    """
+    if isinstance(value, BaseObject):
+        data, errors = value.Schema().dump(value)
+        return to_builtin(data)
+    if isinstance(value, dict):
+        return {key: to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_builtin(item) for item in value]
+    return value
+
+
+def escape_pointer_token(token):
+    """Escapes a single reference token for use in a JSON pointer (RFC 6901)."""
+    return str(token).replace('~', '~0').replace('/', '~1')
+
+
+def unescape_pointer_token(token):
+    """Reverses ``escape_pointer_token``."""
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def join_pointer(*tokens):
+    """
+    Builds a JSON pointer out of unescaped reference tokens.
+
+    Example:
+        >>> join_pointer('paths', '/pets', 'get')
+        '/paths/~1pets/get'
+    """
+    return ''.join('/' + escape_pointer_token(token) for token in tokens)
+
+
+def split_pointer(pointer):
+    """
+    Splits a JSON pointer, or a local ``$ref`` such as ``#/components/schemas/Pet``,
+    into its unescaped reference tokens.
+    """
+    if pointer.startswith('#'):
+        pointer = pointer[1:]
+    if not pointer:
+        return []
+    return [unescape_pointer_token(token) for token in pointer[1:].split('/')]
+
+
+def resolve_pointer(document, pointer):
+    """
+    Looks up the value a JSON pointer or local ``$ref`` points at.
+
+    :raises KeyError: if the pointer cannot be resolved within the document
+    """
+    value = document
+    for token in split_pointer(pointer):
+        if isinstance(value, list):
+            try:
+                value = value[int(token)]
+            except (ValueError, IndexError):
+                raise KeyError(pointer)
+        elif isinstance(value, dict) and token in value:
+            value = value[token]
+        else:
+            raise KeyError(pointer)
+    return value
@@ -0,0 +1,311 @@
+"""
+oas3.validation
+~~~~~~~~~~~~~~~
+Validates a spec unit by unit, where a unit is either a path item, a single
+components entry or everything else at the top level of the document.
+Results are reported as a mapping of JSON pointers to error messages.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from .hashing import digest
+from .index import field
+from .objects.components import (Schema, Response, Example, Parameter,
+                                 RequestBody, SecurityScheme, Link)
+from .objects.path import Path
+from .util import to_builtin, join_pointer, split_pointer, resolve_pointer
+
+ROOT = ''
+
+SECTION_ATTRIBUTES = {
+    'schemas': 'schemas',
+    'responses': 'responses',
+    'parameters': 'parameters',
+    'examples': 'examples',
+    'requestBodies': 'request_bodies',
+    'headers': 'headers',
+    'securitySchemes': 'security_schemes',
+    'links': 'links',
+    'callbacks': 'callbacks',
+}
+
+SECTION_SCHEMAS = {
+    'schemas': Schema.Schema,
+    'responses': Response.Schema,
+    'parameters': Parameter.Schema,
+    'examples': Example.Schema,
+    'requestBodies': RequestBody.Schema,
+    'securitySchemes': SecurityScheme.Schema,
+    'links': Link.Schema,
+}
+
+
+def flatten_errors(errors, pointer=ROOT, result=None):
+    """
+    Flattens nested marshmallow error messages into a mapping of JSON
+    pointers to lists of messages.
+    """
+    if result is None:
+        result = {}
+    if isinstance(errors, dict):
+        for key, value in errors.items():
+            flatten_errors(value, pointer + join_pointer(key), result)
+    elif isinstance(errors, (list, tuple)):
+        messages = [message for message in errors if not isinstance(message, (dict, list))]
+        if messages:
+            result.setdefault(pointer, []).extend(str(message) for message in messages)
+        for message in errors:
+            if isinstance(message, (dict, list)):
+                flatten_errors(message, pointer, result)
+    else:
+        result.setdefault(pointer, []).append(str(errors))
+    return result
+
+
+def unit_of(pointer):
+    """Returns the pointer of the unit a JSON pointer or local ``$ref`` belongs to."""
+    tokens = split_pointer(pointer)
+    if tokens[:1] == ['paths'] and len(tokens) >= 2:
+        return join_pointer(*tokens[:2])
+    if tokens[:1] == ['components'] and len(tokens) >= 3:
+        return join_pointer(*tokens[:3])
+    return ROOT
+
+
+def _components(spec):
+    components = spec.components
+    if components is None:
+        return {}
+    return {section: field(components, attribute, section) or {}
+            for section, attribute in SECTION_ATTRIBUTES.items()}
+
+
+def iter_units(spec):
+    """
+    Yields ``(pointer, value)`` for every unit of a spec. The root unit holds
+    the top level fields with the path items and the components entries left out.
+    """
+    yield ROOT, root_value(spec)
+    for path, item in sorted((spec.paths or {}).items()):
+        yield join_pointer('paths', path), item
+    for section, entries in sorted(_components(spec).items()):
+        for name in sorted(entries):
+            yield join_pointer('components', section, name), entries[name]
+
+
+def root_value(spec):
+    data = to_builtin(spec.Schema(exclude=('paths', 'components')).dump(spec).data)
+    if spec.paths is not None:
+        data['paths'] = {}
+    if spec.components is not None:
+        data['components'] = {section: {} for section, entries in _components(spec).items()
+                              if entries}
+    return data
+
+
+def iter_refs(value, pointer=ROOT):
+    """Yields ``(location, ref)`` for every ``$ref`` within raw data."""
+    stack = [(pointer, value)]
+    while stack:
+        pointer, value = stack.pop()
+        if isinstance(value, dict):
+            ref = value.get('$ref')
+            if isinstance(ref, str):
+                yield pointer + '/$ref', ref
+            stack.extend((pointer + join_pointer(key), item) for key, item in value.items())
+        elif isinstance(value, list):
+            stack.extend((pointer + join_pointer(index), item) for index, item in enumerate(value))
+
+
+def check_structure(pointer, value, spec_schema):
+    """
+    Validates the shape of a single unit with the marshmallow schema of the
+    object it holds.
+
+    :param spec_schema: The marshmallow schema class of the spec, used for the root unit
+    :returns dict: JSON pointers mapped to error messages
+    """
+    data = to_builtin(value)
+    tokens = split_pointer(pointer)
+    if pointer == ROOT:
+        return flatten_errors(spec_schema().validate(data))
+    if not isinstance(data, dict):
+        return {pointer: ['Not a valid mapping type.']}
+    if '$ref' in data:
+        return {}
+    if tokens[0] == 'paths':
+        return flatten_errors(Path.Schema().validate(data), pointer)
+    schema = SECTION_SCHEMAS.get(tokens[1])
+    if schema is None:
+        return {}
+    return flatten_errors(schema().validate(data), pointer)
+
+
+def check_unit(pointer, value, spec_schema):
+    """
+    Validates the shape of a unit and collects its references.
+
+    :returns tuple: the errors of ``check_structure`` and a mapping of the
+        locations of the ``$ref`` values in the unit to the references
+    """
+    data = to_builtin(value)
+    return check_structure(pointer, data, spec_schema), dict(iter_refs(data, pointer))
+
+
+def resolves(ref, units):
+    """
+    Determines if a reference resolves among a mapping of unit pointers to
+    unit values. References to other documents are not followed.
+    """
+    if not ref.startswith('#'):
+        return True
+    target = unit_of(ref)
+    if target not in units:
+        return False
+    remainder = split_pointer(ref)[len(split_pointer(target)):]
+    if not remainder:
+        return True
+    try:
+        resolve_pointer(to_builtin(units[target]), join_pointer(*remainder))
+    except KeyError:
+        return False
+    return True
+
+
+def check_refs(refs, units):
+    """
+    :param refs: Locations of ``$ref`` values mapped to the references
+    :returns dict: the locations of unresolved references mapped to error messages
+    """
+    return {location: ['Unresolved reference {}'.format(ref)]
+            for location, ref in refs.items() if not resolves(ref, units)}
+
+
+def _check_shard(spec_schema, shard):
+    return [check_unit(pointer, value, spec_schema) for pointer, value in shard]
+
+
+def _merge(result, errors):
+    for pointer, messages in errors.items():
+        result.setdefault(pointer, []).extend(messages)
+
+
+def validate_spec(spec, workers=None, shards_per_worker=4):
+    """
+    Validates every unit of a spec, optionally spreading the units over a
+    pool of processes. The result is the same whatever the number of workers.
+
+    :param workers: Number of processes to use, None or 1 validates in this process
+    :param shards_per_worker: Shards handed to each worker, more shards balance
+        uneven units better at the cost of more inter-process messages
+    :returns dict: JSON pointers mapped to error messages, empty if valid
+    """
+    units = dict(iter_units(spec))
+    items = sorted(units.items())
+    if workers is None or workers <= 1:
+        results = _check_shard(spec.Schema, items)
+    else:
+        count = min(len(items), workers * shards_per_worker)
+        size = -(-len(items) // count)
+        shards = [items[start:start + size] for start in range(0, len(items), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = [result for shard in pool.map(_check_shard, repeat(spec.Schema), shards)
+                       for result in shard]
+    errors = {}
+    for structure_errors, refs in results:
+        _merge(errors, structure_errors)
+        _merge(errors, check_refs(refs, units))
+    return {pointer: errors[pointer] for pointer in sorted(errors)}
+
+
+class _UnitState:
+    __slots__ = ('fingerprint', 'errors', 'refs', 'ref_errors')
+
+    def __init__(self, fingerprint, errors, refs):
+        self.fingerprint = fingerprint
+        self.errors = errors
+        self.refs = refs
+        self.ref_errors = {}
+
+
+class IncrementalValidator:
+    """
+    Validates a spec and, on later calls, re-checks only the units that
+    changed since the previous run plus the units whose ``$ref`` values point
+    into a changed unit. Results for every other unit are reused.
+
+    Changes are found by comparing content hashes of the units, or only
+    among the units given to ``validate(changed=...)`` when the caller knows
+    what it edited.
+
+    Example:
+        >>> validator = IncrementalValidator(spec)
+        >>> validator.validate()
+        {}
+        >>> spec.components.schemas['Pet']['required'] = 'id'
+        >>> validator.validate(changed=['/components/schemas/Pet'])
+        {'/components/schemas/Pet/required': ['Not a valid list.']}
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.checked = []
+        self._units = {}
+        self._dependents = {}
+
+    def validate(self, changed=None):
+        """
+        :param changed: Pointers within the units edited since the last run, or
+            None to detect the changes from content hashes
+        :returns dict: JSON pointers mapped to error messages, empty if valid
+        """
+        units = dict(iter_units(self.spec))
+        if changed is None or not self._units:
+            candidates = set(units) | set(self._units)
+        else:
+            candidates = {unit_of(pointer) for pointer in changed}
+            candidates.add(ROOT)
+            candidates |= set(units).symmetric_difference(self._units)
+        modified = set()
+        self.checked = []
+        for pointer in sorted(candidates):
+            if pointer not in units:
+                if self._units.pop(pointer, None) is not None:
+                    modified.add(pointer)
+                continue
+            fingerprint = digest(units[pointer])
+            state = self._units.get(pointer)
+            if state is not None and state.fingerprint == fingerprint:
+                continue
+            self._check(pointer, units[pointer], fingerprint)
+            modified.add(pointer)
+        stale = set(modified)
+        for pointer in modified:
+            stale |= self._dependents.get(pointer, set())
+        stale &= set(self._units)
+        for pointer in sorted(stale):
+            self._check_refs(pointer, units)
+        return self.errors()
+
+    def errors(self):
+        """Returns the errors found by the last run."""
+        result = {}
+        for unit in sorted(self._units):
+            _merge(result, self._units[unit].errors)
+            _merge(result, self._units[unit].ref_errors)
+        return {pointer: result[pointer] for pointer in sorted(result)}
+
+    def _check(self, pointer, value, fingerprint):
+        self.checked.append(pointer)
+        old = self._units.get(pointer)
+        if old is not None:
+            for ref in old.refs.values():
+                self._dependents.get(unit_of(ref), set()).discard(pointer)
+        errors, refs = check_unit(pointer, value, self.spec.Schema)
+        self._units[pointer] = _UnitState(fingerprint, errors, refs)
+        for ref in refs.values():
+            self._dependents.setdefault(unit_of(ref), set()).add(pointer)
+
+    def _check_refs(self, pointer, units):
+        state = self._units[pointer]
+        state.ref_errors = check_refs(state.refs, units)
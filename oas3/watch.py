@@ -0,0 +1,172 @@
+"""
+oas3.watch
+~~~~~~~~~~
+Reloads a spec whenever one of its files changes.
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+from . import Spec
+from .hashing import digest
+from .payload import ResponseValidator
+from .refs import FileReader, bundle
+from .validation import iter_units
+
+logger = logging.getLogger(__name__)
+
+WatchedSpec = namedtuple('WatchedSpec', ['spec', 'validator', 'generation'])
+
+
+class SpecWatcher:
+    """
+    Watches the files of a single or multi-file spec by polling their
+    modification times, and reloads the spec once changes have settled for
+    ``debounce`` seconds. Only the files that changed are parsed again, and
+    compiled response validators are only rebuilt for the operations
+    affected by the change.
+
+    Each version is published as a ``WatchedSpec(spec, validator, generation)``
+    in ``watcher.current`` with a single reference assignment, so a request
+    handler that reads ``watcher.current`` once keeps a consistent snapshot
+    for as long as it needs, even while a reload happens. If a new
+    version fails to load the previous one is kept and the error is
+    available in ``last_error``.
+
+    :param path: Path of the root document of the spec
+    :param cls: The OAS3 object class to load the spec as
+    :param interval: Seconds between two checks of the files
+    :param debounce: Seconds without further changes to wait before reloading
+    :param validators: If True a ``ResponseValidator`` is maintained alongside the spec
+
+    Example:
+        >>> with SpecWatcher('./spec/openapi.yaml', validators=True) as watcher:
+        ...     spec, validator, generation = watcher.current
+    """
+
+    def __init__(self, path, cls=Spec, interval=1.0, debounce=0.25, validators=False):
+        self.path = path
+        self.cls = cls
+        self.interval = interval
+        self.debounce = debounce
+        self.reader = FileReader()
+        self.last_error = None
+        self._listeners = []
+        self._stamps = {}
+        self._digests = {}
+        self._pending = None
+        self._stopped = threading.Event()
+        self._thread = None
+        self.current = None
+        self._validators = validators
+        self.reload()
+        if self.last_error is not None:
+            raise self.last_error
+
+    @property
+    def spec(self):
+        """The current version of the spec."""
+        return self.current.spec
+
+    @property
+    def validator(self):
+        """The ``ResponseValidator`` of the current version, if ``validators`` is enabled."""
+        return self.current.validator
+
+    def subscribe(self, listener):
+        """
+        Registers ``listener(spec, changed)`` to be called after every reload
+        with the new spec and the pointers of the units that changed.
+        """
+        self._listeners.append(listener)
+
+    def start(self):
+        """Starts polling on a background thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name='oas3-watcher')
+            self._thread.daemon = True
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def poll(self):
+        """
+        Checks the files once, reloading if they changed and have settled.
+
+        :returns bool: True if a new version of the spec was published
+        """
+        stamps = self._current_stamps()
+        if stamps == self._stamps:
+            self._pending = None
+            return False
+        now = time.monotonic()
+        if self._pending is None or self._pending[1] != stamps:
+            self._pending = (now, stamps)
+            return False
+        if now - self._pending[0] < self.debounce:
+            return False
+        return self.reload()
+
+    def reload(self):
+        """
+        Loads the spec again, publishing it if it loaded successfully.
+
+        :returns bool: True if a new version of the spec was published
+        """
+        self._pending = None
+        try:
+            document, files = bundle(self.path, self.reader)
+            spec = self.cls.from_dict(document)
+        except Exception as e:
+            logger.warning('Failed to reload spec %s: %s', self.path, e)
+            self.last_error = e
+            self._stamps = self._current_stamps()
+            return False
+        digests = {pointer: digest(value) for pointer, value in iter_units(spec)}
+        changed = sorted(pointer for pointer in set(digests) | set(self._digests)
+                         if digests.get(pointer) != self._digests.get(pointer))
+        validator = None
+        if self._validators:
+            if self.current is None:
+                validator = ResponseValidator(spec)
+            else:
+                validator = self.current.validator.evolve(spec, changed)
+        self._stamps = self._stamps_of(files)
+        self._digests = digests
+        self.last_error = None
+        self.current = WatchedSpec(spec, validator, self.current.generation + 1 if self.current else 1)
+        for listener in self._listeners:
+            listener(spec, changed)
+        return True
+
+    def _stamps_of(self, files):
+        stamps = {}
+        for path in files:
+            try:
+                stamps[path] = self.reader.stamp(path)
+            except OSError:
+                stamps[path] = None
+        return stamps
+
+    def _current_stamps(self):
+        return self._stamps_of(self._stamps or [self.path])
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception('Failed to poll spec %s', self.path)
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from oas3 import Spec, LoadingError
+from oas3.aio import AsyncLoader
+
+SAMPLES = os.path.join(os.path.dirname(__file__), 'samples', 'valid')
+
+
+class SampleHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = os.path.join(SAMPLES, os.path.basename(self.path))
+        if not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as file_ref:
+            body = file_ref.read()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    server = HTTPServer(('127.0.0.1', 0), SampleHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, 'http://127.0.0.1:{}/'.format(server.server_port)
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_from_file_async():
+    spec = run(Spec.from_file_async('./tests/samples/valid/petstore.yaml'))
+    assert spec.info.title == 'Swagger Petstore'
+
+
+def test_from_url_async():
+    server, base = serve()
+    loader = AsyncLoader(concurrency=2, timeout=5, retries=0)
+    try:
+        names = ['petstore.yaml', 'uspto.yaml', 'link-example.yaml', 'missing.yaml']
+        results = run(loader.load_all(Spec, [base + name for name in names] +
+                                      ['./tests/samples/valid/petstore.yaml']))
+        assert results[0].info.title == 'Swagger Petstore'
+        assert results[1].info.title == 'USPTO Data Set API'
+        assert isinstance(results[3], LoadingError)
+        assert results[4].info.title == 'Swagger Petstore'
+        spec = run(Spec.from_url_async(base + 'petstore.yaml', format_type='yaml', loader=loader))
+        assert spec.info.version == '1.0.0'
+    finally:
+        loader.close()
+        server.shutdown()
@@ -1,4 +1,4 @@
-from oas3 import Spec, Path, Info, Components, Schema
+from oas3 import Spec, Path, Info, Components, Schema, ValidationError
 
 
 def test_import():
@@ -205,3 +205,65 @@ def test_spec_conversions():
     spec = Spec.from_dict(spec.to_dict())
     spec = Spec.from_json(spec.to_json())
     spec = Spec.from_yaml(spec.to_yaml())
+
+
+def test_operation_index():
+    spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    path, method, operation = spec.operation('showPetById')
+    assert (path, method) == ('/pets/{petId}', 'get')
+    assert operation['summary'] == 'Info for a specific pet'
+    assert len(spec.operations_by_tag('pets')) == 3
+    assert [ref.path for ref in spec.operations_by_method('POST')] == ['/pets']
+    spec.paths['/owners'] = {'get': {'operationId': 'listOwners', 'tags': ['owners'],
+                                     'responses': {'200': {'description': 'ok'}}}}
+    assert spec.operation('listOwners').path == '/owners'
+    spec.paths['/owners']['get']['operationId'] = 'listPets'
+    spec.invalidate()
+    try:
+        spec.operation('listPets')
+    except ValidationError as e:
+        assert 'GET /owners' in str(e)
+    else:
+        raise AssertionError('Duplicate operationId was not detected')
+
+
+def test_operation_index_objects():
+    paths = {'/pets': Path.from_docstring(pets)}
+    spec = Spec(info=Info.from_docstring(SpecInfo), openapi='3.0.0', paths=paths)
+    assert spec.operation('listPets').operation.summary == 'List all pets'
+    assert spec.operations_by_tag('cats') == []
+
+
+def test_objects_have_no_instance_dict():
+    spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    for obj in (spec, spec.info, spec.components, Path(), Schema()):
+        assert not hasattr(obj, '__dict__')
+    spec.openapi = '3.0.1'
+    try:
+        spec.undeclared = True
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError('Undeclared attribute was set')
+
+
+def test_content_digest():
+    from oas3.hashing import diff_pointers, merkle
+    first = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    second = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    assert first is not second
+    assert first != second
+    assert first.content_digest() == second.content_digest()
+    assert first.info.content_digest() == second.info.content_digest()
+    assert first.content_digest() != Spec.from_file('./tests/samples/valid/uspto.yaml').content_digest()
+
+    second.info.title = 'Changed'
+    assert diff_pointers(first, second) == ['/info/title']
+    second.paths['/pets']['get']['summary'] = 'Changed too'
+    assert diff_pointers(first, second) == ['/info/title', '/paths/~1pets/get/summary']
+
+    frozen = first.freeze()
+    assert merkle(frozen) is merkle(frozen)
+    edited = frozen.evolve('/info/title', 'Changed')
+    assert merkle(edited).children['paths'] is merkle(frozen).children['paths']
+    assert merkle(edited).digest != merkle(frozen).digest
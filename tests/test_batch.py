@@ -0,0 +1,23 @@
+import glob
+from oas3 import Spec
+from oas3.snapshot import Snapshot
+from oas3.util import to_builtin
+
+
+def test_load_many():
+    paths = sorted(glob.glob('./tests/samples/valid/*.yaml')) + ['./tests/samples/missing.yaml']
+    results = {result.path: result for result in Spec.load_many(paths, workers=2)}
+    assert sorted(results) == sorted(paths)
+    assert isinstance(results['./tests/samples/missing.yaml'].error, IOError)
+    petstore = results['./tests/samples/valid/petstore.yaml']
+    assert petstore.error is None
+    assert petstore.value.info.title == 'Swagger Petstore'
+
+
+def test_load_many_snapshots():
+    path = './tests/samples/valid/petstore.yaml'
+    [result] = list(Spec.load_many([path], workers=1, snapshot=True))
+    assert isinstance(result.value, Snapshot)
+    spec = Spec.from_file(path)
+    assert result.value.to_dict() == to_builtin(spec)
+    assert result.value.load().to_dict() == spec.to_dict()
@@ -0,0 +1,110 @@
+import copy
+import json
+import yaml
+from oas3 import Spec
+
+
+def load(path):
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def test_identical_specs():
+    first = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    second = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    diff = first.diff(second)
+    assert not diff
+    assert diff.breaking == []
+
+
+def test_breaking_changes():
+    data = load('./tests/samples/valid/petstore.yaml')
+    changed = copy.deepcopy(data)
+    pets = changed['paths']['/pets']
+    pets['get']['parameters'].append({'name': 'owner', 'in': 'query', 'required': True,
+                                      'schema': {'type': 'string'}})
+    pets['get']['parameters'][0]['description'] = 'How many items'
+    del pets['post']
+    changed['paths']['/animals/{petId}'] = changed['paths'].pop('/pets/{petId}')
+    changed['components']['schemas']['Pet']['properties']['tag']['enum'] = ['cat', 'dog']
+    del changed['components']['schemas']['Error']['properties']['message']
+    changed['components']['schemas']['Toy'] = {'type': 'object'}
+
+    diff = Spec.from_dict(data).diff(Spec.from_dict(changed))
+    kinds = {(change.kind, change.pointer) for change in diff.breaking}
+    assert kinds == {
+        ('required-parameter-added', '/paths/~1pets/get/parameters/1'),
+        ('operation-removed', '/paths/~1pets/post'),
+        ('operation-moved', '/paths/~1animals~1{petId}/get'),
+        ('enum-narrowed', '/components/schemas/Pet/properties/tag/enum'),
+        ('property-removed', '/components/schemas/Error/properties/message'),
+    }
+    kinds = {(change.kind, change.pointer) for change in diff.non_breaking}
+    assert kinds == {
+        ('documentation-changed', '/paths/~1pets/get/parameters/0/description'),
+        ('component-added', '/components/schemas/Toy'),
+    }
+
+
+def test_schema_direction():
+    def spec(request, response):
+        body = {'content': {'application/json': {'schema': request}}}
+        return Spec.from_dict({
+            'openapi': '3.0.0',
+            'info': {'title': 'Directions', 'version': '1'},
+            'paths': {'/a': {'post': {
+                'requestBody': body,
+                'responses': {'200': {'description': 'ok',
+                                      'content': {'application/json': {'schema': response}}}},
+            }}},
+        })
+
+    old = spec({'type': 'string', 'enum': ['a', 'b']}, {'type': 'string', 'enum': ['a', 'b']})
+    new = spec({'type': 'string', 'enum': ['a', 'b', 'c']}, {'type': 'string', 'enum': ['a']})
+    diff = old.diff(new)
+    assert len(diff) == 2
+    assert not diff.is_breaking()
+    diff = new.diff(old)
+    assert [change.kind for change in diff.breaking] == ['enum-narrowed', 'enum-widened']
+
+
+def test_status_codes_as_strings():
+    data = load('./tests/samples/valid/petstore.yaml')
+    responses = data['paths']['/pets']['get']['responses']
+    responses[200] = responses.pop('200')
+    converted = json.loads(json.dumps(data))
+    assert not Spec.from_dict(data).diff(Spec.from_dict(converted))
+
+
+def test_frozen_specs():
+    from oas3.diff import diff_specs
+    frozen = Spec.from_file('./tests/samples/valid/petstore.yaml').freeze()
+    edited = frozen.evolve('/paths/~1pets/get/parameters/0/required', True)
+    diff = diff_specs(frozen, edited)
+    assert [change.kind for change in diff.breaking] == ['parameter-required']
+
+
+def test_extensions_and_documentation():
+    data = load('./tests/samples/valid/petstore.yaml')
+    changed = copy.deepcopy(data)
+    operation = changed['paths']['/pets']['get']
+    operation['x-rate-limit'] = 10
+    operation['operationId'] = 'listAllPets'
+    operation['summary'] = 'List every pet'
+    changed['components']['schemas']['Pet']['x-internal'] = True
+    changed['components']['schemas']['Pet']['example'] = {'id': 1, 'name': 'Rex'}
+
+    diff = Spec.from_dict(data).diff(Spec.from_dict(changed))
+    assert diff.breaking == []
+    kinds = {(change.kind, change.pointer) for change in diff}
+    assert kinds == {
+        ('extension-changed', '/paths/~1pets/get/x-rate-limit'),
+        ('changed', '/paths/~1pets/get/operationId'),
+        ('documentation-changed', '/paths/~1pets/get/summary'),
+        ('extension-changed', '/components/schemas/Pet/x-internal'),
+        ('documentation-changed', '/components/schemas/Pet/example'),
+    }
+
+    changed['paths']['/pets']['get']['security'] = [{'api_key': []}]
+    diff = Spec.from_dict(data).diff(Spec.from_dict(changed))
+    assert [change.pointer for change in diff.breaking] == ['/paths/~1pets/get/security']
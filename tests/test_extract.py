@@ -0,0 +1,46 @@
+from oas3 import Spec
+from oas3.util import to_builtin
+
+
+def body(schema):
+    return {'content': {'application/json': {'schema': schema}}}
+
+
+def test_extract_schemas():
+    address = {'type': 'object', 'properties': {'street': {'type': 'string'}}}
+    user = {'type': 'object', 'properties': {'name': {'type': 'string'},
+                                             'address': dict(address)}}
+    spec = Spec.from_dict({
+        'openapi': '3.0.0',
+        'info': {'title': 'Extract', 'version': '1'},
+        'paths': {
+            '/users': {'post': {'requestBody': body(dict(user)),
+                                'responses': {'200': dict(body(dict(user)), description='ok')}}},
+            '/addresses': {'get': {'responses': {'200': dict(body(dict(address)),
+                                                             description='ok')}}},
+            '/pets': {'get': {'responses': {'200': dict(body({'$ref': '#/components/schemas/Pet'}),
+                                                        description='ok')}}},
+            '/toys': {'get': {'responses': {'200': dict(body({'type': 'object', 'properties': {
+                'id': {'type': 'integer'}}}), description='ok')}}},
+        },
+        'components': {'schemas': {
+            'Pet': {'type': 'object', 'properties': {'id': {'type': 'integer'}}},
+        }},
+    })
+    added, replaced = spec.extract_schemas()
+    assert len(added) == 2
+    assert replaced == 5
+    data = to_builtin(spec)
+    schemas = data['components']['schemas']
+    user_ref = data['paths']['/users']['post']['requestBody']['content']['application/json']['schema']
+    name = user_ref['$ref'].split('/')[-1]
+    assert schemas[name]['properties']['name'] == {'type': 'string'}
+    address_ref = schemas[name]['properties']['address']
+    assert address_ref == data['paths']['/addresses']['get']['responses']['200']['content'][
+        'application/json']['schema']
+    assert data['paths']['/toys']['get']['responses']['200']['content']['application/json'][
+        'schema'] == {'$ref': '#/components/schemas/Pet'}
+    assert spec.validate() == {}
+
+    again = Spec.from_dict(data)
+    assert again.extract_schemas() == ([], 0)
@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+from oas3 import Spec
+from oas3.files import detect_encoding, read_bytes, read_text
+from oas3.util import to_builtin
+
+
+def test_detect_encoding():
+    document = '{"openapi": "3.0.0"}'
+    for encoding in ('utf-8', 'utf-16-le', 'utf-16-be', 'utf-32-le', 'utf-32-be'):
+        assert detect_encoding(document.encode(encoding)) == encoding
+    assert detect_encoding(document.encode('utf-8-sig')) == 'utf-8-sig'
+    assert detect_encoding(document.encode('utf-16')) == 'utf-16'
+    assert detect_encoding(b'{') == 'utf-8'
+
+
+def test_from_file_encodings():
+    with open('./tests/samples/valid/petstore.yaml') as file_ref:
+        data = json.dumps(Spec.from_yaml(file_ref.read()).to_dict(), ensure_ascii=False)
+    data = data.replace('Swagger Petstore', 'Swagger Petstore é')
+    for encoding in ('utf-8', 'utf-16-le', 'utf-32-be', 'utf-8-sig'):
+        handle, path = tempfile.mkstemp(suffix='.json')
+        try:
+            with os.fdopen(handle, 'wb') as file_ref:
+                file_ref.write(data.encode(encoding))
+            assert read_text(path) == data
+            assert Spec.from_file(path).info.title == 'Swagger Petstore é'
+        finally:
+            os.remove(path)
+
+    # YAML is decoded before parsing, JSON parsed from the bytes directly
+    with open('./tests/samples/valid/petstore.yaml', encoding='utf-8') as file_ref:
+        text = file_ref.read().replace('Swagger Petstore', 'Swagger Petstore é')
+    handle, path = tempfile.mkstemp(suffix='.yaml')
+    try:
+        with os.fdopen(handle, 'wb') as file_ref:
+            file_ref.write(text.encode('utf-16'))
+        assert read_bytes(path) == text.encode('utf-16')
+        assert Spec.from_file(path).info.title == 'Swagger Petstore é'
+    finally:
+        os.remove(path)
+
+
+def test_from_file_compressed():
+    import bz2
+    import gzip
+    import lzma
+    with open('./tests/samples/valid/petstore.yaml', 'rb') as file_ref:
+        data = file_ref.read()
+    expected = Spec.from_file('./tests/samples/valid/petstore.yaml').to_dict()
+    directory = tempfile.mkdtemp()
+    for module, suffix in ((gzip, '.gz'), (bz2, '.bz2'), (lzma, '.xz')):
+        path = os.path.join(directory, 'petstore.yaml' + suffix)
+        with module.open(path, 'wb') as file_ref:
+            file_ref.write(data)
+        assert Spec.from_file(path).to_dict() == expected
+        os.remove(path)
+    os.rmdir(directory)
+
+
+MULTI_FILE = {
+    'api/openapi.yaml': (
+        'openapi: 3.0.0\n'
+        'info: {title: Archived, version: 1.0.0}\n'
+        'paths:\n'
+        '  /pets:\n'
+        '    get:\n'
+        '      responses:\n'
+        '        "200": {$ref: "responses.yaml#/Pets"}\n'),
+    'api/responses.yaml': (
+        'Pets:\n'
+        '  description: A list of pets\n'
+        '  content:\n'
+        '    application/json:\n'
+        '      schema: {$ref: "schemas/pet.json"}\n'),
+    'api/schemas/pet.json': '{"type": "object", "required": ["id"]}',
+}
+
+
+def _check_archived(spec):
+    response = to_builtin(spec)['paths']['/pets']['get']['responses']['200']
+    assert spec.info.title == 'Archived'
+    assert response['content']['application/json']['schema']['required'] == ['id']
+
+
+def test_from_file_archives():
+    import io
+    import tarfile
+    import zipfile
+    from oas3 import LoadingError
+    directory = tempfile.mkdtemp()
+    zip_path = os.path.join(directory, 'spec.zip')
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, text in MULTI_FILE.items():
+            archive.writestr(name, text)
+    tar_path = os.path.join(directory, 'spec.tar.gz')
+    with tarfile.open(tar_path, 'w:gz') as archive:
+        for name, text in MULTI_FILE.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(text.encode('utf-8'))
+            archive.addfile(info, io.BytesIO(text.encode('utf-8')))
+    try:
+        _check_archived(Spec.from_file(zip_path))
+        _check_archived(Spec.from_file(tar_path, member='api/openapi.yaml'))
+        try:
+            Spec.from_file(zip_path, member='api/missing.yaml')
+            assert False
+        except LoadingError:
+            pass
+    finally:
+        os.remove(zip_path)
+        os.remove(tar_path)
+        os.rmdir(directory)
+
+
+def test_peek():
+    openapi, info = Spec.peek('./tests/samples/valid/petstore.yaml')
+    assert openapi == '3.0.0'
+    assert (info.title, info.version) == ('Swagger Petstore', '1.0.0')
+
+    handle, path = tempfile.mkstemp(suffix='.json')
+    with os.fdopen(handle, 'w') as file_ref:
+        file_ref.write('{\n\t"x-first": {"a": [1, {"b": 2}]},\n\t"openapi": "3.0.1",\n'
+                       '\t"info": {"title": "Peeked", "version": "2.0"},\n\t"paths": {')
+    try:
+        # the truncated remainder of the document is never parsed
+        openapi, info = Spec.peek(path)
+        assert (openapi, info.title) == ('3.0.1', 'Peeked')
+    finally:
+        os.remove(path)
+
+
+def test_from_file_include():
+    spec = Spec.from_file('./tests/samples/valid/petstore.yaml', include=['paths./pets/*'])
+    assert list(spec.paths) == ['/pets/{petId}']
+    assert sorted(spec.components.schemas) == ['Error', 'Pet', 'Pets']
+
+    spec = Spec.from_file('./tests/samples/valid/petstore.yaml',
+                          include=['components.schemas.Err*'])
+    assert spec.paths == {}
+    assert list(spec.components.schemas) == ['Error']
+    assert spec.info.title == 'Swagger Petstore'
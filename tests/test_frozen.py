@@ -0,0 +1,43 @@
+import pickle
+from oas3 import Spec, FrozenSpec
+
+
+def test_freeze():
+    spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    frozen = spec.freeze()
+    assert isinstance(frozen, FrozenSpec)
+    assert frozen == Spec.from_file('./tests/samples/valid/petstore.yaml').freeze()
+    assert len({frozen, spec.freeze()}) == 1
+    assert frozen.get_in('/paths/~1pets/get/parameters/0/name') == 'limit'
+    assert isinstance(frozen['paths']['/pets']['get']['parameters'], tuple)
+    try:
+        frozen.paths = {}
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError('Frozen spec was modified')
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert frozen.to_spec().validate() == {}
+
+
+def test_evolve():
+    frozen = Spec.from_file('./tests/samples/valid/petstore.yaml').freeze()
+    edited = frozen.evolve('/paths/~1pets/get/summary', 'List pets')
+    assert isinstance(edited, FrozenSpec)
+    assert edited.get_in('/paths/~1pets/get/summary') == 'List pets'
+    assert frozen.get_in('/paths/~1pets/get/summary') == 'List all pets'
+    assert edited['components'] is frozen['components']
+    assert edited['paths']['/pets/{petId}'] is frozen['paths']['/pets/{petId}']
+    assert edited['paths']['/pets']['post'] is frozen['paths']['/pets']['post']
+    assert edited != frozen
+
+    removed = edited.remove('/paths/~1pets/get/parameters/0')
+    assert removed['paths']['/pets']['get']['parameters'] == ()
+    assert removed.evolve('/paths/~1pets/get/parameters/-', {'name': 'limit'}).get_in(
+        '/paths/~1pets/get/parameters/0') == {'name': 'limit'}
+    try:
+        frozen.evolve('/paths/~1missing/get', {})
+    except KeyError:
+        pass
+    else:
+        raise AssertionError('Missing parent was not reported')
@@ -0,0 +1,38 @@
+from oas3 import Spec
+from oas3.graph import DependencyGraph
+
+
+def test_dependents():
+    spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    graph = spec.dependency_graph()
+    assert graph.dependents('/components/schemas/Pet', transitive=False) == ['/components/schemas/Pets']
+    dependents = graph.dependents('/components/schemas/Pet')
+    assert '/paths/~1pets/get' in dependents
+    assert '/paths/~1pets~1{petId}/get/responses/200' in dependents
+    assert '/paths/~1pets/post' not in dependents
+    assert graph.dependencies('/paths/~1pets/post', transitive=False) == [
+        '/paths/~1pets/post/responses/201', '/paths/~1pets/post/responses/default']
+    assert spec.dependency_graph() is graph
+
+
+def test_cycles_and_unresolved_refs():
+    spec = Spec.from_dict({
+        'openapi': '3.0.0',
+        'info': {'title': 'Cycles', 'version': '1'},
+        'security': [{'key': []}],
+        'paths': {'/a': {'get': {'parameters': [{'$ref': '#/components/parameters/Limit'}],
+                                 'responses': {'200': {'$ref': '#/components/responses/Missing'}}}}},
+        'components': {
+            'parameters': {'Limit': {'name': 'limit', 'in': 'query', 'schema': {'$ref': '#/components/schemas/A'}}},
+            'schemas': {'A': {'properties': {'b': {'$ref': '#/components/schemas/B'}}},
+                        'B': {'items': {'$ref': '#/components/schemas/A'}}},
+            'securitySchemes': {'key': {'type': 'apiKey', 'name': 'key', 'in': 'header'}},
+        },
+    })
+    graph = DependencyGraph(spec)
+    assert graph.dependents('/components/schemas/A') == [
+        '', '/components/parameters/Limit', '/components/schemas/B',
+        '/paths/~1a', '/paths/~1a/get', '/paths/~1a/get/parameters/0']
+    assert '/components/schemas/A' in graph.dependencies('/components/schemas/B')
+    assert '/components/securitySchemes/key' in graph.dependencies('', transitive=False)
+    assert graph.unresolved == [('/paths/~1a/get/responses/200', '#/components/responses/Missing')]
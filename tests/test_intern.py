@@ -0,0 +1,38 @@
+import glob
+from oas3 import Spec
+from oas3.intern import Interner
+from oas3.util import to_builtin
+
+
+def test_interner_values():
+    interner = Interner(max_length=10, leaves=True)
+    first = interner.intern({'type': ''.join(['str', 'ing']), 'long': 'x' * 11})
+    second = interner.intern({'type': ''.join(['str', 'ing']), 'long': 'x' * 11})
+    assert first == second
+    assert first is second
+    third = interner.intern({'a': 1, 'b': [{'c': True}, {'c': 1}]})
+    assert third['b'][0] is not third['b'][1]
+    assert interner.stats()['hits'] == 2
+    assert interner.saved > 0
+
+
+def test_interner_copies_leaves():
+    interner = Interner()
+    first = interner.intern({'a': {'type': 'string'}, 'b': {'type': 'string'}})
+    assert first['a'] == first['b']
+    assert first['a'] is not first['b']
+    first['a']['format'] = 'uuid'
+    assert first['b'] == {'type': 'string'}
+
+
+def test_from_file_interner():
+    interner = Interner()
+    paths = sorted(glob.glob('./tests/samples/valid/*.yaml'))
+    for path in paths:
+        assert to_builtin(Spec.from_file(path, interner=interner)) == \
+            to_builtin(Spec.from_file(path))
+    saved = interner.saved
+    spec = Spec.from_file(paths[0], interner=interner)
+    assert interner.saved > saved
+    [result] = Spec.load_many(paths[:1], workers=1, interner=interner)
+    assert to_builtin(result.value) == to_builtin(spec)
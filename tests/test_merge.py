@@ -0,0 +1,100 @@
+from oas3 import Spec, ValidationError
+from oas3.merge import SpecMerger
+from oas3.util import to_builtin
+
+
+def partial(path, schema, name='Item', tag='items'):
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Partial {}'.format(path), 'version': '1'},
+        'tags': [{'name': tag}],
+        'servers': [{'url': 'https://api.example.com'}],
+        'paths': {path: {'get': {'tags': [tag], 'responses': {'200': {
+            'description': 'ok',
+            'content': {'application/json': {'schema': {'$ref': '#/components/schemas/' + name}}},
+        }}}}},
+        'components': {'schemas': {name: schema}},
+    }
+
+
+def test_merge_dedupes_equal_components():
+    spec = Spec.merge(partial('/a', {'type': 'string'}),
+                      partial('/b', {'type': 'string'}, name='Other', tag='other'))
+    data = to_builtin(spec)
+    assert data['info']['title'] == 'Partial /a'
+    assert sorted(data['paths']) == ['/a', '/b']
+    assert list(data['components']['schemas']) == ['Item']
+    assert data['paths']['/b']['get']['responses']['200']['content']['application/json'][
+        'schema'] == {'$ref': '#/components/schemas/Item'}
+    assert [tag['name'] for tag in data['tags']] == ['items', 'other']
+    assert len(data['servers']) == 1
+    assert spec.validate() == {}
+
+
+def test_merge_policies():
+    left = partial('/a', {'type': 'string'})
+    right = partial('/b', {'type': 'integer'})
+    try:
+        Spec.merge(left, right)
+    except ValidationError as e:
+        assert '/components/schemas/Item' in str(e)
+    else:
+        raise AssertionError('Conflict was not reported')
+
+    data = to_builtin(Spec.merge(left, right, policy='prefer-left'))
+    assert data['components']['schemas'] == {'Item': {'type': 'string'}}
+
+    merger = SpecMerger(policy='rename').add(left).add(right)
+    data = merger.to_dict()
+    names = sorted(data['components']['schemas'])
+    assert names[0] == 'Item' and names[1].startswith('Item_')
+    assert data['paths']['/b']['get']['responses']['200']['content']['application/json'][
+        'schema'] == {'$ref': '#/components/schemas/' + names[1]}
+    merger.add(partial('/c', {'type': 'integer'}))
+    assert sorted(merger.to_dict()['components']['schemas']) == names
+    assert merger.spec().validate() == {}
+
+    try:
+        merger.add(partial('/a', {'type': 'string'}, tag='changed'))
+    except ValidationError as e:
+        assert '/paths/~1a/get' in str(e)
+    else:
+        raise AssertionError('Conflict was not reported')
+
+
+def nested(path, sub):
+    data = partial(path, {'properties': {'sub': {'$ref': '#/components/schemas/Sub'}}})
+    data['components']['schemas']['Sub'] = sub
+    return data
+
+
+def test_merge_renames_dependents():
+    merger = SpecMerger(policy='rename')
+    merger.add(nested('/a', {'type': 'string'})).add(nested('/b', {'type': 'integer'}))
+    data = merger.to_dict()
+    schemas = data['components']['schemas']
+    ref = data['paths']['/b']['get']['responses']['200']['content']['application/json'][
+        'schema']['$ref'].split('/')[-1]
+    assert ref != 'Item'
+    sub = schemas[ref]['properties']['sub']['$ref'].split('/')[-1]
+    assert schemas[sub] == {'type': 'integer'}
+    assert len(schemas) == 4
+
+
+def test_merge_is_atomic():
+    merger = SpecMerger()
+    merger.add(partial('/a', {'type': 'string'}))
+    conflicting = partial('/a', {'type': 'string'}, tag='changed')
+    conflicting['components']['schemas']['B'] = {'type': 'boolean'}
+    before = merger.to_dict()
+    try:
+        merger.add(conflicting)
+    except ValidationError:
+        pass
+    else:
+        raise AssertionError('Conflict was not reported')
+    assert merger.to_dict() == before
+    assert merger.count == 1
+    other = partial('/c', {'type': 'boolean'}, name='C')
+    merger.add(other)
+    assert merger.to_dict()['components']['schemas']['C'] == {'type': 'boolean'}
@@ -0,0 +1,200 @@
+import json
+from oas3 import Spec, ValidationError
+from oas3.cache import LRUCache
+from oas3.intern import Interner
+from oas3.payload import ResponseValidator, SchemaCompiler, ValidationCache, PayloadError
+from oas3.shadow import ShadowValidator
+from oas3.shapes import SchemaTable
+
+
+def petstore():
+    return Spec.from_file('./tests/samples/valid/petstore.yaml')
+
+
+def test_compile_schema():
+    validate = SchemaCompiler().compile({
+        'type': 'object',
+        'required': ['id'],
+        'properties': {'id': {'type': 'integer', 'minimum': 1},
+                       'tags': {'type': 'array', 'items': {'type': 'string'}}},
+    })
+    assert validate({'id': 3, 'tags': ['a']}) == []
+    errors = validate({'id': 0, 'tags': ['a', 2]})
+    assert [error.pointer for error in errors] == ['/id', '/tags/1']
+    assert [error.pointer for error in validate({})] == ['/id']
+
+
+def test_recursive_refs():
+    document = {'components': {'schemas': {'Node': {
+        'type': 'object',
+        'properties': {'children': {'type': 'array',
+                                    'items': {'$ref': '#/components/schemas/Node'}}}}}}}
+    validate = SchemaCompiler(document).compile({'$ref': '#/components/schemas/Node'})
+    assert validate({'children': [{'children': []}]}) == []
+    assert validate({'children': [{'children': 1}]})[0].pointer == '/children/0/children'
+
+
+def test_unresolved_refs():
+    document = {'components': {'schemas': {'Node': {
+        'type': 'object',
+        'properties': {'children': {'type': 'array',
+                                    'items': {'$ref': '#/components/schemas/Node'}},
+                       'owner': {'$ref': '#/components/schemas/Missing'}}}}}}
+    compiler = SchemaCompiler(document)
+    for _ in range(2):
+        try:
+            compiler.compile({'$ref': '#/components/schemas/Node'})
+            assert False
+        except ValidationError:
+            pass
+    document['components']['schemas']['Missing'] = {'type': 'string'}
+    validate = compiler.compile({'$ref': '#/components/schemas/Node'})
+    assert validate({'children': [{'owner': 'me'}]}) == []
+    assert validate({'children': [{'owner': 1}]})[0].pointer == '/children/0/owner'
+
+
+def test_response_validator():
+    validator = ResponseValidator(petstore())
+    assert validator.validate('/pets', 'get', 200, [{'id': 1, 'name': 'Rex'}]) == []
+    assert validator.validate('/pets', 'get', 200, [{'id': 1}])[0].pointer == '/0/name'
+    assert validator.validate('/pets', 'get', 500, {'code': 1, 'message': 'boom'}) == []
+    assert validator.validate('/pets', 'post', 201, None) == []
+
+
+def test_shadow_validation():
+    shadow = ShadowValidator(petstore(), sample_rate=1, workers=2, cpu_share=1, seed=1)
+    for _ in range(5):
+        shadow.submit('/pets', 'get', 200, b'[{"id": 1, "name": "Rex"}]')
+    shadow.submit('/pets', 'get', 200, '[{"id": "1"}]')
+    shadow.close()
+    stats = shadow.stats()['listPets']
+    assert stats['seen'] == stats['sampled'] == stats['validated'] == 6
+    assert stats['failed'] == 1
+    assert len(stats['errors'][0]) == 2
+
+
+def test_shadow_sampling_and_queue_bound():
+    shadow = ShadowValidator(petstore(), sample_rate=0, workers=1)
+    assert not shadow.submit('/pets', 'get', 200, [])
+    shadow.close()
+    assert shadow.stats()['listPets']['sampled'] == 0
+
+    shadow = ShadowValidator(petstore(), sample_rate=1, workers=0, max_queue=2)
+    results = [shadow.submit('/pets', 'get', 200, []) for _ in range(4)]
+    assert results == [True, True, False, False]
+    assert shadow.stats()['listPets']['dropped'] == 2
+    assert shadow.queue_depth == 2
+    shadow.close()
+    assert shadow.queue_depth == 0
+    assert shadow.stats()['listPets']['validated'] == 2
+
+    shadow = ShadowValidator(petstore(), sample_rate=1, workers=1, cpu_share=1)
+    for number in range(3):
+        shadow.submit('/unknown/{}'.format(number), 'get', 200, [])
+    shadow.close()
+    assert not shadow.submit('/pets', 'get', 200, [])
+    stats = shadow.stats()
+    assert sorted(stats) == ['<unmatched>', 'listPets']
+    assert stats['<unmatched>']['seen'] == stats['<unmatched>']['validated'] == 3
+    assert stats['listPets']['sampled'] == 0
+
+
+def test_validation_cache():
+    cache = ValidationCache(maxsize=2)
+    validator = ResponseValidator(petstore(), cache=cache)
+    body = b'[{"id": 1, "name": "Rex"}]'
+    assert validator.validate('/pets', 'get', 200, body) == []
+    assert validator.validate('/pets', 'get', 200, body) == []
+    assert validator.validate('/pets', 'get', 200, [{'id': 1}])[0].pointer == '/0/name'
+    assert validator.validate('/pets', 'get', 200, [{'id': 1}])[0].pointer == '/0/name'
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert validator.validate('/pets/{petId}', 'get', 200, body) == []
+    assert cache.stats()['size'] == 2
+
+
+def test_validation_cache_keys():
+    cache = ValidationCache()
+    validator = ResponseValidator(petstore(), cache=cache)
+    assert validator.validate('/pets', 'get', 200, b'[{"id": 1, "name": "Rex"}]') == []
+    assert validator.validate('/pets', 'get', 200, '[ {"name":"Rex","id":1} ]') == []
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert validator.validate('/pets', 'get', 200, b'[{"id": 1}]')[0].pointer == '/0/name'
+
+    # verdicts follow the content of referenced schemas, not the spec objects
+    document = petstore().to_dict()
+    document['components']['schemas']['Pet']['required'] = ['id']
+    evolved = validator.evolve(Spec.from_dict(document), ['/components/schemas/Pet'])
+    assert evolved.validate('/pets', 'get', 200, b'[{"id": 1}]') == []
+    reloaded = ResponseValidator(petstore(), cache=cache)
+    hits = cache.hits
+    assert reloaded.validate('/pets', 'get', 200, b'[{"id": 1, "name": "Rex"}]') == []
+    assert cache.hits == hits + 1
+
+
+def test_lru_cache_expiry():
+    now = [0]
+    cache = LRUCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    now[0] = 11
+    assert cache.get('a') is None
+    assert cache.stats()['hits'] == 1
+
+
+def test_schema_shapes():
+    table = SchemaTable()
+    first = {'type': 'object', 'properties': {'id': {'type': 'integer'}, 'tags': {
+        'type': 'array', 'items': {'type': 'string'}}}}
+    second = json.loads(json.dumps(first))
+    assert table.canonical(first) is first
+    assert table.canonical(second) is first
+    assert table.shape(first) == table.shape(second)
+    assert table.shape(first) != table.shape(first['properties']['id'])
+    assert table.canonical(first)['properties']['tags']['items'] is \
+        table.canonical({'type': 'string'})
+
+    small = SchemaTable(aliases=1)
+    for value in range(3):
+        small.canonical({'type': 'integer'})
+        small.canonical({'type': 'integer', 'maximum': value})
+    assert len(small._aliases) == 1
+
+    compiler = SchemaCompiler(shapes=table)
+    assert compiler.compile(first) is compiler.compile(second)
+    assert compiler.compile(second)({'id': 'x'}) == [PayloadError('/id', 'Expected type integer')]
+
+    shared = SchemaTable()
+    compiler = SchemaCompiler(shapes=shared)
+    assert compiler.shapes is shared
+    compiler.compile(first)
+    assert len(shared)
+
+
+def test_interner_schemas():
+    interner = Interner(leaves=False, schemas=True)
+    spec = Spec.from_file('./tests/samples/valid/petstore.yaml', interner=interner)
+    content = spec.paths['/pets']['get']['responses']['default']['content']
+    other = spec.paths['/pets/{petId}']['get']['responses']['default']['content']
+    assert content['application/json']['schema'] is other['application/json']['schema']
+    assert interner.stats()['shapes'] > 0
+
+
+def test_validation_cache_undocumented_responses():
+    spec = Spec.from_dict({
+        'openapi': '3.0.0',
+        'info': {'title': 'Statuses', 'version': '1'},
+        'paths': {'/a': {'get': {'responses': {'200': {
+            'description': 'ok', 'content': {'application/json': {'schema': {'type': 'string'}}}}}}}},
+    })
+    validator = ResponseValidator(spec, cache=ValidationCache())
+    assert validator.validate('/a', 'get', 500, b'{}')[0].message == \
+        'Undocumented response status 500'
+    assert validator.validate('/a', 'get', 503, b'{}')[0].message == \
+        'Undocumented response status 503'
+    assert validator.validate('/a', 'get', 200, b'{}', 'text/xml')[0].message == \
+        'Undocumented media type text/xml'
+    assert validator.validate('/a', 'get', 200, b'{}', 'text/csv')[0].message == \
+        'Undocumented media type text/csv'
@@ -0,0 +1,63 @@
+from oas3 import Spec
+from oas3.util import to_builtin
+
+
+def test_prune_unused_components():
+    spec = Spec.from_dict({
+        'openapi': '3.0.0',
+        'info': {'title': 'Prune', 'version': '1'},
+        'security': [{'key': []}],
+        'paths': {'/a': {'get': {
+            'parameters': [{'$ref': '#/components/parameters/Limit'}],
+            'responses': {'200': {'description': 'ok', 'content': {'application/json': {
+                'schema': {'$ref': '#/components/schemas/A'}}}}},
+        }}},
+        'components': {
+            'parameters': {'Limit': {'name': 'limit', 'in': 'query',
+                                     'schema': {'$ref': '#/components/schemas/Count'}},
+                           'Offset': {'name': 'offset', 'in': 'query'}},
+            'schemas': {'A': {'properties': {'b': {'$ref': '#/components/schemas/B'}}},
+                        'B': {'items': {'$ref': '#/components/schemas/A'}},
+                        'Count': {'type': 'integer'},
+                        'Orphan': {'items': {'$ref': '#/components/schemas/Orphan'}}},
+            'securitySchemes': {'key': {'type': 'apiKey', 'name': 'key', 'in': 'header'},
+                                'other': {'type': 'apiKey', 'name': 'other', 'in': 'header'}},
+        },
+    })
+    removed, saved = spec.prune()
+    assert removed == ['/components/parameters/Offset', '/components/schemas/Orphan',
+                       '/components/securitySchemes/other']
+    assert saved > 0
+    assert sorted(spec.components.schemas) == ['A', 'B', 'Count']
+    assert spec.prune() == ([], 0)
+
+
+def test_prune_minify():
+    spec = Spec.from_file('./tests/samples/valid/petstore-expanded.yaml')
+    removed, saved = spec.prune(minify=True)
+    data = to_builtin(spec)
+    assert saved > 1000
+    assert 'description' not in data['info']
+    assert 'description' not in data['paths']['/pets']['get']
+    assert data['paths']['/pets']['get']['responses']['200']['description'] == ''
+    assert spec.validate() == {}
+
+
+def test_prune_follows_discriminator_mappings():
+    spec = Spec.from_dict({
+        'openapi': '3.0.0',
+        'info': {'title': 'Prune', 'version': '1'},
+        'paths': {'/pets': {'get': {'responses': {'200': {
+            'description': 'ok', 'content': {'application/json': {
+                'schema': {'$ref': '#/components/schemas/Pet'}}}}}}}},
+        'components': {'schemas': {
+            'Pet': {'type': 'object', 'discriminator': {'propertyName': 'kind', 'mapping': {
+                'dog': '#/components/schemas/Dog', 'cat': 'Cat'}}},
+            'Dog': {'type': 'object'},
+            'Cat': {'type': 'object'},
+            'Unused': {'type': 'object'},
+        }},
+    })
+    removed, saved = spec.prune()
+    assert removed == ['/components/schemas/Unused']
+    assert sorted(spec.components.schemas) == ['Cat', 'Dog', 'Pet']
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from socketserver import ThreadingMixIn
+from oas3 import Spec
+from oas3.remote import ConditionalCache, DiskStore
+
+with open('./tests/samples/valid/petstore.yaml', 'rb') as file_ref:
+    PETSTORE = file_ref.read()
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    hits = 0
+    delay = 0
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.server.hits += 1
+        time.sleep(self.server.delay)
+        etag = '"{}"'.format(hashlib.sha1(PETSTORE).hexdigest())
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(PETSTORE)))
+        self.end_headers()
+        self.wfile.write(PETSTORE)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    server = Server(('127.0.0.1', 0), ETagHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, 'http://127.0.0.1:{}/petstore.yaml'.format(server.server_port)
+
+
+def test_conditional_requests():
+    server, url = serve()
+    now = [0.0]
+    cache = ConditionalCache(ttl=10, clock=lambda: now[0])
+    try:
+        spec = Spec.from_url(url, cache=cache)
+        assert Spec.from_url(url, cache=cache) is spec
+        assert server.hits == 1
+        now[0] = 11
+        assert Spec.from_url(url, cache=cache) is spec
+        assert (server.hits, cache.not_modified) == (2, 1)
+    finally:
+        server.shutdown()
+
+
+def test_disk_store_and_single_flight():
+    server, url = serve()
+    server.delay = 0.2
+    directory = tempfile.mkdtemp()
+    try:
+        cache = ConditionalCache(store=DiskStore(directory))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(Spec.from_url(url, cache=cache)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert server.hits == 1
+        assert len(set(id(spec) for spec in results)) == 1
+
+        restarted = ConditionalCache(store=DiskStore(directory))
+        spec = Spec.from_url(url, cache=restarted)
+        assert spec.info.title == 'Swagger Petstore'
+        assert restarted.not_modified == 1
+        assert [name for name in os.listdir(directory) if not name.endswith('.pickle')] == []
+    finally:
+        server.shutdown()
+        shutil.rmtree(directory)
+
+
+def test_unreadable_entries_and_unexpected_not_modified():
+    server, url = serve()
+    directory = tempfile.mkdtemp()
+    try:
+        store = DiskStore(directory)
+        key = (Spec.__module__, Spec.__qualname__, url, None)
+        with open(store._path(key), 'wb') as file_ref:
+            file_ref.write(b'\x80\x04not a pickle')
+        assert store.get(key) is None
+
+        # the session sends a validator of its own, but nothing is cached
+        cache = ConditionalCache(store=store)
+        cache.session.headers['If-None-Match'] = '"{}"'.format(hashlib.sha1(PETSTORE).hexdigest())
+        spec = Spec.from_url(url, cache=cache)
+        assert spec.info.title == 'Swagger Petstore'
+        assert server.hits == cache.requests == 2
+    finally:
+        server.shutdown()
+        shutil.rmtree(directory)
@@ -0,0 +1,48 @@
+import json
+import os
+import shutil
+import tempfile
+from oas3 import Spec
+
+
+def test_shard_by_operation():
+    spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    directory = tempfile.mkdtemp()
+    other = tempfile.mkdtemp()
+    try:
+        index = spec.shard(directory, by='operation')
+        shards = {shard['name']: shard for shard in index['x-shards']['shards']}
+        assert sorted(shards) == ['createPets', 'listPets', 'showPetById']
+        assert shards['createPets']['operations'] == [
+            {'path': '/pets', 'method': 'post', 'operationId': 'createPets'}]
+        with open(os.path.join(directory, 'index.json')) as f:
+            assert json.load(f) == index
+
+        fragment = Spec.from_file(os.path.join(directory, shards['createPets']['file']))
+        assert sorted(fragment.paths['/pets']) == ['post']
+        assert sorted(fragment.components.schemas) == ['Error']
+        assert fragment.validate() == {}
+        assert fragment.info.title == spec.info.title
+
+        assert Spec.from_file('./tests/samples/valid/petstore.yaml').shard(
+            other, by='operation', workers=2) == index
+        assert sorted(os.listdir(other)) == sorted(os.listdir(directory))
+        assert not [name for name in os.listdir(directory) if name.endswith('.tmp')]
+        umask = os.umask(0)
+        os.umask(umask)
+        for name in os.listdir(directory):
+            assert os.stat(os.path.join(directory, name)).st_mode & 0o777 == 0o666 & ~umask
+    finally:
+        shutil.rmtree(directory)
+        shutil.rmtree(other)
+
+
+def test_shard_by_tag():
+    spec = Spec.from_file('./tests/samples/valid/petstore-expanded.yaml')
+    directory = tempfile.mkdtemp()
+    try:
+        index = spec.shard(directory)
+        assert [shard['name'] for shard in index['x-shards']['shards']] == ['default']
+        assert len(index['x-shards']['shards'][0]['operations']) == 4
+    finally:
+        shutil.rmtree(directory)
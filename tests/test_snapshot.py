@@ -0,0 +1,112 @@
+import glob
+import os
+import pickle
+import struct
+import tempfile
+import zlib
+from oas3 import Spec, LoadingError
+from oas3.snapshot import Snapshot, encode, register, unregister, MAGIC
+from oas3.util import to_builtin
+
+HEADER_SIZE = 40
+
+
+def test_snapshot_round_trip():
+    for path in sorted(glob.glob('./tests/samples/valid/*.yaml')):
+        spec = Spec.from_file(path)
+        snapshot = Snapshot.take(spec)
+        assert snapshot.to_dict() == to_builtin(spec)
+        assert to_builtin(snapshot.load()) == to_builtin(spec)
+        assert pickle.loads(pickle.dumps(snapshot)).to_dict() == to_builtin(spec)
+
+
+def test_snapshot_values():
+    data = {'a': [None, True, False, 0, -1, 1 << 70, 1.5, 'é'], 'b': {1: 'x', '1': 'y'},
+            'c': [{'same': 1}, {'same': 1}]}
+    snapshot = Snapshot(None, encode(data))
+    assert snapshot.to_dict() == data
+    assert snapshot.root['b'][1] == 'x'
+    assert snapshot.root['b']['1'] == 'y'
+    assert 'missing' not in snapshot.root
+    assert list(snapshot.root['a']) == data['a']
+
+
+def test_snapshot_file():
+    spec = Spec.from_file('./tests/samples/valid/petstore.yaml')
+    handle, path = tempfile.mkstemp(suffix='.snapshot')
+    os.close(handle)
+    shared = None
+    try:
+        Snapshot.take(spec).write(path)
+        shared = Snapshot.open(path)
+        assert shared.cls is Spec
+        assert shared.root['paths']['/pets']['get']['operationId'] == 'listPets'
+        assert shared.load().to_dict() == spec.to_dict()
+    finally:
+        del shared
+        os.remove(path)
+
+
+def test_snapshot_checks():
+    data = bytearray(encode({'a': 'b'}))
+    for corrupted in (data[:-1] + bytes((data[-1] ^ 1,)), data.replace(MAGIC, b'OTHERFMT'),
+                      data[:8] + b'\x02' + data[9:]):
+        try:
+            Snapshot(None, bytes(corrupted))
+            assert False
+        except LoadingError:
+            pass
+
+
+def _with_checksum(data):
+    data[12:16] = struct.pack('<I', zlib.crc32(bytes(data[HEADER_SIZE:])))
+    return bytes(data)
+
+
+def test_snapshot_bounds():
+    data = bytearray(encode({'a': ['b', 1 << 70, 1.5]}))
+    node_index, = struct.unpack_from('<I', data, 36)
+    corrupted = []
+    # offsets past the end of the buffer, with a matching checksum
+    for offset, value in ((36, len(data)), (32, len(data))):
+        changed = bytearray(data)
+        struct.pack_into('<I', changed, offset, value)
+        corrupted.append(_with_checksum(changed))
+    # a node offset pointing outside the nodes, a truncated node index
+    changed = bytearray(data)
+    struct.pack_into('<I', changed, node_index, len(data) + 100)
+    corrupted.append(_with_checksum(changed))
+    corrupted.append(_with_checksum(data[:-2]))
+    for value in corrupted:
+        try:
+            Snapshot(None, value).to_dict()
+            assert False
+        except LoadingError:
+            pass
+
+
+class Untrusted(Spec):
+    pass
+
+
+def test_snapshot_classes():
+    handle, path = tempfile.mkstemp(suffix='.snapshot')
+    os.close(handle)
+    try:
+        try:
+            Snapshot.open(path)
+            assert False
+        except LoadingError:
+            pass
+        spec = Untrusted.from_file('./tests/samples/valid/petstore.yaml')
+        data = encode(spec, Untrusted)
+        try:
+            Snapshot(None, data)
+            assert False
+        except LoadingError:
+            pass
+        register(Untrusted)
+        assert Snapshot(None, data).cls is Untrusted
+    finally:
+        unregister(Untrusted)
+        os.remove(path)
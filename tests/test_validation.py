@@ -0,0 +1,68 @@
+from oas3 import Spec
+from oas3.validation import IncrementalValidator, flatten_errors
+
+
+def petstore():
+    return Spec.from_file('./tests/samples/valid/petstore.yaml')
+
+
+def test_flatten_errors():
+    errors = {'parameters': {0: {'name': ['Not a valid string.']}},
+              'get': {'responses': ['Missing data for required field.']}}
+    assert flatten_errors(errors, '/paths/~1pets') == {
+        '/paths/~1pets/parameters/0/name': ['Not a valid string.'],
+        '/paths/~1pets/get/responses': ['Missing data for required field.'],
+    }
+
+
+def test_incremental_validation():
+    spec = petstore()
+    validator = IncrementalValidator(spec)
+    assert validator.validate() == {}
+    assert len(validator.checked) == 6
+    assert validator.validate() == {}
+    assert validator.checked == []
+
+    spec.components.schemas['Pet']['required'] = 'id'
+    assert validator.validate() == {'/components/schemas/Pet/required': ['Not a valid list.']}
+    assert validator.checked == ['/components/schemas/Pet']
+
+    del spec.components.schemas['Error']
+    errors = validator.validate()
+    assert errors['/paths/~1pets/post/responses/default/content/application~1json/schema/$ref'] == [
+        'Unresolved reference #/components/schemas/Error']
+    assert validator.checked == []
+
+    spec.components.schemas['Error'] = {'properties': {'code': {'type': 'integer'}}}
+    spec.components.schemas['Pet']['required'] = ['id']
+    assert validator.validate(changed=['/components/schemas/Error',
+                                       '/components/schemas/Pet/required']) == {}
+    assert validator.checked == ['/components/schemas/Error', '/components/schemas/Pet']
+
+
+def test_incremental_validation_paths():
+    spec = petstore()
+    validator = IncrementalValidator(spec)
+    validator.validate()
+    del spec.paths['/pets']['get']['responses']
+    spec.paths['/owners'] = {'get': {'responses': {'200': {'$ref': '#/components/responses/Nope'}}}}
+    assert validator.validate() == {
+        '/paths/~1owners/get/responses/200/$ref': ['Unresolved reference #/components/responses/Nope'],
+        '/paths/~1pets/get/responses': ['Missing data for required field.'],
+    }
+    assert validator.checked == ['/paths/~1owners', '/paths/~1pets']
+
+
+def test_parallel_validation_matches_serial():
+    spec = petstore()
+    assert spec.validate() == spec.validate(workers=2) == {}
+    spec.paths['/pets']['get']['summary'] = 1
+    spec.paths['/pets']['post']['responses']['201'] = {'$ref': '#/components/responses/Created'}
+    spec.components.schemas['Error']['required'] = 'code'
+    errors = spec.validate()
+    assert errors == spec.validate(workers=3)
+    assert sorted(errors) == [
+        '/components/schemas/Error/required',
+        '/paths/~1pets/get/summary',
+        '/paths/~1pets/post/responses/201/$ref',
+    ]
@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+from oas3.refs import bundle
+from oas3.watch import SpecWatcher
+
+ROOT = """
+openapi: 3.0.0
+info:
+  title: Pets
+  version: 1.0.0
+paths:
+  /pets:
+    get:
+      responses:
+        '200':
+          description: A pet
+          content:
+            application/json:
+              schema:
+                $ref: 'schemas.yaml#/Pet'
+  /owners:
+    get:
+      responses:
+        '200':
+          description: An owner
+          content:
+            application/json:
+              schema:
+                $ref: '#/components/schemas/Owner'
+components:
+  schemas:
+    Owner:
+      required: [name]
+"""
+
+SCHEMAS = """
+Pet:
+  required: [{}]
+  properties:
+    tags:
+      $ref: '#/Tags'
+Tags:
+  type: array
+"""
+
+
+def write(directory, name, content, mtime):
+    path = os.path.join(directory, name)
+    with open(path, 'w') as file_ref:
+        file_ref.write(content)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_bundle():
+    directory = tempfile.mkdtemp()
+    try:
+        root = write(directory, 'openapi.yaml', ROOT, 1000)
+        write(directory, 'schemas.yaml', SCHEMAS.format('id'), 1000)
+        document, files = bundle(root)
+        schema = document['paths']['/pets']['get']['responses']['200']['content']['application/json']['schema']
+        assert schema == {'required': ['id'], 'properties': {'tags': {'type': 'array'}}}
+        assert len(files) == 2
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_watcher_reloads_changed_files():
+    directory = tempfile.mkdtemp()
+    try:
+        root = write(directory, 'openapi.yaml', ROOT, 1000)
+        write(directory, 'schemas.yaml', SCHEMAS.format('id'), 1000)
+        watcher = SpecWatcher(root, debounce=0, validators=True)
+        changes = []
+        watcher.subscribe(lambda spec, changed: changes.append(changed))
+        first = watcher.current
+        assert first.validator.validate('/owners', 'get', 200, {'name': 'Ann'}) == []
+        assert first.validator.validate('/pets', 'get', 200, {'name': 'Rex'})[0].pointer == '/id'
+        owners = first.validator.validator('/owners', 'get', 200)
+
+        assert not watcher.poll()
+        write(directory, 'schemas.yaml', SCHEMAS.format('name'), 2000)
+        assert not watcher.poll()
+        assert watcher.poll()
+        current = watcher.current
+        assert current.generation == 2
+        assert changes == [['/paths/~1pets']]
+        assert current.validator.validate('/pets', 'get', 200, {'name': 'Rex'}) == []
+        assert current.validator.validator('/owners', 'get', 200) is owners
+        assert first.spec.paths['/pets'] != current.spec.paths['/pets']
+
+        write(directory, 'schemas.yaml', 'Pet: [', 3000)
+        watcher.poll()
+        assert not watcher.poll()
+        assert watcher.last_error is not None
+        assert watcher.current is current
+    finally:
+        shutil.rmtree(directory)